@@ -23,24 +23,33 @@ from sklearn.ensemble import RandomForestClassifier
 import shap
 import plotly.express as px
 import time
+import atexit
 import uuid
 import os
-import json
 import re
 from datetime import datetime
 from dotenv import load_dotenv
 from integrations.live_metrics import (
     load_decision_logs,
     compute_metrics,
-    build_probability_timeseries,
+    probability_timeseries,
     build_shap_aggregate,
     load_reply_logs,
+    query_decision_logs,
+    read_decision_page,
+    decision_index,
+    get_decision,
+    explain_decision,
 )
 import config as cfg
 from integrations.db_adapters import get_db_adapter
 from integrations.notify_providers import get_notify_provider
 from integrations.audit import log_audit_event
 from integrations.rate_limiter import RateLimiter
+from integrations.log_index import get_index, normalize_contact
+from integrations.jsonl_log import append_jsonl
+from integrations.log_export import flatten_decision
+from integrations.drift import get_drift_monitor, PSI_ALERT, KS_ALERT, MIN_SAMPLES
 import requests
 try:
     from scripts.send_sms import send_via_textbelt, send_via_email_gateway
@@ -54,11 +63,11 @@ except Exception:
         """
         key = api_key or os.getenv('TEXTBELT_KEY') or 'textbelt'
         try:
-            import requests
+            from integrations import http_client
         except Exception:
             return {"status": "failed", "detail": "requests_not_available"}
         try:
-            resp = requests.post(
+            resp = http_client.post(
                 "https://textbelt.com/text",
                 data={"phone": str(phone), "message": str(message), "key": key},
                 timeout=10
@@ -136,7 +145,21 @@ st.markdown("""
 [data-testid="collapsedControl"] {display:none !important;}
 </style>
 """, unsafe_allow_html=True)
-db = get_db_adapter()
+@cache_resource
+def get_db():
+    """One people adapter per process, shared by every session and rerun.
+
+    Keeps connection pools, write locks, in-memory indexes and the people
+    cache alive across reruns instead of rebuilding them on each interaction.
+    """
+    adapter = get_db_adapter(cache_ttl=float(os.getenv('PEOPLE_CACHE_TTL', '30')))
+    # release pooled connections / the MongoClient when the server exits
+    if hasattr(adapter, 'close'):
+        atexit.register(adapter.close)
+    return adapter
+
+
+db = get_db()
 notify = get_notify_provider()
 rate_limiter = RateLimiter(window_seconds=cfg.RATE_LIMIT_SECONDS)
 
@@ -221,30 +244,31 @@ def train_model(df):
     model = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42)
     model.fit(x_train, y_train)
     explainer = shap.TreeExplainer(model)
+    # reference histograms for input drift monitoring
+    get_drift_monitor().fit_reference(x_train, x.columns.tolist())
     return model, explainer, x.columns.tolist()
 def log_event(pred, prob, shap_vals, inp, transaction_id=None):
-    # normalize numpy types to native python
-    try:
-        shap_list = [float(x) for x in list(shap_vals)]
-    except Exception:
-        shap_list = list(shap_vals)
-    try:
-        inp_list = [float(x) if isinstance(x, (int, float, np.floating, np.integer)) else x for x in list(inp)]
-    except Exception:
-        inp_list = list(inp)
-
+    # numpy arrays/scalars are serialized directly by the JSON codec
     obj = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "transaction_id": transaction_id,
         "prediction": int(pred) if pred is not None else None,
         "probability": float(prob) if prob is not None else None,
-        "shap_values": shap_list,
-        "inputs": inp_list
+        "shap_values": shap_vals,
+        "inputs": list(inp)
     }
     # append to JSONL
     try:
-        with open(LOG_JSONL, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(obj) + '\n')
+        offset, end = append_jsonl(LOG_JSONL, obj)
+        try:
+            decision_index().record(obj, offset, end)
+        except Exception:
+            # the index is rebuilt lazily from the log on the next lookup
+            pass
+        try:
+            get_drift_monitor().update(dict(zip(feature_names, obj["inputs"])))
+        except Exception:
+            pass
     except Exception:
         # fallback to CSV if needed
         entry = pd.DataFrame([obj])
@@ -254,36 +278,48 @@ def log_event(pred, prob, shap_vals, inp, transaction_id=None):
             entry.to_csv(LOG_CSV, index=False)
 
 
+def _notifications_file():
+    # prefer the new notifications JSONL, but fall back to legacy name if present
+    if not os.path.exists(NOTIF_JSONL) and os.path.exists(NOTIF_JSONL_LEGACY):
+        return NOTIF_JSONL_LEGACY
+    return NOTIF_JSONL
+
+
+def notification_index():
+    """Contact -> latest (transaction_id, timestamp) index over the notifications log.
+
+    The app itself sends nothing, so every line comes from outside writers
+    (migrations, other services) and is indexed lazily on lookup.
+    """
+    return get_index(_notifications_file(), 'contact', value_fields=('transaction_id', 'timestamp'), key_func=normalize_contact)
+
+
 def send_notification(method, contact, message, transaction_id=None):
     """Notification system disabled per user request; returns a disabled status without side effects."""
     return {"status": "disabled", "detail": "notification feature removed"}
 
 
+def resolve_person(contact):
+    """Map a reply's sender (phone number or Telegram chat id) to a person via indexed lookups."""
+    if not contact or '@' in str(contact):
+        return None
+    try:
+        return db.get_person_by_phone(contact) or db.get_person_by_telegram_id(contact)
+    except Exception:
+        return None
+
+
 def record_customer_reply(contact, reply):
     """Record a customer reply (YES/NO) to notifications."""
     try:
         # attempt to map this reply to the most recent notification for this contact
         tx_id = None
-        # prefer JSONL notifications
-        # prefer the new notifications JSONL, but fall back to legacy name if present
-        notif_file_to_read = None
-        if os.path.exists(NOTIF_JSONL):
-            notif_file_to_read = NOTIF_JSONL
-        elif os.path.exists(NOTIF_JSONL_LEGACY):
-            notif_file_to_read = NOTIF_JSONL_LEGACY
-        if notif_file_to_read:
+        if os.path.exists(NOTIF_JSONL) or os.path.exists(NOTIF_JSONL_LEGACY):
+            # constant-time lookup through the contact index
             try:
-                with open(notif_file_to_read, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                # iterate reversed to find most recent for contact
-                for ln in reversed(lines):
-                    try:
-                        o = json.loads(ln)
-                        if o.get('contact') == contact:
-                            tx_id = o.get('transaction_id')
-                            break
-                    except Exception:
-                        continue
+                e = notification_index().get(contact)
+                if e:
+                    tx_id = e.get('transaction_id')
             except Exception:
                 pass
         else:
@@ -295,20 +331,22 @@ def record_customer_reply(contact, reply):
                 if not ndc.empty:
                     tx_id = ndc.sort_values('timestamp', ascending=False).iloc[0].get('transaction_id')
 
+        person = resolve_person(contact)
         note_obj = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "contact": contact,
             "transaction_id": tx_id,
-            "reply": reply
+            "reply": reply,
+            "person_id": person.get('id') if person else None
         }
         try:
             # write to the new replies JSONL
-            with open(REPLIES_JSONL, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(note_obj) + '\n')
+            append_jsonl(REPLIES_JSONL, note_obj)
             return {"status": "recorded", "detail": REPLIES_JSONL, "transaction_id": tx_id}
         except Exception:
             file = REPLIES_CSV
-            note = pd.DataFrame([note_obj])
+            # the legacy CSV keeps its original four columns
+            note = pd.DataFrame([{k: v for k, v in note_obj.items() if k != 'person_id'}])
             if os.path.exists(file):
                 note.to_csv(file, mode='a', header=False, index=False)
             else:
@@ -497,13 +535,15 @@ with tabs[0]:
             # Live metrics (always render, even if no transaction yet)
             st.markdown("---")
             st.subheader("Live Fraud Metrics")
-            logs_df = load_decision_logs(limit=500)
+            # one cached read of the decision log serves every widget on this rerun
+            logs_recent = load_decision_logs(limit=1000)
+            logs_df = logs_recent.tail(500).reset_index(drop=True)
             metrics = compute_metrics(logs_df)
             m1, m2, m3, m4, m5 = st.columns(5)
             m1.metric("Total Decisions", metrics["total"])
             m2.metric("Model Fraud (logged)", metrics["fraud_count"], f"{metrics['fraud_rate']*100:.1f}%" if metrics["total"] else None)
             # Projected flagged given adjustable threshold using stored probabilities
-            logs_probs = load_decision_logs(limit=1000)
+            logs_probs = logs_recent
             projected = 0
             if not logs_probs.empty and 'probability' in logs_probs.columns:
                 thr = float(st.session_state.get('decision_threshold', 0.5))
@@ -513,7 +553,9 @@ with tabs[0]:
                 m4.metric("Last Probability", f"{metrics['last_probability']*100:.2f}%")
             if metrics["last_is_fraud"] is not None:
                 m5.metric("Last Pred (orig)", "FRAUD" if metrics["last_is_fraud"]==1 else "OK")
-            prob_ts = build_probability_timeseries(logs_df, limit=200)
+            ts_window = st.selectbox("Probability window (decisions)", ["200", "1,000", "10,000", "All"], key='ts_window')
+            # any window is reduced to at most 500 visually faithful points (LTTB), cached per resolution
+            prob_ts = probability_timeseries(window=None if ts_window == "All" else int(ts_window.replace(",", "")), max_points=500)
             if not prob_ts.empty:
                 ts_fig = px.line(prob_ts, x="Index", y="Probability", title="Recent Risk Probabilities")
                 st.plotly_chart(ts_fig, use_container_width=True)
@@ -530,12 +572,61 @@ with tabs[1]:
     bias_monitoring.render_bias_monitoring_page()
 with tabs[2]:
     st.header("AI Governance Logs")
-    logs = load_decision_logs(limit=1000)
+    with st.expander("Filters", expanded=False):
+        f1, f2, f3 = st.columns(3)
+        with f1:
+            date_range = st.date_input("Date range", value=(), key='gov_dates')
+            tx_prefix = st.text_input("Transaction id prefix", key='gov_tx_prefix')
+        with f2:
+            pred_choice = st.selectbox("Prediction", ["Any", "Fraud (1)", "OK (0)"], key='gov_pred')
+        with f3:
+            prob_range = st.slider("Probability range", 0.0, 1.0, (0.0, 1.0), step=0.01, key='gov_prob')
+    # filters are pushed down into the log reader; only matches are decoded
+    start = end = None
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        start = date_range[0].strftime("%Y-%m-%d")
+        end = (date_range[1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    gov_filters = dict(
+        start=start,
+        end=end,
+        prediction={"Fraud (1)": 1, "OK (0)": 0}.get(pred_choice),
+        min_probability=prob_range[0] if prob_range[0] > 0.0 else None,
+        max_probability=prob_range[1] if prob_range[1] < 1.0 else None,
+        transaction_id_prefix=tx_prefix.strip() or None,
+    )
+    # summary only needs two scalar columns; unfiltered, it reuses the shared log snapshot
+    logs = query_decision_logs(columns=["prediction", "probability"], limit=1000, **gov_filters)
     if logs.empty:
         st.info("No decision logs available.")
     else:
-        st.subheader("Decision Logs (Latest)")
-        st.dataframe(logs, use_container_width=True)
+        st.subheader("Decision Logs")
+        p1, p2 = st.columns(2)
+        with p1:
+            order = st.radio("Order", ["Newest first", "Oldest first"], horizontal=True, key='gov_order')
+        with p2:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 200], index=1, key='gov_page_size')
+        # cursor stack: byte offsets of the pages visited so far; reset when the view changes
+        view_sig = (order, page_size, tuple(sorted(gov_filters.items())))
+        if st.session_state.get('gov_view_sig') != view_sig:
+            st.session_state['gov_view_sig'] = view_sig
+            st.session_state['gov_cursors'] = [None]
+        cursors = st.session_state['gov_cursors']
+        page = read_decision_page(cursor=cursors[-1], page_size=page_size,
+                                  newest_first=(order == "Newest first"), **gov_filters)
+        # flatten SHAP and inputs into named columns for the visible page only
+        page_df = pd.DataFrame([flatten_decision(r, feature_names) for r in page["rows"]])
+        st.dataframe(page_df, use_container_width=True)
+        n1, n2, n3 = st.columns([1, 1, 4])
+        with n1:
+            if st.button("Previous", disabled=len(cursors) <= 1, key='gov_prev'):
+                cursors.pop()
+                st.rerun()
+        with n2:
+            if st.button("Next", disabled=page["next"] is None, key='gov_next'):
+                cursors.append(page["next"])
+                st.rerun()
+        with n3:
+            st.caption(f"Page {len(cursors)}")
         # Mini summary
         summary = compute_metrics(logs)
         c1, c2, c3 = st.columns(3)
@@ -543,6 +634,31 @@ with tabs[2]:
         c2.metric("Fraud", summary["fraud_count"], f"{summary['fraud_rate']*100:.1f}%")
         if summary["last_probability"] is not None:
             c3.metric("Last Prob", f"{summary['last_probability']*100:.1f}%")
+    st.subheader("Input Drift vs Training Data")
+    drift = get_drift_monitor()
+    drift_stats = drift.stats()
+    if not drift_stats:
+        st.caption("No drift reference yet (built when the model is trained).")
+    else:
+        for feat in drift.new_alerts():
+            log_audit_event(actor='drift_monitor', action='drift_alert', person_id='', notify_attempted=False,
+                            notify_sent_status='n/a', detail={'feature': feat, **drift_stats[feat]})
+        drifting = [k for k, v in drift_stats.items() if v['drift']]
+        if drifting:
+            st.warning("Input drift detected on: " + ", ".join(drifting))
+        st.dataframe(pd.DataFrame([
+            {"Feature": k, "PSI": round(v['psi'], 4), "KS": round(v['ks'], 4), "Live samples": v['n_live'], "Drift": "YES" if v['drift'] else ""}
+            for k, v in drift_stats.items()
+        ]), use_container_width=True)
+        st.caption(f"Alert when PSI ≥ {PSI_ALERT} or KS ≥ {KS_ALERT} with at least {MIN_SAMPLES} live samples.")
+    lookup_id = st.text_input('Look up decision by transaction id')
+    if lookup_id:
+        rec = get_decision(lookup_id.strip())
+        if rec is None:
+            st.warning('No decision logged for that transaction id.')
+        else:
+            st.json(rec)
+            st.dataframe(pd.DataFrame(explain_decision(rec, feature_names)), use_container_width=True)
     st.info('Notification feature disabled; notification logs removed.')
     replies_df = load_reply_logs(limit=500)
     if replies_df.empty:
@@ -560,8 +676,29 @@ with tabs[3]:
         st.session_state['location_active'] = loc_active
         _render_location_badge(loc_active)
     st.caption('Toggle the top-left location badge (sample)')
-    # list people from configured backend
-    people = db.list_people()
+    if hasattr(db, 'stats'):
+        cs = db.stats()
+        st.caption(f"People cache: {cs['entries']} entries, hit rate {cs['hit_rate']*100:.0f}%")
+    # one page of people from the configured backend, searched and paged server-side
+    u1, u2 = st.columns([3, 1])
+    with u1:
+        user_search = st.text_input('Search name, id, phone or Telegram id', key='users_search')
+    with u2:
+        users_page_size = st.selectbox('Rows per page', [25, 50, 100], index=0, key='users_page_size')
+    # cursor stack: last id of each page visited so far; reset when the view changes
+    users_sig = (user_search.strip(), users_page_size)
+    if st.session_state.get('users_view_sig') != users_sig:
+        st.session_state['users_view_sig'] = users_sig
+        st.session_state['users_cursors'] = [None]
+    users_cursors = st.session_state['users_cursors']
+    if user_search.strip():
+        # indexed word-prefix search; shows the best page of matches without paging
+        people = db.search_people(user_search.strip(), limit=users_page_size)
+        has_next = False
+    else:
+        people = db.list_people(after_id=users_cursors[-1], limit=users_page_size + 1)
+        has_next = len(people) > users_page_size
+        people = people[:users_page_size]
     cols = st.columns([2,1,1,1])
     with cols[0]:
         st.subheader('Name')
@@ -583,6 +720,19 @@ with tabs[3]:
             if st.button('View', key=f"view_{p.get('id')}"):
                 # show detail modal-like area
                 st.session_state['view_person'] = p.get('id')
+    if not people:
+        st.info('No people match this search.')
+    n1, n2, n3 = st.columns([1, 1, 4])
+    with n1:
+        if st.button('Previous', disabled=len(users_cursors) <= 1, key='users_prev'):
+            users_cursors.pop()
+            st.rerun()
+    with n2:
+        if st.button('Next', disabled=not has_next, key='users_next'):
+            users_cursors.append(people[-1]['id'])
+            st.rerun()
+    with n3:
+        st.caption(f"Page {len(users_cursors)}")
     # show detail view when selected
     if 'view_person' in st.session_state:
         pid = st.session_state['view_person']
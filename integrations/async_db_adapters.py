@@ -0,0 +1,181 @@
+"""Async access to the people store for event-loop servers.
+
+`ThreadPoolAdapter` wraps any sync adapter from `db_adapters` and runs each
+call in a thread pool, so the event loop never waits on disk or network I/O.
+`AioSQLiteAdapter` talks to the SQLite database natively through aiosqlite
+(optional dependency). `get_async_db_adapter()` picks one by DATA_BACKEND.
+"""
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Protocol, runtime_checkable
+from integrations.db_adapters import (
+    SQLiteAdapter, DEFAULT_SQLITE, get_db_adapter, normalize_phone,
+    _SQL_COLS, _list_sql, _search_sql, _upsert_row, _upsert_sql,
+)
+
+
+@runtime_checkable
+class AsyncPeopleStore(Protocol):
+    async def get_person(self, person_id: str) -> Optional[Dict]: ...
+
+    async def get_person_by_phone(self, phone: str) -> Optional[Dict]: ...
+
+    async def get_person_by_telegram_id(self, telegram_id) -> Optional[Dict]: ...
+
+    async def list_people(self, consent: Optional[bool] = None, after_id: str = None, limit: int = None,
+                          search: str = None) -> List[Dict]: ...
+
+    async def search_people(self, query: str, limit: int = 20) -> List[Dict]: ...
+
+    async def update_person(self, person_id: str, updates: Dict) -> Dict: ...
+
+    def iter_people(self, batch_size: int = 1000, consent: Optional[bool] = None,
+                    after_id: str = None) -> AsyncIterator[Dict]: ...
+
+
+async def _aiter_pages(fetch_page, after: str = None) -> AsyncIterator[Dict]:
+    # async twin of db_adapters._keyset_iter
+    while True:
+        page = await fetch_page(after)
+        if not page:
+            return
+        for p in page:
+            yield p
+        after = page[-1]['id']
+
+
+class ThreadPoolAdapter:
+    """Async facade over a blocking adapter; every call runs on `executor`."""
+
+    def __init__(self, adapter, max_workers: int = None, executor: ThreadPoolExecutor = None):
+        self.adapter = adapter
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv('ASYNC_DB_WORKERS', '8')), thread_name_prefix='people-db')
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def get_person(self, person_id: str) -> Optional[Dict]:
+        return await self._run(self.adapter.get_person, person_id)
+
+    async def get_person_by_phone(self, phone: str) -> Optional[Dict]:
+        return await self._run(self.adapter.get_person_by_phone, phone)
+
+    async def get_person_by_telegram_id(self, telegram_id) -> Optional[Dict]:
+        return await self._run(self.adapter.get_person_by_telegram_id, telegram_id)
+
+    async def list_people(self, consent: Optional[bool] = None, after_id: str = None, limit: int = None,
+                          search: str = None) -> List[Dict]:
+        return await self._run(self.adapter.list_people, consent=consent, after_id=after_id, limit=limit, search=search)
+
+    async def search_people(self, query: str, limit: int = 20) -> List[Dict]:
+        return await self._run(self.adapter.search_people, query, limit)
+
+    async def update_person(self, person_id: str, updates: Dict) -> Dict:
+        return await self._run(self.adapter.update_person, person_id, updates)
+
+    def iter_people(self, batch_size: int = 1000, consent: Optional[bool] = None,
+                    after_id: str = None) -> AsyncIterator[Dict]:
+        return _aiter_pages(lambda after: self.list_people(consent=consent, after_id=after, limit=batch_size), after_id)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class AioSQLiteAdapter:
+    """People store on SQLite through aiosqlite, sharing schema and SQL with SQLiteAdapter.
+
+    One aiosqlite connection (its own background thread) is opened lazily and
+    shared by every coroutine; writes are serialized with an asyncio lock. Use
+    an instance from a single event loop.
+    """
+
+    def __init__(self, path: str = None, cache_kb: int = None):
+        try:
+            import aiosqlite
+        except Exception:
+            raise RuntimeError('aiosqlite not installed')
+        self._aiosqlite = aiosqlite
+        self.path = path or DEFAULT_SQLITE
+        self.cache_kb = cache_kb or int(os.getenv('SQLITE_CACHE_KB', '65536'))
+        # create / migrate the schema once with the sync adapter
+        schema = SQLiteAdapter(path=self.path, pool_size=1)
+        self.fts = schema.fts
+        schema.close()
+        self._conn = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    async def _db(self):
+        if self._conn is None:
+            async with self._connect_lock:
+                if self._conn is None:
+                    conn = await self._aiosqlite.connect(self.path, timeout=30)
+                    await conn.execute('PRAGMA journal_mode=WAL')
+                    await conn.execute('PRAGMA synchronous=NORMAL')
+                    await conn.execute(f'PRAGMA cache_size=-{int(self.cache_kb)}')
+                    self._conn = conn
+        return self._conn
+
+    async def _fetch(self, sql: str, params) -> List[Dict]:
+        db = await self._db()
+        async with db.execute(sql, params) as cur:
+            rows = await cur.fetchall()
+        return [SQLiteAdapter._row(r) for r in rows]
+
+    async def _one(self, where: str, params: tuple) -> Optional[Dict]:
+        rows = await self._fetch(f'SELECT {_SQL_COLS} FROM people WHERE {where} LIMIT 1', params)
+        return rows[0] if rows else None
+
+    async def get_person(self, person_id: str) -> Optional[Dict]:
+        return await self._one('id=?', (person_id,))
+
+    async def get_person_by_phone(self, phone: str) -> Optional[Dict]:
+        key = normalize_phone(phone)
+        return await self._one('phone_norm=?', (key,)) if key else None
+
+    async def get_person_by_telegram_id(self, telegram_id) -> Optional[Dict]:
+        key = str(telegram_id or '')
+        return await self._one('telegram_id=?', (key,)) if key else None
+
+    async def list_people(self, consent: Optional[bool] = None, after_id: str = None, limit: int = None,
+                          search: str = None) -> List[Dict]:
+        sql, params = _list_sql(consent, after_id, limit, search)
+        return await self._fetch(sql, params)
+
+    async def search_people(self, query: str, limit: int = 20) -> List[Dict]:
+        if not self.fts:
+            return await self.list_people(search=query, limit=limit)
+        stmt = _search_sql(query, limit)
+        return await self._fetch(*stmt) if stmt else []
+
+    async def update_person(self, person_id: str, updates: Dict) -> Dict:
+        cols, vals = _upsert_row(person_id, updates)
+        db = await self._db()
+        async with self._write_lock:
+            await db.execute(_upsert_sql(cols), vals)
+            await db.commit()
+        return updates
+
+    def iter_people(self, batch_size: int = 1000, consent: Optional[bool] = None,
+                    after_id: str = None) -> AsyncIterator[Dict]:
+        return _aiter_pages(lambda after: self.list_people(consent=consent, after_id=after, limit=batch_size), after_id)
+
+    async def close(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+def get_async_db_adapter(backend: str = None):
+    """Native aiosqlite adapter for the sqlite backend when available, else a thread-pool wrapper."""
+    backend = (backend or os.getenv('DATA_BACKEND', 'sqlite')).lower()
+    if backend == 'sqlite':
+        try:
+            return AioSQLiteAdapter()
+        except RuntimeError:
+            pass
+    return ThreadPoolAdapter(get_db_adapter(backend))
@@ -1,8 +1,8 @@
 import os
-import json
 import time
 import logging
 from logging.handlers import RotatingFileHandler
+from integrations.jsonl_log import append_jsonl
 
 LOG_DIR = os.path.join(os.getcwd(), 'logs')
 os.makedirs(LOG_DIR, exist_ok=True)
@@ -29,8 +29,7 @@ def log_audit_event(actor: str, action: str, person_id: str, notify_attempted: b
     }
     # append to JSONL for UI reading
     try:
-        with open(AUDIT_FILE, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(obj) + '\n')
+        append_jsonl(AUDIT_FILE, obj)
     except Exception:
         logger.exception('Failed to write audit jsonl')
     logger.info('AUDIT %s', obj)
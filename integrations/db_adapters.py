@@ -1,95 +1,604 @@
 import os
+import re
 import csv
+import bisect
+import itertools
 import sqlite3
 import json
 import uuid
-from typing import List, Dict, Optional
+import logging
+import queue
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Iterable, Iterator, Callable
+from integrations import json_codec
+from integrations.jsonl_log import append_bytes, file_lock
+from integrations.people_cache import CachedAdapter
 
 DEFAULT_CSV = os.path.join(os.getcwd(), 'data', 'people.csv')
 DEFAULT_SQLITE = os.path.join(os.getcwd(), 'data', 'people.db')
 
 os.makedirs(os.path.join(os.getcwd(), 'data'), exist_ok=True)
 
+logger = logging.getLogger('integrations.db_adapters')
+
+FIELDNAMES = ['id', 'name', 'phone', 'telegram_id', 'consent', 'consent_ts', 'last_notified']
+
+
+def normalize_phone(phone) -> Optional[str]:
+    """Digits-only phone key used by the phone lookups; None when there are no digits."""
+    digits = ''.join(ch for ch in str(phone or '') if ch.isdigit())
+    return digits or None
+
+
+def _keyset_iter(fetch_page: Callable[[Optional[str]], List[Dict]], after: str = None) -> Iterator[Dict]:
+    # walk pages ordered by id, resuming after the last id seen; an empty page ends it
+    while True:
+        page = fetch_page(after)
+        if not page:
+            return
+        yield from page
+        after = page[-1]['id']
+
+
+def _like(query: str) -> str:
+    return '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _csv_chunks(src_path: str, chunk_size: int) -> Iterator[List[Dict]]:
+    """Read a people CSV in lists of `chunk_size` rows, giving id-less rows a uuid.
+
+    Ids repeated within a chunk are dropped after their first occurrence. A
+    repeat in a later chunk is left to the caller, whose existence check
+    sees the earlier chunk already written, so memory stays one chunk.
+    """
+    chunk = []
+    seen = set()
+    with open(src_path, 'r', encoding='utf-8', newline='') as f:
+        for r in csv.DictReader(f):
+            r['id'] = r.get('id') or str(uuid.uuid4())
+            if r['id'] in seen:
+                continue
+            seen.add(r['id'])
+            chunk.append(r)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+                seen = set()
+    if chunk:
+        yield chunk
+
+
+_WORD = re.compile(r'[^\W_]+')
+_PHONE_LIKE = re.compile(r'^[\d\s()+.-]+$')
+
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased search words; phone-looking input collapses to one digits-only word."""
+    q = (query or '').strip().lower()
+    if _PHONE_LIKE.match(q) and normalize_phone(q):
+        return [normalize_phone(q)]
+    return _WORD.findall(q)
+
+
+def _person_tokens(r: Dict) -> set:
+    # words a person can be found by: name words, id parts, telegram id,
+    # the phone's digit groups and its normalized digits
+    toks = set(_WORD.findall(str(r.get('name') or '').lower()))
+    toks.update(_WORD.findall(str(r.get('id') or '').lower()))
+    toks.update(_WORD.findall(str(r.get('phone') or '')))
+    ph = normalize_phone(r.get('phone'))
+    if ph:
+        toks.add(ph)
+    tg = str(r.get('telegram_id') or '').lower()
+    if tg:
+        toks.add(tg)
+    return toks
+
+
+def _check_columns(updates: Dict):
+    unknown = set(updates) - set(FIELDNAMES)
+    if unknown:
+        raise ValueError('Unknown people columns: ' + ', '.join(sorted(unknown)))
+
+
+def _as_consent(v) -> int:
+    # CSV sources carry consent as text; '0' must not count as truthy
+    if isinstance(v, str):
+        return int(v.strip() in ('1', 'True', 'true'))
+    return int(bool(v))
+
 
 class CSVAdapter:
-    def __init__(self, path: str = None):
+    """People store backed by a CSV file plus an append-only change journal.
+
+    Updates are appended to `<path>.journal` (one JSON line per change) instead
+    of rewriting the CSV; reads merge the base file with the journal. Once the
+    journal passes `journal_max_bytes` it is folded back into the CSV, which is
+    written to a temp file and atomically renamed into place.
+
+    Rows are held in an id-keyed dict. It is reloaded in full only when the base
+    file changes; journal growth from other processes is replayed incrementally.
+    Secondary dicts map normalized phone and telegram_id to person ids and are
+    kept in step with every applied change.
+    """
+
+    def __init__(self, path: str = None, journal_max_bytes: int = None):
         self.path = path or DEFAULT_CSV
+        self.journal_path = self.path + '.journal'
+        self.journal_max_bytes = journal_max_bytes or int(os.getenv('CSV_JOURNAL_MAX_BYTES', str(1024 * 1024)))
+        self.lock = threading.RLock()
+        self._index: Dict[str, Dict] = {}
+        self._by_phone: Dict[str, str] = {}
+        self._by_telegram: Dict[str, str] = {}
+        self._sorted_ids: Optional[List[str]] = None
+        # search: tokens sorted with their person ids in a parallel list, plus
+        # ids changed since they were built
+        self._tokens: Optional[List[str]] = None
+        self._token_ids: List[str] = []
+        self._tokens_dirty: set = set()
+        self._version = None
+        self._journal_pos = 0
         # ensure file exists
         if not os.path.exists(self.path):
-            with open(self.path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['id', 'name', 'phone', 'telegram_id', 'consent', 'consent_ts', 'last_notified'])
-                writer.writeheader()
+            self._write_rows([])
 
-    def list_people(self) -> List[Dict]:
-        rows = []
+    def _base_version(self):
         try:
-            with open(self.path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for r in reader:
-                    r['consent'] = r.get('consent') in ('1', 'True', 'true', True)
-                    rows.append(r)
+            st = os.stat(self.path)
         except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _unlink(self, r: Dict):
+        pid = r.get('id')
+        ph = normalize_phone(r.get('phone'))
+        if ph and self._by_phone.get(ph) == pid:
+            del self._by_phone[ph]
+        tg = str(r.get('telegram_id') or '')
+        if tg and self._by_telegram.get(tg) == pid:
+            del self._by_telegram[tg]
+
+    def _link(self, r: Dict):
+        ph = normalize_phone(r.get('phone'))
+        if ph:
+            self._by_phone[ph] = r.get('id')
+        tg = str(r.get('telegram_id') or '')
+        if tg:
+            self._by_telegram[tg] = r.get('id')
+
+    def _apply(self, person_id: str, vals: Dict):
+        if person_id in self._index:
+            row = self._index[person_id]
+            self._unlink(row)
+            row.update(vals)
+        else:
+            row = {'id': person_id}
+            row.update(vals)
+            self._index[person_id] = row
+            self._sorted_ids = None
+        self._link(row)
+        if self._tokens is not None:
+            self._tokens_dirty.add(person_id)
+
+    def _replay_journal(self):
+        try:
+            size = os.path.getsize(self.journal_path)
+        except OSError:
+            size = 0
+        if size < self._journal_pos:
+            # journal was compacted by another process
+            self._version = None
+            return self._load()
+        if size == self._journal_pos:
+            return
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self._journal_pos)
+            for ln in f:
+                if not ln.endswith(b'\n'):
+                    break
+                self._journal_pos += len(ln)
+                try:
+                    e = json_codec.loads(ln)
+                    # drop columns an older journal may carry so compaction can't fail on them
+                    self._apply(e['id'], {k: v for k, v in e['updates'].items() if k in FIELDNAMES})
+                except Exception:
+                    continue
+
+    def _load(self):
+        version = self._base_version()
+        if version is None:
+            self._index, self._version, self._journal_pos = {}, None, 0
+            self._by_phone, self._by_telegram, self._sorted_ids = {}, {}, None
+            self._tokens = None
+            return
+        if version != self._version:
+            index = {}
+            with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                for r in csv.DictReader(f):
+                    index[r.get('id')] = r
+            self._index, self._version, self._journal_pos = index, version, 0
+            self._by_phone, self._by_telegram, self._sorted_ids = {}, {}, None
+            self._tokens = None
+            for r in index.values():
+                self._link(r)
+        self._replay_journal()
+
+    def _write_rows(self, rows):
+        d = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix='.people-', suffix='.tmp', dir=d)
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writeheader()
+                for r in rows:
+                    writer.writerow(r)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            # in-memory rows may be ahead of the file now; force a reload
+            self._version = None
+            raise
+        self._version = self._base_version()
+
+    def _journal(self, changes: List[tuple], compact: bool = True):
+        """Append (id, updates) changes to the journal and apply them in memory."""
+        data = b''.join(json_codec.dumps_line({'id': pid, 'updates': vals}) for pid, vals in changes)
+        offset, end = append_bytes(self.journal_path, data)
+        if offset == self._journal_pos:
+            # nothing from other writers in between: our view is current
+            for pid, vals in changes:
+                self._apply(pid, vals)
+            self._journal_pos = end
+        else:
+            self._load()
+        if compact and end > self.journal_max_bytes:
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into the CSV and truncate it."""
+        with self.lock, file_lock(self.journal_path):
+            self._version = None
+            self._load()
+            self._write_rows(self._index.values())
+            # replaying a journal over a base that already contains it is harmless,
+            # so a crash between the rename and the truncate loses nothing
+            with open(self.journal_path, 'wb'):
+                pass
+            self._journal_pos = 0
+
+    @staticmethod
+    def _out(r: Dict) -> Dict:
+        r = dict(r)
+        r['consent'] = r.get('consent') in ('1', 'True', 'true', True)
+        return r
+
+    @staticmethod
+    def _matches(r: Dict, query: str, digits: Optional[str]) -> bool:
+        if any(query in str(r.get(k) or '').lower() for k in ('id', 'name', 'phone', 'telegram_id')):
+            return True
+        return bool(digits) and digits in (normalize_phone(r.get('phone')) or '')
+
+    def list_people(self, consent: Optional[bool] = None, after_id: str = None, limit: int = None,
+                    search: str = None) -> List[Dict]:
+        """People matching the filters. With `after_id` or `limit` rows come in id order
+        starting after `after_id`, so callers can page with the last id they saw."""
+        query = (search or '').strip().lower()
+        digits = normalize_phone(query)
+        with self.lock:
+            self._load()
+            if after_id is None and limit is None:
+                ids = self._index.keys()
+            else:
+                if self._sorted_ids is None:
+                    self._sorted_ids = sorted(k for k in self._index if k is not None)
+                ids = self._sorted_ids
+                if after_id is not None:
+                    ids = ids[bisect.bisect_right(ids, after_id):]
+            out = []
+            for pid in ids:
+                r = self._index[pid]
+                if query and not self._matches(r, query, digits):
+                    continue
+                r = self._out(r)
+                if consent is not None and r['consent'] != bool(consent):
+                    continue
+                out.append(r)
+                if limit is not None and len(out) >= limit:
+                    break
+            return out
+
+    def iter_people(self, batch_size: int = 1000, consent: Optional[bool] = None, after_id: str = None) -> Iterator[Dict]:
+        """Stream every person (after `after_id`, if given) in id order, `batch_size` rows at a time."""
+        return _keyset_iter(lambda after: self.list_people(consent=consent, after_id=after, limit=batch_size), after_id)
+
+    def _token_range(self, term: str):
+        return bisect.bisect_left(self._tokens, term), bisect.bisect_left(self._tokens, term + '\U0010ffff')
+
+    def _build_tokens(self):
+        pairs = sorted((t, pid) for pid, r in self._index.items() for t in _person_tokens(r))
+        self._tokens = [t for t, _ in pairs]
+        self._token_ids = [pid for _, pid in pairs]
+        self._tokens_dirty = set()
+
+    def search_people(self, query: str, limit: int = 20) -> List[Dict]:
+        """People having a word that starts with every search term (see `search_terms`).
+
+        Backed by a sorted token list: each term is a bisect range, the
+        narrowest range supplies candidates and the other terms are checked
+        on the row. Rows changed since the list was built are scanned
+        directly until enough of them pile up to justify a rebuild.
+        """
+        terms = search_terms(query)
+        if not terms:
             return []
-        return rows
+        with self.lock:
+            self._load()
+            if self._tokens is None or len(self._tokens_dirty) > max(10000, len(self._index) // 10):
+                self._build_tokens()
+            lo, hi = min((self._token_range(t) for t in terms), key=lambda r: r[1] - r[0])
+            candidates = (self._token_ids[i] for i in range(lo, hi))
+            out, seen = [], set()
+            for pid in itertools.chain(candidates, list(self._tokens_dirty)):
+                if pid in seen or pid not in self._index:
+                    continue
+                seen.add(pid)
+                toks = _person_tokens(self._index[pid])
+                if all(any(tok.startswith(t) for tok in toks) for t in terms):
+                    out.append(self._out(self._index[pid]))
+                    if len(out) >= limit:
+                        break
+            return out
 
     def get_person(self, person_id: str) -> Optional[Dict]:
-        for p in self.list_people():
-            if p.get('id') == person_id:
-                return p
-        return None
+        with self.lock:
+            self._load()
+            r = self._index.get(person_id)
+            return self._out(r) if r is not None else None
+
+    def get_person_by_phone(self, phone: str) -> Optional[Dict]:
+        key = normalize_phone(phone)
+        with self.lock:
+            self._load()
+            pid = self._by_phone.get(key) if key else None
+            return self._out(self._index[pid]) if pid in self._index else None
+
+    def get_person_by_telegram_id(self, telegram_id) -> Optional[Dict]:
+        key = str(telegram_id or '')
+        with self.lock:
+            self._load()
+            pid = self._by_telegram.get(key) if key else None
+            return self._out(self._index[pid]) if pid in self._index else None
+
+    def get_people(self, ids: Iterable[str]) -> Dict[str, Dict]:
+        with self.lock:
+            self._load()
+            return {pid: self._out(self._index[pid]) for pid in ids if pid in self._index}
 
     def update_person(self, person_id: str, updates: Dict) -> Dict:
-        people = self.list_people()
-        found = False
-        for p in people:
-            if p.get('id') == person_id:
-                p.update({k: (v if not isinstance(v, bool) else str(int(v))) for k, v in updates.items()})
-                found = True
-                break
-        if not found:
-            new = {'id': person_id}
-            new.update(updates)
-            people.append(new)
-        with open(self.path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['id', 'name', 'phone', 'telegram_id', 'consent', 'consent_ts', 'last_notified'])
-            writer.writeheader()
-            for r in people:
-                writer.writerow(r)
+        # reject before journaling: the CSV cannot hold other columns
+        _check_columns(updates)
+        vals = {k: (v if not isinstance(v, bool) else str(int(v))) for k, v in updates.items()}
+        with self.lock:
+            self._load()
+            self._journal([(person_id, vals)])
         return updates
 
-    def migrate_from_csv(self, src_path: str) -> int:
-        # copy rows from another csv into this adapter
+    def upsert_many(self, people: Iterable[Dict], batch_size: int = 10000) -> int:
+        """Insert or update full person dicts (each must carry an 'id'), one journal append per batch."""
+        count = 0
+        batch = []
+        with self.lock:
+            self._load()
+            for p in people:
+                batch.append((p['id'], {k: (str(int(v)) if isinstance(v, bool) else v) for k, v in p.items() if k in FIELDNAMES}))
+                if len(batch) >= batch_size:
+                    # fold the journal in once at the end rather than after every batch
+                    self._journal(batch, compact=False)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self._journal(batch, compact=False)
+                count += len(batch)
+            if self._journal_pos > self.journal_max_bytes:
+                self.compact()
+        return count
+
+    def migrate_from_csv(self, src_path: str, chunk_size: int = 10000) -> int:
+        # copy rows not yet present from another csv into this adapter
         if not os.path.exists(src_path):
             return 0
         count = 0
-        with open(src_path, 'r', encoding='utf-8') as sf:
-            reader = csv.DictReader(sf)
-            people = self.list_people()
-            existing_ids = {p['id'] for p in people}
-            for r in reader:
-                if not r.get('id'):
-                    r['id'] = str(uuid.uuid4())
-                if r['id'] in existing_ids:
-                    continue
-                people.append(r)
-                count += 1
-        with open(self.path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['id', 'name', 'phone', 'telegram_id', 'consent', 'consent_ts', 'last_notified'])
-            writer.writeheader()
-            for r in people:
-                writer.writerow(r)
+        with self.lock:
+            self._load()
+            # each chunk is written before the next is checked against the in-memory index
+            for chunk in _csv_chunks(src_path, chunk_size):
+                count += self.upsert_many([r for r in chunk if r['id'] not in self._index], batch_size=chunk_size)
         return count
 
 
+_SQL_COLS = ', '.join(FIELDNAMES)
+
+
+def _list_sql(consent: Optional[bool], after_id: Optional[str], limit: Optional[int], search: Optional[str]):
+    """SELECT statement and parameters behind SQLite list_people."""
+    where, params = [], []
+    if consent is not None:
+        where.append('consent=?')
+        params.append(int(bool(consent)))
+    query = (search or '').strip()
+    if query:
+        like = _like(query)
+        terms = ["name LIKE ? ESCAPE '\\'", "id LIKE ? ESCAPE '\\'", "phone LIKE ? ESCAPE '\\'",
+                 "telegram_id LIKE ? ESCAPE '\\'"]
+        params += [like] * len(terms)
+        digits = normalize_phone(query)
+        if digits:
+            terms.append('phone_norm LIKE ?')
+            params.append('%' + digits + '%')
+        where.append('(' + ' OR '.join(terms) + ')')
+    if after_id is not None:
+        where.append('id > ?')
+        params.append(after_id)
+    sql = f'SELECT {_SQL_COLS} FROM people'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    if after_id is not None or limit is not None:
+        sql += ' ORDER BY id'
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(int(limit))
+    return sql, params
+
+
+def _search_sql(query: str, limit: int):
+    """FTS5 statement behind SQLite search_people, or None when the query has no terms."""
+    terms = search_terms(query)
+    if not terms:
+        return None
+    match = ' AND '.join('"' + t.replace('"', '""') + '"*' for t in terms)
+    cols = ', '.join('p.' + k for k in FIELDNAMES)
+    return (f'SELECT {cols} FROM people_fts JOIN people p ON p.rowid = people_fts.rowid '
+            f'WHERE people_fts MATCH ? LIMIT ?', (match, int(limit)))
+
+
+def _upsert_row(person_id: str, updates: Dict):
+    """(columns, values) for one people upsert; values start with the id."""
+    _check_columns(updates)
+    cols = tuple(k for k in FIELDNAMES[1:] if k in updates)
+    vals = [person_id] + [_as_consent(updates[k]) if k == 'consent' else updates[k] for k in cols]
+    if 'phone' in cols:
+        cols += ('phone_norm',)
+        vals.append(normalize_phone(updates['phone']))
+    return cols, vals
+
+
+def _upsert_sql(cols: tuple) -> str:
+    names = ('id',) + cols
+    sql = f"INSERT INTO people ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) ON CONFLICT(id) DO "
+    if cols:
+        return sql + 'UPDATE SET ' + ', '.join(f'{c}=excluded.{c}' for c in cols)
+    return sql + 'NOTHING'
+
+
 class SQLiteAdapter:
-    def __init__(self, path: str = None):
+    """People store in a SQLite database, safe to share between threads.
+
+    Connections come from a small pool (`pool_size`, SQLITE_POOL_SIZE); a
+    connection is only ever used by the thread that checked it out. Under WAL
+    readers never block, so reads run in parallel on their own connections;
+    writes are serialized in-process by a lock and across processes by
+    SQLite's busy timeout.
+    """
+
+    # ids bound per IN (...) query; SQLite before 3.32 allows 999 parameters
+    IN_BATCH = 500
+
+    def __init__(self, path: str = None, cache_kb: int = None, pool_size: int = None):
         self.path = path or DEFAULT_SQLITE
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.cache_kb = cache_kb or int(os.getenv('SQLITE_CACHE_KB', '65536'))
+        self.pool_size = pool_size or int(os.getenv('SQLITE_POOL_SIZE', '8'))
+        self._pool: 'queue.LifoQueue[sqlite3.Connection]' = queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.Lock()
         self._ensure_schema()
 
+    def _connect(self) -> sqlite3.Connection:
+        # connections move between threads through the pool but are never used concurrently
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._tune(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Check a pooled connection out for the duration of the with-block."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                grow = self._opened < self.pool_size
+                if grow:
+                    self._opened += 1
+            if grow:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    with self._pool_lock:
+                        self._opened -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _write(self):
+        # one writer at a time; the inner `with conn` commits or rolls back the batch
+        with self._write_lock, self.connection() as conn, conn:
+            yield conn
+
+    def close(self):
+        """Close every idle pooled connection."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._pool_lock:
+                self._opened -= 1
+
+    def _tune(self, conn):
+        # WAL lets readers run alongside the writer; NORMAL sync is durable across
+        # app crashes under WAL and avoids an fsync per commit
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_kb)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+
     def _ensure_schema(self):
-        c = self.conn.cursor()
+        with self._write() as conn:
+            # take the database write lock before reading the schema, so two
+            # processes opening an older file cannot both run the same ALTER
+            conn.execute('BEGIN IMMEDIATE')
+            self._create_schema(conn.cursor())
+            self.fts = self._create_search_index(conn.cursor())
+
+    @staticmethod
+    def _create_search_index(c) -> bool:
+        """FTS5 index over people kept in sync by triggers; False if FTS5 is unavailable."""
+        if c.execute("SELECT 1 FROM sqlite_master WHERE name='people_fts'").fetchone():
+            return True
+        try:
+            c.execute('''CREATE VIRTUAL TABLE people_fts USING fts5(
+                name, phone, phone_norm, telegram_id, id,
+                content='people', content_rowid='rowid', prefix='2 3 4')''')
+        except sqlite3.OperationalError:
+            return False
+        cols = 'name, phone, phone_norm, telegram_id, id'
+        new = ', '.join('new.' + k for k in cols.split(', '))
+        old = ', '.join('old.' + k for k in cols.split(', '))
+        c.execute(f'''CREATE TRIGGER people_fts_ai AFTER INSERT ON people BEGIN
+            INSERT INTO people_fts(rowid, {cols}) VALUES (new.rowid, {new}); END''')
+        c.execute(f'''CREATE TRIGGER people_fts_ad AFTER DELETE ON people BEGIN
+            INSERT INTO people_fts(people_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END''')
+        c.execute(f'''CREATE TRIGGER people_fts_au AFTER UPDATE ON people BEGIN
+            INSERT INTO people_fts(people_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old});
+            INSERT INTO people_fts(rowid, {cols}) VALUES (new.rowid, {new}); END''')
+        # index rows that predate the search table
+        c.execute("INSERT INTO people_fts(people_fts) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def _create_schema(c):
         c.execute('''
         CREATE TABLE IF NOT EXISTS people (
             id TEXT PRIMARY KEY,
@@ -101,110 +610,320 @@ class SQLiteAdapter:
             last_notified INTEGER
         )
         ''')
-        self.conn.commit()
-
-    def list_people(self) -> List[Dict]:
-        c = self.conn.cursor()
-        c.execute('SELECT id, name, phone, telegram_id, consent, consent_ts, last_notified FROM people')
-        rows = []
-        for r in c.fetchall():
-            rows.append({
-                'id': r[0], 'name': r[1], 'phone': r[2], 'telegram_id': r[3],
-                'consent': bool(r[4]), 'consent_ts': r[5], 'last_notified': r[6]
-            })
-        return rows
+        have = {r[1] for r in c.execute('PRAGMA table_info(people)')}
+        if 'phone_norm' not in have:
+            # databases created before the phone lookup: add and backfill the key column
+            c.execute('ALTER TABLE people ADD COLUMN phone_norm TEXT')
+            rows = c.execute('SELECT id, phone FROM people WHERE phone IS NOT NULL').fetchall()
+            c.executemany('UPDATE people SET phone_norm=? WHERE id=?', [(normalize_phone(ph), pid) for pid, ph in rows])
+        c.execute('CREATE INDEX IF NOT EXISTS idx_people_phone_norm ON people(phone_norm)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_people_telegram_id ON people(telegram_id)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_people_consent ON people(consent)')
 
-    def get_person(self, person_id: str) -> Optional[Dict]:
-        c = self.conn.cursor()
-        c.execute('SELECT id, name, phone, telegram_id, consent, consent_ts, last_notified FROM people WHERE id=?', (person_id,))
-        r = c.fetchone()
-        if not r:
-            return None
+    @staticmethod
+    def _row(r) -> Dict:
         return {'id': r[0], 'name': r[1], 'phone': r[2], 'telegram_id': r[3], 'consent': bool(r[4]), 'consent_ts': r[5], 'last_notified': r[6]}
 
+    def _one(self, where: str, params: tuple) -> Optional[Dict]:
+        with self.connection() as conn:
+            r = conn.execute(f'SELECT {_SQL_COLS} FROM people WHERE {where} LIMIT 1', params).fetchone()
+        return self._row(r) if r else None
+
+    def list_people(self, consent: Optional[bool] = None, after_id: str = None, limit: int = None,
+                    search: str = None) -> List[Dict]:
+        """People matching the filters. With `after_id` or `limit` rows come in id order
+        starting after `after_id` (a primary-key range scan), so callers can page with
+        the last id they saw."""
+        sql, params = _list_sql(consent, after_id, limit, search)
+        with self.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row(r) for r in rows]
+
+    def iter_people(self, batch_size: int = 1000, consent: Optional[bool] = None, after_id: str = None) -> Iterator[Dict]:
+        """Stream every person (after `after_id`, if given) in id order, `batch_size` rows at a time."""
+        return _keyset_iter(lambda after: self.list_people(consent=consent, after_id=after, limit=batch_size), after_id)
+
+    def count_people(self) -> int:
+        with self.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM people').fetchone()[0]
+
+    def search_people(self, query: str, limit: int = 20) -> List[Dict]:
+        """People having a word that starts with every search term, via the FTS5 prefix index."""
+        if not self.fts:
+            return self.list_people(search=query, limit=limit)
+        stmt = _search_sql(query, limit)
+        if stmt is None:
+            return []
+        with self.connection() as conn:
+            rows = conn.execute(*stmt).fetchall()
+        return [self._row(r) for r in rows]
+
+    def get_person(self, person_id: str) -> Optional[Dict]:
+        return self._one('id=?', (person_id,))
+
+    def get_person_by_phone(self, phone: str) -> Optional[Dict]:
+        key = normalize_phone(phone)
+        return self._one('phone_norm=?', (key,)) if key else None
+
+    def get_person_by_telegram_id(self, telegram_id) -> Optional[Dict]:
+        key = str(telegram_id or '')
+        return self._one('telegram_id=?', (key,)) if key else None
+
     def update_person(self, person_id: str, updates: Dict) -> Dict:
-        # ensure person exists
-        p = self.get_person(person_id)
-        if not p:
-            # insert
-            cols = ['id', 'name', 'phone', 'telegram_id', 'consent', 'consent_ts', 'last_notified']
-            vals = [person_id, updates.get('name'), updates.get('phone'), updates.get('telegram_id'), int(updates.get('consent', 0)), updates.get('consent_ts'), updates.get('last_notified')]
-            c = self.conn.cursor()
-            c.execute('INSERT OR REPLACE INTO people (id,name,phone,telegram_id,consent,consent_ts,last_notified) VALUES (?,?,?,?,?,?,?)', vals)
-            self.conn.commit()
-            return updates
-        # update existing
-        set_parts = []
-        vals = []
-        for k, v in updates.items():
-            if k == 'consent':
-                v = int(bool(v))
-            set_parts.append(f"{k}=?")
-            vals.append(v)
-        vals.append(person_id)
-        c = self.conn.cursor()
-        c.execute(f"UPDATE people SET {', '.join(set_parts)} WHERE id=?", vals)
-        self.conn.commit()
+        self.update_many([(person_id, updates)])
         return updates
 
-    def migrate_from_csv(self, src_path: str) -> int:
+    def update_many(self, updates: Iterable, batch_size: int = 10000) -> int:
+        """Apply (person_id, updates) pairs in one transaction; missing people are inserted.
+
+        Rows are grouped by the set of columns they touch and written with
+        executemany + INSERT ... ON CONFLICT(id) DO UPDATE, so each person costs one
+        statement execution and the whole batch one commit.
+        """
+        count = 0
+        with self._write() as conn:
+            groups: Dict[tuple, list] = {}
+            pending = 0
+            for person_id, upd in updates:
+                cols, vals = _upsert_row(person_id, upd)
+                groups.setdefault(cols, []).append(vals)
+                pending += 1
+                count += 1
+                if pending >= batch_size:
+                    self._flush_upserts(conn, groups)
+                    groups, pending = {}, 0
+            self._flush_upserts(conn, groups)
+        return count
+
+    def upsert_many(self, people: Iterable[Dict], batch_size: int = 10000) -> int:
+        """Insert or update full person dicts (each must carry an 'id') in one transaction."""
+        return self.update_many(((p['id'], {k: v for k, v in p.items() if k != 'id'}) for p in people), batch_size)
+
+    @staticmethod
+    def _flush_upserts(conn, groups: Dict[tuple, list]):
+        for cols, rows in groups.items():
+            conn.executemany(_upsert_sql(cols), rows)
+
+    def get_people(self, ids: Iterable[str]) -> Dict[str, Dict]:
+        """Fetch many people by id with one IN query per IN_BATCH ids; missing ids are absent."""
+        ids = list(ids)
+        out = {}
+        with self.connection() as conn:
+            for i in range(0, len(ids), self.IN_BATCH):
+                part = ids[i:i + self.IN_BATCH]
+                sql = f"SELECT {_SQL_COLS} FROM people WHERE id IN ({', '.join('?' * len(part))})"
+                for r in conn.execute(sql, part):
+                    out[r[0]] = self._row(r)
+        return out
+
+    def migrate_from_csv(self, src_path: str, chunk_size: int = 5000) -> int:
+        """Copy people not yet present from a CSV, one existence query and one transaction per chunk."""
         if not os.path.exists(src_path):
             return 0
         count = 0
-        with open(src_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                pid = r.get('id') or str(uuid.uuid4())
-                if self.get_person(pid):
-                    continue
-                self.update_person(pid, {'name': r.get('name'), 'phone': r.get('phone'), 'telegram_id': r.get('telegram_id'), 'consent': int(r.get('consent') in ('1','True','true')),'consent_ts': r.get('consent_ts'), 'last_notified': r.get('last_notified')})
-                count += 1
+        for chunk in _csv_chunks(src_path, chunk_size):
+            ids = [r['id'] for r in chunk]
+            with self._write() as conn:
+                existing = set()
+                # stay under SQLITE_MAX_VARIABLE_NUMBER (999 before SQLite 3.32) whatever chunk_size is
+                for i in range(0, len(ids), self.IN_BATCH):
+                    part = ids[i:i + self.IN_BATCH]
+                    existing.update(r[0] for r in conn.execute(
+                        f"SELECT id FROM people WHERE id IN ({', '.join('?' * len(part))})", part))
+                groups = {}
+                for r in chunk:
+                    if r['id'] in existing:
+                        continue
+                    groups.setdefault(tuple(FIELDNAMES[1:]) + ('phone_norm',), []).append(
+                        [r['id']] + [_as_consent(r.get(k)) if k == 'consent' else r.get(k) for k in FIELDNAMES[1:]]
+                        + [normalize_phone(r.get('phone'))])
+                    count += 1
+                self._flush_upserts(conn, groups)
         return count
 
 
 class MongoAdapter:
-    def __init__(self, uri: str = None, dbname: str = 'fraudshield'):
+    """People store in a MongoDB collection.
+
+    The client pool is sized explicitly (MONGODB_MAX_POOL_SIZE /
+    MONGODB_MIN_POOL_SIZE); pass `client` to share an existing MongoClient (or a
+    test double). `close()` shuts down a client the adapter created itself.
+    Indexes are created at startup: unique on `id`, plus `phone_norm`,
+    `telegram_id` and `consent` for the lookups and filters.
+    Listings stream from the server `batch_size` documents per round trip.
+    """
+
+    def __init__(self, uri: str = None, dbname: str = 'fraudshield', client=None, batch_size: int = None):
         try:
             from pymongo import MongoClient
         except Exception:
             raise RuntimeError('pymongo not installed')
-        uri = uri or os.getenv('MONGODB_URI')
-        self.client = MongoClient(uri)
+        # only a client we created is ours to close
+        self._owns_client = client is None
+        if client is None:
+            uri = uri or os.getenv('MONGODB_URI')
+            client = MongoClient(
+                uri,
+                maxPoolSize=int(os.getenv('MONGODB_MAX_POOL_SIZE', '50')),
+                minPoolSize=int(os.getenv('MONGODB_MIN_POOL_SIZE', '0')),
+                serverSelectionTimeoutMS=int(os.getenv('MONGODB_TIMEOUT_MS', '5000')),
+            )
+        self.client = client
         self.db = self.client[dbname]
+        self.batch_size = batch_size or int(os.getenv('MONGODB_BATCH_SIZE', '1000'))
+        self._ensure_indexes()
+
+    def _ensure_indexes(self):
+        from pymongo.errors import OperationFailure
+        people = self.db.people
+        try:
+            people.create_index('id', unique=True, name='id_unique')
+        except OperationFailure as e:
+            # duplicate ids already stored: fall back to a plain index so lookups stay indexed
+            logger.warning('Could not create unique index on people.id (%s); using a non-unique index', e)
+            people.create_index('id')
+        else:
+            # an older non-unique index on id is now redundant
+            if 'id_1' in people.index_information():
+                people.drop_index('id_1')
+        people.create_index('phone_norm')
+        people.create_index('telegram_id')
+        people.create_index('consent')
+
+    def close(self):
+        """Close the MongoClient (its pool and monitor threads) unless it was passed in."""
+        if self._owns_client:
+            self.client.close()
 
-    def list_people(self):
-        return list(self.db.people.find({}, {'_id':0}))
+    def _query(self, consent: Optional[bool] = None, after_id: str = None, search: str = None) -> Dict:
+        query = {}
+        if consent is not None:
+            # rows migrated from CSV may carry consent as text
+            truthy = [True, 1, '1', 'True', 'true']
+            query['consent'] = {'$in': truthy} if consent else {'$nin': truthy}
+        if after_id is not None:
+            query['id'] = {'$gt': after_id}
+        q = (search or '').strip()
+        if q:
+            pattern = {'$regex': re.escape(q), '$options': 'i'}
+            terms = [{k: pattern} for k in ('name', 'id', 'phone', 'telegram_id')]
+            digits = normalize_phone(q)
+            if digits:
+                terms.append({'phone_norm': {'$regex': re.escape(digits)}})
+            query['$or'] = terms
+        return query
+
+    def list_people(self, consent: Optional[bool] = None, after_id: str = None, limit: int = None,
+                    search: str = None):
+        cur = self.db.people.find(self._query(consent, after_id, search), {'_id': 0, 'phone_norm': 0})
+        cur = cur.batch_size(min(int(limit), self.batch_size) if limit else self.batch_size)
+        if after_id is not None or limit is not None:
+            cur = cur.sort('id', 1)
+        if limit is not None:
+            cur = cur.limit(int(limit))
+        return list(cur)
+
+    def search_people(self, query: str, limit: int = 20):
+        """Word-prefix search like the other adapters. Only the phone/telegram/id
+        terms can use an index; name matching is a case-insensitive regex scan."""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        clauses = []
+        for t in terms:
+            prefix = '^' + re.escape(t)
+            clauses.append({'$or': [{'name': {'$regex': r'(^|\W)' + re.escape(t), '$options': 'i'}},
+                                    {'phone_norm': {'$regex': prefix}}, {'telegram_id': {'$regex': prefix}},
+                                    {'id': {'$regex': prefix, '$options': 'i'}}]})
+        return list(self.db.people.find({'$and': clauses}, {'_id': 0, 'phone_norm': 0}).limit(int(limit)))
+
+    def iter_people(self, batch_size: int = None, consent: Optional[bool] = None, after_id: str = None):
+        """Stream every person (after `after_id`, if given) in id order; the driver fetches
+        `batch_size` documents per round trip."""
+        batch_size = batch_size or self.batch_size
+        cur = self.db.people.find(self._query(consent, after_id), {'_id': 0, 'phone_norm': 0}).sort('id', 1)
+        return iter(cur.batch_size(batch_size))
+
+    def count_people(self) -> int:
+        return self.db.people.count_documents({})
 
     def get_person(self, person_id: str):
-        return self.db.people.find_one({'id': person_id}, {'_id':0})
+        return self.db.people.find_one({'id': person_id}, {'_id': 0, 'phone_norm': 0})
+
+    def get_person_by_phone(self, phone: str):
+        key = normalize_phone(phone)
+        return self.db.people.find_one({'phone_norm': key}, {'_id': 0, 'phone_norm': 0}) if key else None
+
+    def get_person_by_telegram_id(self, telegram_id):
+        key = str(telegram_id or '')
+        return self.db.people.find_one({'telegram_id': key}, {'_id': 0, 'phone_norm': 0}) if key else None
+
+    @staticmethod
+    def _doc(person_id: str, updates: Dict) -> Dict:
+        doc = dict(updates)
+        doc['id'] = person_id
+        if 'phone' in doc:
+            doc['phone_norm'] = normalize_phone(doc['phone'])
+        if doc.get('telegram_id') not in (None, ''):
+            doc['telegram_id'] = str(doc['telegram_id'])
+        return doc
 
     def update_person(self, person_id: str, updates: Dict):
-        self.db.people.update_one({'id': person_id}, {'$set': updates}, upsert=True)
+        self.db.people.update_one({'id': person_id}, {'$set': self._doc(person_id, updates)}, upsert=True)
         return updates
 
-    def migrate_from_csv(self, src_path: str) -> int:
+    def get_people(self, ids: Iterable[str]) -> Dict[str, Dict]:
+        out = {}
+        for p in self.db.people.find({'id': {'$in': list(ids)}}, {'_id': 0, 'phone_norm': 0}):
+            out[p['id']] = p
+        return out
+
+    def update_many(self, updates: Iterable, batch_size: int = 1000) -> int:
+        """Apply (person_id, updates) pairs as upserts, one unordered bulk_write per batch."""
+        from pymongo import UpdateOne
+        count = 0
+        ops = []
+        for person_id, upd in updates:
+            ops.append(UpdateOne({'id': person_id}, {'$set': self._doc(person_id, upd)}, upsert=True))
+            if len(ops) >= batch_size:
+                self.db.people.bulk_write(ops, ordered=False)
+                count += len(ops)
+                ops = []
+        if ops:
+            self.db.people.bulk_write(ops, ordered=False)
+            count += len(ops)
+        return count
+
+    def upsert_many(self, people: Iterable[Dict], batch_size: int = 1000) -> int:
+        """Insert or update full person dicts (each must carry an 'id')."""
+        return self.update_many(((p['id'], p) for p in people), batch_size)
+
+    def migrate_from_csv(self, src_path: str, chunk_size: int = 1000) -> int:
+        """Copy people not yet present from a CSV: one $in query and one bulk_write per chunk."""
         if not os.path.exists(src_path):
             return 0
-        import csv
         count = 0
-        with open(src_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                pid = r.get('id') or str(uuid.uuid4())
-                if self.get_person(pid):
-                    continue
-                self.update_person(pid, r)
-                count += 1
+        for chunk in _csv_chunks(src_path, chunk_size):
+            existing = {p['id'] for p in self.db.people.find({'id': {'$in': [r['id'] for r in chunk]}}, {'_id': 0, 'id': 1})}
+            count += self.upsert_many([r for r in chunk if r['id'] not in existing], batch_size=chunk_size)
         return count
 
 
-def get_db_adapter(backend: str = None):
+def get_db_adapter(backend: str = None, cache_ttl: float = None):
+    """Adapter for `backend` (DATA_BACKEND). With a positive `cache_ttl` (PEOPLE_CACHE_TTL
+    seconds) it is wrapped in a CachedAdapter holding up to PEOPLE_CACHE_MAX entries."""
     backend = backend or os.getenv('DATA_BACKEND', 'sqlite')
     backend = backend.lower()
     if backend == 'csv':
-        return CSVAdapter()
-    if backend == 'sqlite':
-        return SQLiteAdapter()
-    if backend == 'mongodb':
-        return MongoAdapter()
-    raise ValueError('Unknown DATA_BACKEND: ' + str(backend))
+        adapter = CSVAdapter()
+    elif backend == 'sqlite':
+        adapter = SQLiteAdapter()
+    elif backend == 'mongodb':
+        adapter = MongoAdapter()
+    else:
+        raise ValueError('Unknown DATA_BACKEND: ' + str(backend))
+    if cache_ttl is None:
+        cache_ttl = float(os.getenv('PEOPLE_CACHE_TTL', '0'))
+    if cache_ttl > 0:
+        return CachedAdapter(adapter, max_entries=int(os.getenv('PEOPLE_CACHE_MAX', '10000')), ttl=cache_ttl)
+    return adapter
@@ -0,0 +1,66 @@
+"""HTTP endpoints over the decision log, as a Flask blueprint.
+
+    GET /decisions/<transaction_id>   one decision and its per-feature explanation
+    GET /export/decisions             streamed export (format=csv|ndjson|parquet,
+                                      start, end, fields=a,b,c, chunk_size)
+
+Register it on any Flask app with `app.register_blueprint(decisions_api)`.
+
+Both endpoints expose customer decisions, so every request must carry
+`Authorization: Bearer <DECISIONS_API_TOKEN>`; with no token configured the
+endpoints answer 403.
+"""
+import os
+import hmac
+from flask import Blueprint, Response, jsonify, request
+from integrations.live_metrics import get_decision, explain_decision
+from integrations.log_export import export_decisions, FORMATS
+
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson', 'parquet': 'application/vnd.apache.parquet'}
+
+decisions_api = Blueprint('decisions_api', __name__)
+
+
+@decisions_api.before_request
+def require_token():
+    token = os.getenv('DECISIONS_API_TOKEN')
+    if not token:
+        return Response("Decision API disabled: set DECISIONS_API_TOKEN", status=403)
+    auth = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(auth.encode(), f'Bearer {token}'.encode()):
+        return Response("Unauthorized", status=401, headers={'WWW-Authenticate': 'Bearer'})
+
+
+@decisions_api.route('/decisions/<transaction_id>', methods=['GET'])
+def decision_detail(transaction_id):
+    # O(1) lookup through the persistent transaction index
+    rec = get_decision(transaction_id)
+    if rec is None:
+        return Response("Unknown transaction", status=404)
+    return jsonify({'decision': rec, 'explanation': explain_decision(rec)})
+
+
+@decisions_api.route('/export/decisions', methods=['GET'])
+def export_decision_logs():
+    # streamed in chunks so memory stays flat regardless of log size
+    fmt = (request.args.get('format') or 'csv').lower()
+    if fmt not in FORMATS:
+        return Response("Unknown format", status=400)
+    try:
+        chunk_size = int(request.args.get('chunk_size') or 1000)
+    except ValueError:
+        return Response("Invalid chunk_size", status=400)
+    fields = request.args.get('fields')
+    try:
+        chunks = export_decisions(
+            fmt,
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            fields=fields.split(',') if fields else None,
+            chunk_size=chunk_size,
+        )
+    except RuntimeError as e:
+        # e.g. parquet without pyarrow; refused before any bytes are sent
+        return Response(str(e), status=501)
+    headers = {'Content-Disposition': f'attachment; filename=decisions.{fmt}'}
+    return Response(chunks, mimetype=EXPORT_MIMETYPES[fmt], headers=headers)
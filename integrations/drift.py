@@ -0,0 +1,152 @@
+"""Streaming input drift detection against the training distribution.
+
+At training time each feature gets fixed bin edges (training quantiles) and a
+reference histogram. Every logged decision increments the live histogram for
+each feature, so PSI and KS are computed from bin counts in O(bins) no matter
+how many decisions have been seen.
+"""
+import os
+import json
+import logging
+from typing import Dict, List, Optional
+import numpy as np
+from integrations.jsonl_log import file_lock
+
+LOG_DIR = os.path.join(os.getcwd(), 'logs')
+os.makedirs(LOG_DIR, exist_ok=True)
+DRIFT_REFERENCE_FILE = os.path.join(LOG_DIR, 'drift_reference.json')
+DRIFT_LIVE_FILE = os.path.join(LOG_DIR, 'drift_live.json')
+
+PSI_ALERT = float(os.getenv('DRIFT_PSI_ALERT', '0.2'))
+KS_ALERT = float(os.getenv('DRIFT_KS_ALERT', '0.2'))
+MIN_SAMPLES = int(os.getenv('DRIFT_MIN_SAMPLES', '30'))
+_EPS = 1e-4
+
+logger = logging.getLogger('integrations.drift')
+
+
+def _psi(ref: np.ndarray, live: np.ndarray) -> float:
+    e = np.clip(ref / max(ref.sum(), 1), _EPS, None)
+    a = np.clip(live / max(live.sum(), 1), _EPS, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def _ks(ref: np.ndarray, live: np.ndarray) -> float:
+    # KS statistic on the binned CDFs
+    e = np.cumsum(ref) / max(ref.sum(), 1)
+    a = np.cumsum(live) / max(live.sum(), 1)
+    return float(np.max(np.abs(e - a))) if len(e) else 0.0
+
+
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_json(path: str, obj: Dict):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
+
+
+class DriftMonitor:
+    """Fixed-bin reference vs live histograms per feature, persisted under logs/.
+
+    Live counts are updated with a read-modify-write under a cross-process file
+    lock, so every writer (app sessions, scripts) contributes to one histogram.
+    """
+
+    def __init__(self, reference_path: str = None, live_path: str = None, bins: int = 10):
+        self.reference_path = reference_path or DRIFT_REFERENCE_FILE
+        self.live_path = live_path or DRIFT_LIVE_FILE
+        self.bins = bins
+        self.reference = _read_json(self.reference_path)
+
+    def fit_reference(self, df, feature_names: List[str]) -> Dict:
+        """Build bin edges and reference histograms from the training frame.
+
+        Live counts are reset only when the reference actually changes.
+        """
+        features = {}
+        for name in feature_names:
+            col = np.asarray(df[name], dtype=float) if name in df else np.array([])
+            col = col[np.isfinite(col)]
+            if not len(col):
+                continue
+            qs = np.quantile(col, np.linspace(0, 1, self.bins + 1)[1:-1])
+            cuts = np.unique(qs)
+            counts = np.bincount(np.searchsorted(cuts, col, side='right'), minlength=len(cuts) + 1)
+            features[name] = {'cuts': cuts.tolist(), 'counts': counts.tolist()}
+        ref = {'features': features}
+        if ref != self.reference:
+            with file_lock(self.live_path + '.lock'):
+                _write_json(self.reference_path, ref)
+                _write_json(self.live_path, {'counts': {}, 'alerted': []})
+            self.reference = ref
+        return ref
+
+    def update(self, inputs: Dict[str, float]):
+        """Add one decision's feature values to the live histograms."""
+        if not self.reference:
+            return
+        feats = self.reference['features']
+        with file_lock(self.live_path + '.lock'):
+            live = _read_json(self.live_path) or {'counts': {}, 'alerted': []}
+            for name, value in inputs.items():
+                spec = feats.get(name)
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if spec is None or not np.isfinite(value):
+                    continue
+                counts = live['counts'].setdefault(name, [0] * (len(spec['cuts']) + 1))
+                counts[int(np.searchsorted(spec['cuts'], value, side='right'))] += 1
+            _write_json(self.live_path, live)
+
+    def stats(self) -> Dict[str, Dict]:
+        """PSI, KS and live sample count per feature."""
+        if not self.reference:
+            return {}
+        live = (_read_json(self.live_path) or {}).get('counts', {})
+        out = {}
+        for name, spec in self.reference['features'].items():
+            ref = np.asarray(spec['counts'], dtype=float)
+            cur = np.asarray(live.get(name) or [0] * len(ref), dtype=float)
+            n = int(cur.sum())
+            out[name] = {
+                'psi': _psi(ref, cur) if n else 0.0,
+                'ks': _ks(ref, cur) if n else 0.0,
+                'n_live': n,
+                'drift': bool(n >= MIN_SAMPLES and (_psi(ref, cur) >= PSI_ALERT or _ks(ref, cur) >= KS_ALERT)),
+            }
+        return out
+
+    def new_alerts(self) -> List[str]:
+        """Features that crossed a threshold since the last call (each alerted once until it recovers)."""
+        st = self.stats()
+        with file_lock(self.live_path + '.lock'):
+            live = _read_json(self.live_path) or {'counts': {}, 'alerted': []}
+            alerted = set(live.get('alerted', []))
+            drifting = {k for k, v in st.items() if v['drift']}
+            fresh = sorted(drifting - alerted)
+            if drifting != alerted:
+                live['alerted'] = sorted(drifting)
+                _write_json(self.live_path, live)
+        for name in fresh:
+            logger.warning('Input drift on %s: PSI=%.3f KS=%.3f', name, st[name]['psi'], st[name]['ks'])
+        return fresh
+
+
+_monitor: Optional[DriftMonitor] = None
+
+
+def get_drift_monitor() -> DriftMonitor:
+    global _monitor
+    if _monitor is None:
+        _monitor = DriftMonitor()
+    return _monitor
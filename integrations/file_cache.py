@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+def _sizeof(value) -> int:
+    # DataFrames report their real footprint; everything else is a rough guess
+    try:
+        return int(value.memory_usage(deep=True).sum())
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class FileCache:
+    """Process-wide LRU cache of values derived from files.
+
+    Entries are keyed by (path, size, mtime, key), so any write to the file makes
+    its old entries unreachable; they are dropped on the next lookup for that
+    path. Total size is capped at `max_bytes`, evicting least recently used
+    entries first. Cached values are shared between callers (and Streamlit
+    sessions) and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, k):
+        _, size = self._entries.pop(k)
+        self._bytes -= size
+
+    def get_or_load(self, path: str, key: Hashable, loader: Callable[[], Any]):
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+            version = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            version = None
+        k = (path, version, key)
+        with self.lock:
+            if self._versions.get(path) != version:
+                # file changed (or appeared/disappeared): invalidate every entry for it
+                for old in [e for e in self._entries if e[0] == path]:
+                    self._drop(old)
+                self._versions[path] = version
+            if k in self._entries:
+                self._entries.move_to_end(k)
+                self.hits += 1
+                return self._entries[k][0]
+            self.misses += 1
+        value = loader()
+        size = _sizeof(value)
+        with self.lock:
+            if size > self.max_bytes or self._versions.get(path) != version:
+                return value
+            if k in self._entries:
+                self._drop(k)
+            self._entries[k] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+        return value
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits,
+                    'misses': self.misses, 'hit_rate': (self.hits / total) if total else 0.0}
+
+
+shared_cache = FileCache(max_bytes=int(os.getenv('LOG_CACHE_MAX_MB', '64')) * 1024 * 1024)
@@ -0,0 +1,83 @@
+"""Shared keep-alive HTTP session for the outbound notification senders.
+
+`requests.post` builds a throwaway Session per call, so every Telegram or
+Textbelt message pays a fresh TCP + TLS handshake. `get_http_session()` returns
+one process-wide Session whose urllib3 pools keep connections open between
+calls. Sending only uses the connection pools, which are thread-safe, so the
+session is shared by every thread.
+
+Pool sizing comes from the environment:
+    HTTP_POOL_HOSTS      hosts that keep a pool (default 10)
+    HTTP_POOL_MAXSIZE    kept-alive connections per host (default 16)
+    HTTP_HOST_LIMITS     hard caps on concurrent connections for specific hosts,
+                         e.g. "api.telegram.org=8,textbelt.com=4" (host:port for
+                         non-default ports); callers past the cap wait for a
+                         free connection
+    HTTP_TIMEOUT         default request timeout in seconds (default 10)
+Connection failures are retried twice; requests that reached the server are
+never resent.
+"""
+import os
+import threading
+from typing import Dict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HOST_LIMITS = 'api.telegram.org=8,textbelt.com=4'
+
+_session = None
+_lock = threading.Lock()
+
+
+def _retry() -> Retry:
+    # connect errors only: a POST that reached the server must not be sent twice
+    return Retry(total=2, connect=2, read=0, status=0, other=0, redirect=0, backoff_factor=0.1)
+
+
+def parse_host_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for part in (spec or '').split(','):
+        host, _, n = part.strip().partition('=')
+        if host and n.strip().isdigit():
+            limits[host.strip().lower()] = int(n)
+    return limits
+
+
+def build_session(pool_hosts: int = None, pool_maxsize: int = None, host_limits: Dict[str, int] = None) -> requests.Session:
+    pool_hosts = pool_hosts or int(os.getenv('HTTP_POOL_HOSTS', '10'))
+    pool_maxsize = pool_maxsize or int(os.getenv('HTTP_POOL_MAXSIZE', '16'))
+    if host_limits is None:
+        host_limits = parse_host_limits(os.getenv('HTTP_HOST_LIMITS', DEFAULT_HOST_LIMITS))
+    s = requests.Session()
+    default = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize, max_retries=_retry())
+    s.mount('http://', default)
+    s.mount('https://', default)
+    for host, limit in host_limits.items():
+        capped = HTTPAdapter(pool_connections=1, pool_maxsize=limit, pool_block=True, max_retries=_retry())
+        s.mount(f'https://{host}/', capped)
+        s.mount(f'http://{host}/', capped)
+    return s
+
+
+def get_http_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def post(url: str, data=None, **kwargs) -> requests.Response:
+    """`requests.post` over the shared session, with HTTP_TIMEOUT as the default timeout."""
+    kwargs.setdefault('timeout', float(os.getenv('HTTP_TIMEOUT', '10')))
+    return get_http_session().post(url, data=data, **kwargs)
+
+
+def close_http_session():
+    global _session
+    with _lock:
+        s, _session = _session, None
+    if s is not None:
+        s.close()
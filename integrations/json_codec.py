@@ -0,0 +1,75 @@
+"""JSON codec used for all log reads and writes.
+
+Uses orjson when it is installed and falls back to the stdlib `json` module.
+Both paths serialize NumPy arrays and scalars directly, so callers can log
+SHAP arrays and model inputs without converting them element by element.
+NaN and infinity are written as null on both paths (orjson's behaviour), and
+`loads` still accepts the bare NaN older stdlib-written lines contain.
+"""
+import json
+import math
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def _default(o):
+    # numpy arrays / scalars (and anything else array-like) expose tolist()
+    if hasattr(o, 'tolist'):
+        return o.tolist()
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+if orjson is not None:
+    _OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_OPTS)
+
+    def dumps_line(obj) -> bytes:
+        """Serialize `obj` as one newline-terminated JSONL record."""
+        return orjson.dumps(obj, default=_default, option=_OPTS | orjson.OPT_APPEND_NEWLINE)
+
+    def dumps(obj) -> str:
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # lines written by the stdlib fallback before NaN became null
+            return json.loads(data)
+else:
+    def _finite(o):
+        # the stdlib would write bare NaN/Infinity, which is not JSON and orjson rejects
+        if isinstance(o, float):
+            return o if math.isfinite(o) else None
+        if isinstance(o, dict):
+            return {k: _finite(v) for k, v in o.items()}
+        if isinstance(o, (list, tuple)):
+            return [_finite(v) for v in o]
+        if hasattr(o, 'tolist'):
+            return _finite(o.tolist())
+        return o
+
+    def dumps(obj) -> str:
+        try:
+            return json.dumps(obj, default=_default, allow_nan=False)
+        except ValueError:
+            # only pay for the rewrite when a non-finite float is present
+            return json.dumps(_finite(obj), default=_default, allow_nan=False)
+
+    def dumps_bytes(obj) -> bytes:
+        return dumps(obj).encode('utf-8')
+
+    def dumps_line(obj) -> bytes:
+        """Serialize `obj` as one newline-terminated JSONL record."""
+        return (dumps(obj) + '\n').encode('utf-8')
+
+    def loads(data):
+        return json.loads(data)
+
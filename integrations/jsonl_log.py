@@ -0,0 +1,74 @@
+import os
+from contextlib import contextmanager
+from typing import Dict, Tuple
+from integrations import json_codec
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+def _lock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive cross-process lock held on `path` (created if missing) for the with-block."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        _lock(fd)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def append_bytes(path: str, data: bytes) -> Tuple[int, int]:
+    """Append `data` to `path` as one uninterrupted write, safe across processes.
+
+    The file is opened with O_APPEND and held under an exclusive advisory lock
+    for the duration of the write, so concurrent writers (Streamlit sessions,
+    the webhook server, scripts) can never interleave or tear each other's
+    lines. Returns the (offset, end) byte range the data landed at.
+    """
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        _lock(fd)
+        try:
+            offset = os.lseek(fd, 0, os.SEEK_END)
+            view = memoryview(data)
+            written = 0
+            # os.write may return short on very large buffers; finish under the lock
+            while written < len(data):
+                written += os.write(fd, view[written:])
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+    return offset, offset + len(data)
+
+
+def append_jsonl(path: str, obj: Dict) -> Tuple[int, int]:
+    """Serialize `obj` as one JSON line and append it atomically. Returns (offset, end)."""
+    return append_bytes(path, json_codec.dumps_line(obj))
@@ -1,7 +1,15 @@
 import os
-import json
-from typing import Dict, Any, List
+import re
+import threading
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Iterator, Iterable
+import numpy as np
 import pandas as pd
+from integrations.log_index import get_index
+from integrations import json_codec
+from integrations.file_cache import shared_cache
 
 DECISION_LOG_JSONL = "fraudshield_logs.jsonl"
 DECISION_LOG_CSV = "fraudshield_logs.csv"
@@ -9,10 +17,23 @@ REPLIES_LOG_JSONL = "fraudshield_replies.jsonl"
 REPLIES_LOG_JSONL_LEGACY = "fraudshield_logs_replies.jsonl"
 REPLIES_LOG_CSV = "fraudshield_logs_replies.csv"
 
+# decisions decoded into the shared snapshot: the most rows any dashboard view shows
+SNAPSHOT_TAIL = 1000
+_snapshot_lock = threading.Lock()
+
 def load_decision_logs(limit: int | None = None) -> pd.DataFrame:
     """Load decision logs from JSONL (preferred) or CSV.
     Returns DataFrame with most recent rows (chronological).
+    Results are cached per file version and shared across sessions; treat as read-only.
     """
+    path = DECISION_LOG_JSONL if os.path.exists(DECISION_LOG_JSONL) else DECISION_LOG_CSV
+    if limit and limit <= SNAPSHOT_TAIL:
+        # recent rows come from the shared one-pass snapshot
+        return shared_cache.get_or_load(path, ("decisions", limit),
+                                        lambda: decision_log_snapshot()["recent"].tail(limit).reset_index(drop=True))
+    return shared_cache.get_or_load(path, ("decisions", limit), lambda: _read_decision_logs(limit))
+
+def _read_decision_logs(limit: int | None = None) -> pd.DataFrame:
     rows: List[Dict[str, Any]] = []
     if os.path.exists(DECISION_LOG_JSONL):
         try:
@@ -22,7 +43,7 @@ def load_decision_logs(limit: int | None = None) -> pd.DataFrame:
                     if not ln:
                         continue
                     try:
-                        rows.append(json.loads(ln))
+                        rows.append(json_codec.loads(ln))
                     except Exception:
                         continue
         except Exception:
@@ -40,6 +61,234 @@ def load_decision_logs(limit: int | None = None) -> pd.DataFrame:
         df = df.tail(limit)
     return df.reset_index(drop=True)
 
+# Raw scalar value of a top-level field, read straight from the encoded line.
+# Works for both stdlib (`"k": v`) and orjson (`"k":v`) output.
+_RAW_FIELD = {
+    name: re.compile(rb'"' + name.encode() + rb'"\s*:\s*("(?:[^"\\]|\\.)*"|[^,}\s]+)')
+    for name in ("timestamp", "transaction_id", "prediction", "probability")
+}
+
+def _raw_field(line: bytes, name: str) -> bytes | None:
+    m = _RAW_FIELD[name].search(line)
+    return m.group(1) if m else None
+
+def _ts_bound(v) -> str | None:
+    # log timestamps are 'YYYY-MM-DD HH:MM:SS' strings, which sort lexically
+    if v is None or v == "":
+        return None
+    if isinstance(v, datetime):
+        return v.strftime("%Y-%m-%d %H:%M:%S")
+    return str(v)
+
+def _line_matcher(start=None, end=None, prediction: int | None = None,
+                  min_probability: float | None = None, max_probability: float | None = None,
+                  transaction_id_prefix: str | None = None, columns: Iterable[str] | None = None):
+    """Build fn(raw_line) -> projected record, or None when the line does not match."""
+    start_b = _ts_bound(start)
+    end_b = _ts_bound(end)
+    start_b = start_b.encode() if start_b else None
+    end_b = end_b.encode() if end_b else None
+    pred_b = str(int(prediction)).encode() if prediction is not None else None
+    prefix_b = b'"' + transaction_id_prefix.encode() if transaction_id_prefix else None
+    cols = list(columns) if columns else None
+
+    def match(ln: bytes) -> Dict[str, Any] | None:
+        if not ln.strip():
+            return None
+        if start_b or end_b:
+            raw = _raw_field(ln, "timestamp")
+            ts = raw.strip(b'"') if raw else b""
+            if (start_b and ts < start_b) or (end_b and ts >= end_b):
+                return None
+        if pred_b is not None and _raw_field(ln, "prediction") != pred_b:
+            return None
+        if min_probability is not None or max_probability is not None:
+            try:
+                p = float(_raw_field(ln, "probability"))
+            except Exception:
+                return None
+            if (min_probability is not None and p < min_probability) or (max_probability is not None and p > max_probability):
+                return None
+        if prefix_b is not None:
+            raw = _raw_field(ln, "transaction_id")
+            if not raw or not raw.startswith(prefix_b):
+                return None
+        try:
+            rec = json_codec.loads(ln)
+        except Exception:
+            return None
+        if prefix_b is not None and not str(rec.get("transaction_id") or "").startswith(transaction_id_prefix):
+            return None
+        return {c: rec.get(c) for c in cols} if cols else rec
+
+    return match
+
+def iter_decision_logs(start=None, end=None, prediction: int | None = None,
+                       min_probability: float | None = None, max_probability: float | None = None,
+                       transaction_id_prefix: str | None = None, columns: Iterable[str] | None = None,
+                       path: str = DECISION_LOG_JSONL, stop: int | None = None) -> Iterator[Dict[str, Any]]:
+    """Stream decision records matching all given filters (start <= timestamp < end).
+
+    Filters are checked against the raw line first, so non-matching records are
+    skipped without a full JSON decode; survivors are decoded, re-checked and
+    projected onto `columns`. With `stop`, lines starting at or past that byte
+    offset are not read, so several passes can see the same records.
+    """
+    match = _line_matcher(start, end, prediction, min_probability, max_probability,
+                          transaction_id_prefix, columns)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        pos = 0
+        for ln in f:
+            if stop is not None:
+                if pos >= stop:
+                    break
+                pos += len(ln)
+            rec = match(ln)
+            if rec is not None:
+                yield rec
+
+def _iter_lines_backward(f, end: int, block: int = 65536) -> Iterator[tuple]:
+    """Yield (offset, line) for the lines before byte `end`, newest first."""
+    pos = end
+    carry = b""
+    while True:
+        if pos > 0:
+            read = min(block, pos)
+            pos -= read
+            f.seek(pos)
+            buf = f.read(read) + carry
+        else:
+            buf = carry
+        # buf spans [pos, pos + len(buf)) and ends on a line boundary
+        parts = buf.split(b"\n")
+        off = pos + len(buf)
+        for part in reversed(parts[1:]):
+            off -= len(part)
+            if part.strip():
+                yield off, part
+            off -= 1
+        carry = parts[0]
+        if pos == 0:
+            if carry.strip():
+                yield 0, carry
+            return
+
+def read_decision_page(cursor: int | None = None, page_size: int = 50, newest_first: bool = True,
+                       path: str | None = None, **filters) -> Dict[str, Any]:
+    """One page of decision records, read directly from the log around a byte cursor.
+
+    `cursor` is the byte offset returned as `next` by the previous page (None for
+    the first page). Newest-first pages read backwards from the cursor, oldest-first
+    pages read forwards, so cost depends on the page size, not the log size.
+    `filters` are the same keyword filters as iter_decision_logs.
+    Returns {"rows": [...], "cursor": cursor, "next": offset or None}.
+    """
+    path = path or DECISION_LOG_JSONL
+    match = _line_matcher(**filters)
+    rows: List[Dict[str, Any]] = []
+    nxt = None
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return {"rows": rows, "cursor": cursor, "next": None}
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if newest_first:
+            for off, ln in _iter_lines_backward(f, size if cursor is None else min(cursor, size)):
+                if len(rows) == page_size:
+                    nxt = off + len(ln) + 1
+                    break
+                rec = match(ln)
+                if rec is not None:
+                    rows.append(rec)
+        else:
+            pos = cursor or 0
+            f.seek(pos)
+            for ln in f:
+                if len(rows) == page_size:
+                    nxt = pos
+                    break
+                rec = match(ln)
+                if rec is not None:
+                    rows.append(rec)
+                pos += len(ln)
+    return {"rows": rows, "cursor": cursor, "next": nxt}
+
+def query_decision_logs(start=None, end=None, prediction: int | None = None,
+                        min_probability: float | None = None, max_probability: float | None = None,
+                        transaction_id_prefix: str | None = None, columns: Iterable[str] | None = None,
+                        limit: int | None = None) -> pd.DataFrame:
+    """Filtered, projected decision logs as a DataFrame (most recent `limit` matches, chronological)."""
+    args = (_ts_bound(start), _ts_bound(end), prediction, min_probability, max_probability,
+            transaction_id_prefix or None, tuple(columns) if columns else None)
+    if args == (None,) * 7:
+        # unfiltered: share the cache entry with load_decision_logs
+        return load_decision_logs(limit)
+    path = DECISION_LOG_JSONL if os.path.exists(DECISION_LOG_JSONL) else DECISION_LOG_CSV
+    if args[:6] == (None,) * 6 and limit and limit <= SNAPSHOT_TAIL:
+        # unfiltered projection of recent decisions: no scan of its own
+        return shared_cache.get_or_load(path, ("query", args, limit), lambda: decision_log_snapshot()["recent"]
+                                        .tail(limit).reindex(columns=list(columns)).reset_index(drop=True))
+    return shared_cache.get_or_load(path, ("query", args, limit), lambda: _query_decision_logs(*args, limit=limit))
+
+def _query_decision_logs(start, end, prediction, min_probability, max_probability,
+                         transaction_id_prefix, columns, limit) -> pd.DataFrame:
+    if not os.path.exists(DECISION_LOG_JSONL):
+        df = load_decision_logs()
+        if df.empty:
+            return df
+        # legacy CSV log: same filters, applied in pandas
+        if "timestamp" in df.columns and _ts_bound(start):
+            df = df[df["timestamp"].astype(str) >= _ts_bound(start)]
+        if "timestamp" in df.columns and _ts_bound(end):
+            df = df[df["timestamp"].astype(str) < _ts_bound(end)]
+        if prediction is not None and "prediction" in df.columns:
+            df = df[df["prediction"] == int(prediction)]
+        if min_probability is not None and "probability" in df.columns:
+            df = df[df["probability"] >= min_probability]
+        if max_probability is not None and "probability" in df.columns:
+            df = df[df["probability"] <= max_probability]
+        if transaction_id_prefix and "transaction_id" in df.columns:
+            df = df[df["transaction_id"].astype(str).str.startswith(transaction_id_prefix)]
+        if columns:
+            df = df[[c for c in columns if c in df.columns]]
+        return (df.tail(limit) if limit else df).reset_index(drop=True)
+    rows = iter_decision_logs(start, end, prediction, min_probability, max_probability,
+                              transaction_id_prefix, columns, path=DECISION_LOG_JSONL)
+    # bounded buffer: only the last `limit` matches are ever held
+    buf = deque(rows, maxlen=limit) if limit else list(rows)
+    if not buf:
+        return pd.DataFrame(columns=list(columns) if columns else None)
+    return pd.DataFrame(list(buf), columns=list(columns) if columns else None)
+
+def decision_index():
+    """Persistent transaction_id -> (segment, offset) index over the decision log."""
+    return get_index(DECISION_LOG_JSONL, 'transaction_id')
+
+def get_decision(transaction_id: str) -> Dict[str, Any] | None:
+    """Fetch one decision record by transaction id without scanning the log."""
+    if not transaction_id:
+        return None
+    return decision_index().read_record(transaction_id)
+
+def explain_decision(rec: Dict[str, Any], feature_names: List[str] | None = None) -> List[Dict[str, Any]]:
+    """Per-feature contributions of a logged decision, largest |SHAP| first."""
+    shap_vals = rec.get("shap_values") or []
+    inputs = rec.get("inputs") or []
+    out = []
+    for i, v in enumerate(shap_vals):
+        try:
+            v = float(v)
+        except Exception:
+            continue
+        name = feature_names[i] if feature_names and i < len(feature_names) else i
+        out.append({"feature": name, "value": inputs[i] if i < len(inputs) else None, "shap": v})
+    return sorted(out, key=lambda d: abs(d["shap"]), reverse=True)
+
 def compute_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     if df.empty:
         return {
@@ -64,14 +313,286 @@ def compute_metrics(df: pd.DataFrame) -> Dict[str, Any]:
         "last_is_fraud": last_is_fraud
     }
 
-def build_probability_timeseries(df: pd.DataFrame, limit: int = 200) -> pd.DataFrame:
-    if df.empty:
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the visual shape of y."""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 1)])
+    x = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        # average of the next bucket (or the last point) is the third triangle vertex
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx = x[nlo:max(nhi, nlo + 1)].mean()
+        cy = y[nlo:max(nhi, nlo + 1)].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Min and max of each of n_out/2 equal buckets, in original order."""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    buckets = max(n_out // 2, 1)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    idx = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi <= lo:
+            continue
+        seg = y[lo:hi]
+        idx.extend(sorted({lo + int(np.argmin(seg)), lo + int(np.argmax(seg))}))
+    return np.asarray(idx, dtype=int)
+
+def _downsample(y: np.ndarray, max_points: int | None, method: str = "lttb") -> pd.DataFrame:
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    if max_points and len(y) > max_points:
+        idx = minmax_indices(y, max_points) if method == "minmax" else lttb_indices(y, max_points)
+    else:
+        idx = np.arange(len(y))
+    return pd.DataFrame({"Index": idx, "Probability": y[idx]})
+
+def build_probability_timeseries(df: pd.DataFrame, limit: int = 200, max_points: int | None = None,
+                                 method: str = "lttb") -> pd.DataFrame:
+    """Probability series for the last `limit` decisions (all if None), downsampled to `max_points`.
+
+    "Index" keeps each point's position in the window, so a downsampled line
+    lines up with the raw one.
+    """
+    if df.empty or "probability" not in df.columns:
+        return pd.DataFrame()
+    y = pd.to_numeric((df.tail(limit) if limit else df)["probability"], errors="coerce").to_numpy(dtype=float)
+    return _downsample(y, max_points, method)
+
+class _SeriesState:
+    """Incremental downsampling of the whole probability history (the "All" window).
+
+    Buckets are a power-of-two number of decisions wide, so once the data
+    after a bucket is complete its pick never changes. Each call only picks
+    for buckets completed since the last one and recomputes the open buckets
+    at the end; everything is redone when the width has to double, which
+    keeps the work per appended decision constant on average.
+    """
+
+    def __init__(self, max_points: int, method: str = "lttb"):
+        self.max_points = max_points
+        self.method = method
+        self.width = 0
+        self.done: List[int] = []
+        self.final = 0   # buckets whose picks are in `done`
+        self.anchor = 0  # LTTB: the last pick in `done`
+
+    def _fit(self, span: int, slots: int) -> int:
+        w = max(self.width, 1)
+        while -(-span // w) > slots:
+            w *= 2
+        if w != self.width:
+            self.width, self.done, self.final, self.anchor = w, [], 0, 0
+        return w
+
+    def indices(self, y: np.ndarray) -> np.ndarray:
+        n = len(y)
+        if n <= self.max_points:
+            return np.arange(n)
+        if self.method == "minmax":
+            return self._minmax(y)
+        if self.max_points < 3:
+            return lttb_indices(np.nan_to_num(y), self.max_points)
+        return self._lttb(y)
+
+    def _lttb(self, y: np.ndarray) -> np.ndarray:
+        # first and last points are kept; interior buckets cover [1, n - 1)
+        last = len(y) - 1
+        w = self._fit(last - 1, self.max_points - 2)
+
+        def pick(k, a):
+            lo = 1 + k * w
+            hi = min(lo + w, last)
+            nhi = min(hi + w, last)
+            # average of the next bucket (or the last point) is the third triangle vertex
+            if hi < nhi:
+                cx, cy = (hi + nhi - 1) / 2, np.nan_to_num(y[hi:nhi]).mean()
+            else:
+                cx, cy = last, np.nan_to_num(y[last])
+            ya = np.nan_to_num(y[a])
+            xs = np.arange(lo, hi, dtype=float)
+            area = np.abs((a - cx) * (np.nan_to_num(y[lo:hi]) - ya) - (a - xs) * (cy - ya))
+            return lo + int(np.argmax(area))
+
+        complete = (last - 1) // w
+        for k in range(self.final, complete - 1):
+            self.anchor = pick(k, self.anchor)
+            self.done.append(self.anchor)
+        self.final = max(self.final, complete - 1)
+        tail, a = [], self.anchor
+        for k in range(self.final, -(-(last - 1) // w)):
+            a = pick(k, a)
+            tail.append(a)
+        return np.asarray([0] + self.done + tail + [last], dtype=int)
+
+    def _minmax(self, y: np.ndarray) -> np.ndarray:
+        n = len(y)
+        w = self._fit(n, max(self.max_points // 2, 1))
+
+        def pick(k):
+            seg = np.nan_to_num(y[k * w:min((k + 1) * w, n)])
+            return sorted({k * w + int(np.argmin(seg)), k * w + int(np.argmax(seg))})
+
+        complete = n // w
+        for k in range(self.final, complete):
+            self.done.extend(pick(k))
+        self.final = complete
+        tail = pick(complete) if complete * w < n else []
+        return np.asarray(self.done + tail, dtype=int)
+
+class _LogScan:
+    """How much of the decision log has been read, and what it held.
+
+    The log is append-only, so each call only reads the complete lines added
+    after `offset` and extends the probability buffer and the decoded tail.
+    """
+
+    def __init__(self, ident=None):
+        self.ident = ident
+        self.offset = 0
+        self.count = 0
+        self.probs = np.empty(0)
+        self.records: deque = deque(maxlen=SNAPSHOT_TAIL)
+        self.version = None
+        self.value: Dict[str, Any] = {"probability": self.probs, "recent": pd.DataFrame()}
+        self.series: Dict[tuple, _SeriesState] = {}
+
+    def extend(self, values: array):
+        if not values:
+            return
+        need = self.count + len(values)
+        if need > len(self.probs):
+            # grow geometrically; slots below `count` are never rewritten, so
+            # arrays handed out by earlier snapshots stay valid
+            grown = np.empty(max(need, len(self.probs) * 3 // 2, 1024))
+            grown[:self.count] = self.probs[:self.count]
+            self.probs = grown
+        self.probs[self.count:need] = np.frombuffer(values, dtype=np.float64)
+        self.count = need
+
+_scan: _LogScan | None = None
+
+def _read_appended(scan: _LogScan, f) -> None:
+    f.seek(scan.offset)
+    batch = array("d")
+    lines: deque = deque(maxlen=SNAPSHOT_TAIL)
+    nan = float("nan")
+    for ln in f:
+        if not ln.endswith(b"\n"):
+            break  # still being written; picked up on a later call
+        scan.offset += len(ln)
+        # skip blank or torn lines, as the decoding readers do
+        if not ln.rstrip().endswith(b"}"):
+            continue
+        try:
+            batch.append(float(_raw_field(ln, "probability")))
+        except (TypeError, ValueError):
+            batch.append(nan)
+        lines.append(ln)
+        if len(batch) >= 65536:
+            scan.extend(batch)
+            batch = array("d")
+    scan.extend(batch)
+    for ln in lines:
+        try:
+            scan.records.append(json_codec.loads(ln))
+        except Exception:
+            continue
+
+def _current_scan() -> _LogScan:
+    """Bring the shared scan up to date with the JSONL log; caller holds _snapshot_lock."""
+    global _scan
+    path = os.path.abspath(DECISION_LOG_JSONL)
+    try:
+        st = os.stat(path)
+    except OSError:
+        _scan = _LogScan()
+        return _scan
+    ident = (path, st.st_dev, st.st_ino)
+    version = (st.st_size, st.st_mtime_ns)
+    scan = _scan
+    if scan is not None and scan.ident == ident and scan.version == version:
+        return scan
+    if scan is None or scan.ident != ident or st.st_size < scan.offset:
+        # first read, or the log was replaced or truncated: start over
+        scan = _scan = _LogScan(ident)
+    try:
+        with open(path, "rb") as f:
+            _read_appended(scan, f)
+    except FileNotFoundError:
+        return scan
+    # lines appended while reading move the version on, so the next call catches up
+    scan.version = version
+    probs = scan.probs[:scan.count]
+    probs.flags.writeable = False
+    scan.value = {"probability": probs, "recent": pd.DataFrame(list(scan.records))}
+    return scan
+
+def _scan_csv_log() -> Dict[str, Any]:
+    df = _read_decision_logs()
+    probs = (pd.to_numeric(df["probability"], errors="coerce").to_numpy(dtype=float)
+             if "probability" in df.columns else np.empty(0))
+    return {"probability": probs, "recent": df.tail(SNAPSHOT_TAIL).reset_index(drop=True)}
+
+def decision_log_snapshot() -> Dict[str, Any]:
+    """One pass over the decision log shared by every dashboard view.
+
+    Returns {"probability": every logged probability (NaN where missing) as a
+    flat array, "recent": DataFrame of the last SNAPSHOT_TAIL records}.
+    Probabilities are pulled from the raw lines without decoding records, so
+    memory is about 8 bytes per decision. The scan is kept between calls and
+    only extended by the lines appended since, so a live log costs what was
+    written, not its size; a truncated or replaced log is read again from the
+    start. Concurrent callers wait for one catch-up instead of starting their
+    own. Treat the result as read-only.
+    """
+    if not os.path.exists(DECISION_LOG_JSONL):
+        return shared_cache.get_or_load(DECISION_LOG_CSV, ("snapshot",), _scan_csv_log)
+    with _snapshot_lock:
+        return _current_scan().value
+
+def _all_probability_series(max_points: int, method: str) -> pd.DataFrame:
+    with _snapshot_lock:
+        scan = _current_scan()
+        y = scan.probs[:scan.count]
+        state = scan.series.get((max_points, method))
+        if state is None:
+            state = scan.series[(max_points, method)] = _SeriesState(max_points, method)
+        idx = state.indices(y)
+    if not len(idx):
         return pd.DataFrame()
-    sub = df.tail(limit).reset_index(drop=True)
-    return pd.DataFrame({
-        "Index": list(range(len(sub))),
-        "Probability": sub.get("probability", [])
-    })
+    return pd.DataFrame({"Index": idx, "Probability": np.nan_to_num(y[idx])})
+
+def probability_timeseries(window: int | None = None, max_points: int = 500, method: str = "lttb") -> pd.DataFrame:
+    """Downsampled probability series over the last `window` decisions (all if None), cached per resolution.
+
+    A window costs O(window) per log version. The whole history is downsampled
+    incrementally (see _SeriesState) into at most `max_points` points, with
+    "Index" being the decision's position in the log.
+    """
+    path = DECISION_LOG_JSONL if os.path.exists(DECISION_LOG_JSONL) else DECISION_LOG_CSV
+
+    def build():
+        if window is None and path == DECISION_LOG_JSONL:
+            return _all_probability_series(max_points, method)
+        probs = decision_log_snapshot()["probability"]
+        if not len(probs):
+            return pd.DataFrame()
+        return _downsample(probs[-window:] if window else probs, max_points, method)
+
+    return shared_cache.get_or_load(path, ("prob_ts", window, max_points, method), build)
 
 def build_shap_aggregate(df: pd.DataFrame, limit: int = 400) -> pd.DataFrame:
     if df.empty or "shap_values" not in df.columns:
@@ -89,7 +610,17 @@ def build_shap_aggregate(df: pd.DataFrame, limit: int = 400) -> pd.DataFrame:
     return df_out.sort_values("MeanAbsSHAP", ascending=False)
 
 def load_reply_logs(limit: int | None = None) -> pd.DataFrame:
-    """Load customer reply logs (YES/NO) from JSONL preferred, fallback CSV."""
+    """Load customer reply logs (YES/NO) from JSONL preferred, fallback CSV.
+    Cached per file version like load_decision_logs.
+    """
+    path = REPLIES_LOG_CSV
+    for cand in (REPLIES_LOG_JSONL, REPLIES_LOG_JSONL_LEGACY):
+        if os.path.exists(cand):
+            path = cand
+            break
+    return shared_cache.get_or_load(path, ("replies", limit), lambda: _read_reply_logs(limit))
+
+def _read_reply_logs(limit: int | None = None) -> pd.DataFrame:
     rows: List[Dict[str, Any]] = []
     target = None
     if os.path.exists(REPLIES_LOG_JSONL):
@@ -104,7 +635,7 @@ def load_reply_logs(limit: int | None = None) -> pd.DataFrame:
                     if not ln:
                         continue
                     try:
-                        rows.append(json.loads(ln))
+                        rows.append(json_codec.loads(ln))
                     except Exception:
                         continue
         except Exception:
@@ -0,0 +1,214 @@
+"""Streaming export of decision logs.
+
+Records are read one line at a time and emitted in fixed-size chunks, so
+memory stays flat no matter how large the log is. Nested `shap_values` and
+`inputs` lists are flattened into one column per feature; CSV and Parquet
+take their columns from a pre-pass over the log, so rows of different widths
+all keep their values. Both passes stop at the log size seen when the export
+starts, so lines appended meanwhile are left for the next export.
+"""
+import io
+import os
+import csv
+from typing import Dict, Any, List, Iterator, Iterable, Optional
+from integrations.live_metrics import DECISION_LOG_JSONL, iter_decision_logs
+from integrations import json_codec
+
+FORMATS = ('csv', 'ndjson', 'parquet')
+BASE_FIELDS = ['timestamp', 'transaction_id', 'prediction', 'probability', 'shap_values', 'inputs']
+
+
+def iter_decisions(path: str = DECISION_LOG_JSONL, start=None, end=None, stop: int = None) -> Iterator[Dict[str, Any]]:
+    """Yield decision records with start <= timestamp < end (from lines before byte `stop`, if given).
+
+    The time filter is pushed into the reader.
+    """
+    return iter_decision_logs(start=start, end=end, path=path, stop=stop)
+
+
+def _feature_label(i: int, feature_names: Optional[List[str]]) -> str:
+    return feature_names[i] if feature_names and i < len(feature_names) else str(i)
+
+
+def flatten_decision(rec: Dict[str, Any], feature_names: Optional[List[str]] = None,
+                     fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """One flat row per decision: list fields become shap_<feature> / input_<feature> columns."""
+    out: Dict[str, Any] = {}
+    for f in (fields or BASE_FIELDS):
+        v = rec.get(f)
+        if f in ('shap_values', 'inputs'):
+            prefix = 'shap_' if f == 'shap_values' else 'input_'
+            for i, x in enumerate(v if isinstance(v, list) else []):
+                out[prefix + _feature_label(i, feature_names)] = x
+        else:
+            out[f] = v
+    return out
+
+
+def _list_widths(path: str, start, end, fields: Iterable[str], stop: int = None) -> Dict[str, int]:
+    """Longest shap_values / inputs list in the selected records (a streaming pre-pass)."""
+    widths = {f: 0 for f in ('shap_values', 'inputs') if f in fields}
+    if widths:
+        for rec in iter_decisions(path, start, end, stop):
+            for f in widths:
+                v = rec.get(f)
+                if isinstance(v, list) and len(v) > widths[f]:
+                    widths[f] = len(v)
+    return widths
+
+
+def export_columns(path: str = DECISION_LOG_JSONL, start=None, end=None, fields: Optional[Iterable[str]] = None,
+                   feature_names: Optional[List[str]] = None, stop: int = None) -> List[str]:
+    """Every column `flatten_decision` can produce for the selected records, in output order.
+
+    List fields get one column per feature name and per position seen in the
+    widest record, so no record's values are dropped from a fixed-header export.
+    """
+    fields = list(fields or BASE_FIELDS)
+    widths = _list_widths(path, start, end, fields, stop)
+    cols = []
+    for f in fields:
+        if f in widths:
+            prefix = 'shap_' if f == 'shap_values' else 'input_'
+            n = max(widths[f], len(feature_names or []))
+            cols.extend(prefix + _feature_label(i, feature_names) for i in range(n))
+        else:
+            cols.append(f)
+    return cols
+
+
+def _chunks(rows: Iterator[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for r in rows:
+        chunk.append(r)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _DrainSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be drained after each write."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        b = bytes(b)
+        self._parts.append(b)
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _export_csv(chunks, cols: List[str]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=cols)
+    writer.writeheader()
+    for chunk in chunks:
+        # a record wider than the pre-pass saw (appended meanwhile) raises instead of losing values
+        writer.writerows(chunk)
+        yield buf.getvalue().encode('utf-8')
+        buf.seek(0)
+        buf.truncate(0)
+    if buf.tell():
+        yield buf.getvalue().encode('utf-8')
+
+
+def _export_ndjson(chunks) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield b''.join(json_codec.dumps_line(r) for r in chunk)
+
+
+def _as_float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except Exception:
+        raise RuntimeError('pyarrow not installed')
+    return pa, pq
+
+
+def _export_parquet(chunks, cols: List[str]) -> Iterator[bytes]:
+    pa, pq = _pyarrow()
+    fields = []
+    numeric = set()
+    for c in cols:
+        if c == 'prediction':
+            fields.append(pa.field(c, pa.int64()))
+        elif c == 'probability' or c.startswith(('shap_', 'input_')):
+            fields.append(pa.field(c, pa.float64()))
+            numeric.add(c)
+        else:
+            fields.append(pa.field(c, pa.string()))
+    schema = pa.schema(fields)
+    known = set(cols)
+    sink = _DrainSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        for r in chunk:
+            extra = set(r) - known
+            if extra:
+                raise ValueError('Record has columns outside the export schema: ' + ', '.join(sorted(extra)))
+        columns = {c: [r.get(c) for r in chunk] for c in cols}
+        for c in cols:
+            if c in numeric:
+                columns[c] = [_as_float(v) for v in columns[c]]
+            elif c == 'prediction':
+                columns[c] = [None if v is None else int(v) for v in columns[c]]
+            else:
+                columns[c] = [None if v is None else str(v) for v in columns[c]]
+        # one row group per chunk
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def export_decisions(fmt: str = 'csv', path: str = DECISION_LOG_JSONL, start=None, end=None,
+                     fields: Optional[Iterable[str]] = None, feature_names: Optional[List[str]] = None,
+                     chunk_size: int = 1000) -> Iterator[bytes]:
+    """Generator of encoded export chunks, suitable for a streaming download response.
+
+    Anything that would stop the export (unknown format, pyarrow missing for
+    parquet) raises here, before the first chunk is produced.
+    """
+    fmt = fmt.lower()
+    if fmt not in FORMATS:
+        raise ValueError('Unknown export format: ' + str(fmt))
+    if fmt == 'parquet':
+        _pyarrow()
+    fields = list(fields) if fields else None
+    try:
+        stop = os.path.getsize(path)
+    except OSError:
+        stop = 0
+    rows = (flatten_decision(r, feature_names, fields) for r in iter_decisions(path, start, end, stop))
+    chunks = _chunks(rows, max(1, int(chunk_size)))
+    if fmt == 'ndjson':
+        return _export_ndjson(chunks)
+    # fixed-header formats: settle the full column set before the first byte,
+    # over exactly the bytes the main pass will read
+    cols = export_columns(path, start, end, fields, feature_names, stop)
+    if fmt == 'csv':
+        return _export_csv(chunks, cols)
+    return _export_parquet(chunks, cols)
@@ -0,0 +1,230 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Iterable
+from integrations import json_codec
+
+_SQLITE_HEADER = b'SQLite format 3\x00'
+
+
+class JsonlIndex:
+    """Persistent key -> (segment, byte offset) index over an append-only JSONL log.
+
+    The index is a small SQLite table next to the log (`<log>.<key>.idx`) holding
+    one row per key, so lookups are a B-tree probe and no process keeps the
+    entries in memory. Writers call `record()` right after appending a line;
+    readers call `get()` / `read_record()`. Lines appended by processes that do
+    not maintain the index are picked up lazily by scanning the log from the
+    last indexed byte. When a key appears several times the most recent
+    record (highest offset) wins, whatever order the writers index them in.
+    """
+
+    def __init__(self, log_path: str, key_field: str, value_fields: Iterable[str] = (),
+                 index_path: str = None, key_func: Callable[[Any], Any] = None):
+        self.log_path = log_path
+        self.segment = os.path.basename(log_path)
+        self.key_field = key_field
+        self.value_fields = tuple(value_fields)
+        self.index_path = index_path or f'{log_path}.{key_field}.idx'
+        self.key_func = key_func
+        self.lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            try:
+                with open(self.index_path, 'rb') as f:
+                    head = f.read(len(_SQLITE_HEADER))
+                if head and head != _SQLITE_HEADER:
+                    # JSONL sidecar from an older version; the index is derived data
+                    os.remove(self.index_path)
+            except FileNotFoundError:
+                pass
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, start_byte INTEGER NOT NULL, '
+                         'end_byte INTEGER NOT NULL, fields TEXT) WITHOUT ROWID')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            self._conn = conn
+        return self._conn
+
+    def _key(self, obj: Dict):
+        k = obj.get(self.key_field)
+        if self.key_func is not None and k not in (None, ''):
+            k = self.key_func(k)
+        return str(k) if k not in (None, '') else None
+
+    def _row(self, key, obj: Dict, offset: int, end: int) -> tuple:
+        fields = json_codec.dumps({f: obj.get(f) for f in self.value_fields}) if self.value_fields else None
+        return key, offset, end, fields
+
+    def _entry(self, key, obj: Dict, offset: int, end: int) -> Dict:
+        e = {'key': key, 'segment': self.segment, 'offset': offset, 'end': end}
+        for f in self.value_fields:
+            e[f] = obj.get(f)
+        return e
+
+    @staticmethod
+    def _upsert(conn, rows):
+        # an older line indexed after a newer one (another process catching up) must not win
+        conn.executemany(
+            'INSERT INTO entries (key, start_byte, end_byte, fields) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET start_byte = excluded.start_byte, end_byte = excluded.end_byte, '
+            'fields = excluded.fields WHERE excluded.start_byte > entries.start_byte', rows)
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn):
+        # IMMEDIATE takes the write lock up front, so processes catching up take turns
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _indexed_end(conn) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE name = 'indexed_end'").fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _set_indexed_end(conn, end: int):
+        conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('indexed_end', ?)", (end,))
+
+    def _scan(self, conn, start: int, stop: int = None, batch: int = 10000) -> int:
+        """Index the complete log lines in [start, stop); returns where the scan stopped."""
+        found = []
+        pos = start
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(start)
+                for ln in f:
+                    if not ln.endswith(b'\n') or (stop is not None and pos >= stop):
+                        break
+                    end = pos + len(ln)
+                    try:
+                        obj = json_codec.loads(ln)
+                        key = self._key(obj)
+                    except Exception:
+                        key = None
+                    if key is not None:
+                        found.append(self._row(key, obj, pos, end))
+                        if len(found) >= batch:
+                            self._upsert(conn, found)
+                            found = []
+                    pos = end
+        except FileNotFoundError:
+            pass
+        self._upsert(conn, found)
+        return pos
+
+    def _catch_up(self, conn, stop: int = None):
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            size = 0
+        indexed = self._indexed_end(conn)
+        if size == indexed or (stop is not None and indexed >= min(stop, size)):
+            return
+        with self._transaction(conn):
+            # another process may have caught up while we waited for the lock
+            indexed = self._indexed_end(conn)
+            if size < indexed:
+                # log was truncated or rewritten; the index no longer applies
+                conn.execute('DELETE FROM entries')
+                indexed = 0
+            if indexed < (size if stop is None else min(stop, size)):
+                indexed = self._scan(conn, indexed, stop)
+            self._set_indexed_end(conn, indexed)
+
+    def rebuild(self):
+        """Re-index the whole log from scratch."""
+        with self.lock:
+            conn = self._db()
+            with self._transaction(conn):
+                conn.execute('DELETE FROM entries')
+                self._set_indexed_end(conn, self._scan(conn, 0))
+            conn.execute('VACUUM')
+
+    def __len__(self):
+        with self.lock:
+            return self._db().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def record(self, obj: Dict, offset: int, end: int):
+        """Register a line the caller just appended at [offset, end) of the log."""
+        with self.lock:
+            conn = self._db()
+            # index anything other writers appended before our line first
+            self._catch_up(conn, stop=offset)
+            key = self._key(obj)
+            with self._transaction(conn):
+                if key is not None:
+                    self._upsert(conn, [self._row(key, obj, offset, end)])
+                if self._indexed_end(conn) == offset:
+                    self._set_indexed_end(conn, end)
+            return self._entry(key, obj, offset, end) if key is not None else None
+
+    def get(self, key) -> Optional[Dict]:
+        if key in (None, ''):
+            return None
+        if self.key_func is not None:
+            key = self.key_func(key)
+        with self.lock:
+            conn = self._db()
+            # a stat and an indexed read when nothing changed; otherwise reads only what others appended
+            self._catch_up(conn)
+            row = conn.execute('SELECT start_byte, end_byte, fields FROM entries WHERE key = ?',
+                               (str(key),)).fetchone()
+        if row is None:
+            return None
+        e = {'key': str(key), 'segment': self.segment, 'offset': row[0], 'end': row[1]}
+        if row[2]:
+            e.update(json_codec.loads(row[2]))
+        return e
+
+    def read_record(self, key) -> Optional[Dict]:
+        """Return the full log record for `key` with a single seek + readline."""
+        e = self.get(key)
+        if e is None:
+            return None
+        path = os.path.join(os.path.dirname(self.log_path), e['segment'])
+        try:
+            with open(path, 'rb') as f:
+                f.seek(e['offset'])
+                return json_codec.loads(f.read(e['end'] - e['offset']))
+        except Exception:
+            return None
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def normalize_contact(contact) -> str:
+    """Canonical contact key: lower-cased emails, digits-only phone numbers."""
+    c = str(contact).strip()
+    if '@' in c:
+        return c.lower()
+    digits = ''.join(ch for ch in c if ch.isdigit())
+    return digits or c
+
+
+_indexes: Dict[tuple, JsonlIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(log_path: str, key_field: str, **kwargs) -> JsonlIndex:
+    """Return the process-wide index for (log_path, key_field), creating it on first use."""
+    k = (os.path.abspath(log_path), key_field)
+    with _indexes_lock:
+        idx = _indexes.get(k)
+        if idx is None:
+            idx = JsonlIndex(log_path, key_field, **kwargs)
+            _indexes[k] = idx
+        return idx
@@ -1,8 +1,8 @@
 import os
-import json
 import time
 from typing import Dict
 import logging
+from integrations.jsonl_log import append_jsonl
 
 LOG_DIR = os.path.join(os.getcwd(), 'logs')
 os.makedirs(LOG_DIR, exist_ok=True)
@@ -31,8 +31,7 @@ class MockProvider(BaseProvider):
             'telegram_id': person.get('telegram_id'),
             'body': body
         }
-        with open(SIMULATED_FILE, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(obj) + '\n')
+        append_jsonl(SIMULATED_FILE, obj)
         logger.info('Mock send: %s', obj)
         return {'status': 'mocked', 'provider': self.name, 'detail': obj}
 
@@ -60,8 +59,8 @@ class EmailGatewayProvider(BaseProvider):
     def send_notification(self, person: Dict, body: str) -> Dict:
         # attempt email-to-sms if phone looks numeric and carrier provided via person.carrier
         try:
-            import smtplib
             from email.message import EmailMessage
+            from integrations.smtp_pool import get_smtp_pool
         except Exception as e:
             return {'status': 'failed', 'provider': self.name, 'detail': 'smtplib_missing'}
         to_addr = None
@@ -81,14 +80,7 @@ class EmailGatewayProvider(BaseProvider):
         msg['To'] = to_addr
         msg.set_content(body)
         try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=15) as s:
-                try:
-                    s.starttls()
-                except Exception:
-                    pass
-                if self.smtp_user and self.smtp_pass:
-                    s.login(self.smtp_user, self.smtp_pass)
-                s.send_message(msg)
+            get_smtp_pool(self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_pass).send_message(msg)
             return {'status': 'sent', 'provider': self.name, 'detail': to_addr}
         except Exception as e:
             logger.exception('Email send failed')
@@ -109,11 +101,11 @@ class TelegramProvider(BaseProvider):
         if not chat_id:
             return {'status': 'failed', 'provider': self.name, 'detail': 'no_telegram_id'}
         try:
-            import requests
+            from integrations import http_client
         except Exception:
             return {'status': 'failed', 'provider': self.name, 'detail': 'requests_missing'}
         try:
-            resp = requests.post(f"{self.base}/sendMessage", json={'chat_id': chat_id, 'text': body}, timeout=10)
+            resp = http_client.post(f"{self.base}/sendMessage", json={'chat_id': chat_id, 'text': body}, timeout=10)
             if resp.status_code == 200:
                 return {'status': 'sent', 'provider': self.name, 'detail': resp.json()}
             return {'status': 'failed', 'provider': self.name, 'detail': resp.text}
@@ -0,0 +1,156 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+_MISSING = object()
+
+
+class CachedAdapter:
+    """Read-through LRU + TTL cache in front of any people adapter.
+
+    Person lookups by id are cached per person and dropped when that person is
+    written through this wrapper. Lookups by phone/Telegram id and list pages
+    are cached under a generation number that every write bumps, so they can
+    never outlive a local change. Writes made by other processes become visible
+    once entries expire (`ttl` seconds). Returned dicts are copies; callers may
+    mutate them freely.
+
+    Anything not wrapped here (iter_people, close, ...) goes straight to the
+    underlying adapter.
+    """
+
+    def __init__(self, adapter, max_entries: int = 10000, ttl: float = 30.0):
+        self.adapter = adapter
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        return getattr(self.adapter, name)
+
+    @staticmethod
+    def _copy(value):
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, list):
+            return [dict(p) for p in value]
+        return value
+
+    def _get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            e = self._entries.get(key)
+            if e is not None and e[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(e[1])
+            if e is not None:
+                del self._entries[key]
+            self.misses += 1
+        return _MISSING
+
+    def _put(self, key, value, generation: int):
+        with self.lock:
+            # a write landed while we were loading: the value may already be stale
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, self._copy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _cached(self, key, load):
+        value = self._get(key)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        value = load()
+        self._put(key, value, generation)
+        return self._copy(value)
+
+    def _key(self, *parts):
+        return ('gen', self._generation) + parts
+
+    def _invalidate(self, person_ids: Iterable[str] = None):
+        with self.lock:
+            self._generation += 1
+            if person_ids is None:
+                self._entries.clear()
+                return
+            for pid in person_ids:
+                self._entries.pop(('id', pid), None)
+            # entries from older generations are unreachable now; drop them eagerly
+            for k in [k for k in self._entries if k[0] == 'gen']:
+                del self._entries[k]
+
+    def get_person(self, person_id: str) -> Optional[Dict]:
+        return self._cached(('id', person_id), lambda: self.adapter.get_person(person_id))
+
+    def get_people(self, ids: Iterable[str]) -> Dict[str, Dict]:
+        out, missing = {}, []
+        for pid in ids:
+            p = self._get(('id', pid))
+            if p is _MISSING:
+                missing.append(pid)
+            elif p is not None:
+                out[pid] = p
+        if missing:
+            generation = self._generation
+            found = self.adapter.get_people(missing)
+            for pid in missing:
+                self._put(('id', pid), found.get(pid), generation)
+            out.update(found)
+        return out
+
+    def get_person_by_phone(self, phone: str) -> Optional[Dict]:
+        return self._cached(self._key('phone', str(phone)), lambda: self.adapter.get_person_by_phone(phone))
+
+    def get_person_by_telegram_id(self, telegram_id) -> Optional[Dict]:
+        return self._cached(self._key('telegram', str(telegram_id)),
+                            lambda: self.adapter.get_person_by_telegram_id(telegram_id))
+
+    def list_people(self, consent: Optional[bool] = None, after_id: str = None, limit: int = None,
+                    search: str = None) -> List[Dict]:
+        return self._cached(self._key('list', consent, after_id, limit, search),
+                            lambda: self.adapter.list_people(consent=consent, after_id=after_id, limit=limit, search=search))
+
+    def search_people(self, query: str, limit: int = 20) -> List[Dict]:
+        return self._cached(self._key('search', query, limit), lambda: self.adapter.search_people(query, limit))
+
+    def update_person(self, person_id: str, updates: Dict) -> Dict:
+        try:
+            return self.adapter.update_person(person_id, updates)
+        finally:
+            self._invalidate([person_id])
+
+    def update_many(self, updates: Iterable, batch_size: int = 10000) -> int:
+        try:
+            return self.adapter.update_many(updates, batch_size)
+        finally:
+            self._invalidate()
+
+    def upsert_many(self, people: Iterable[Dict], batch_size: int = 10000) -> int:
+        try:
+            return self.adapter.upsert_many(people, batch_size=batch_size)
+        finally:
+            self._invalidate()
+
+    def migrate_from_csv(self, src_path: str, *args, **kwargs) -> int:
+        try:
+            return self.adapter.migrate_from_csv(src_path, *args, **kwargs)
+        finally:
+            self._invalidate()
+
+    def clear(self):
+        self._invalidate()
+
+    def stats(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': (self.hits / total) if total else 0.0}
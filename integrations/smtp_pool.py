@@ -0,0 +1,211 @@
+"""Pooled, authenticated SMTP sessions shared by the email senders.
+
+Opening an SMTP connection costs a TCP handshake, EHLO, STARTTLS and AUTH
+before the first message goes out. `SMTPPool` keeps logged-in connections
+around and hands them out again, so a burst of alerts pays that once per
+connection instead of once per message. Connections idle for longer than
+`idle_timeout` seconds, or that have sent `max_messages`, are closed; a
+reused connection the server has dropped in the meantime is replaced and the
+message retried once on a fresh one. Idle connections are reaped by a
+background timer that runs only while the pool holds some.
+
+`get_smtp_pool()` returns one process-wide pool per (host, port, user).
+"""
+import os
+import time
+import atexit
+import smtplib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger('integrations.smtp_pool')
+
+# errors meaning the connection itself is gone, not that the message was refused
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class _Conn:
+    __slots__ = ('smtp', 'last_used', 'sent')
+
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.sent = 0
+
+
+class SMTPPool:
+    def __init__(self, host: str, port: int = 587, user: str = None, password: str = None, timeout: float = 15,
+                 max_idle: int = None, idle_timeout: float = None, max_messages: int = None):
+        self.host = host
+        self.port = int(port)
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self.max_idle = max_idle or int(os.getenv('SMTP_POOL_SIZE', '4'))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else float(os.getenv('SMTP_POOL_IDLE', '60'))
+        self.max_messages = max_messages or int(os.getenv('SMTP_POOL_MAX_MESSAGES', '100'))
+        self.lock = threading.Lock()
+        self._idle: List[_Conn] = []
+        self._reaper = None
+        self.opened = 0
+
+    def _open(self) -> _Conn:
+        # looked up at call time so tests/demos can patch smtplib.SMTP
+        s = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            s.starttls()
+        except Exception:
+            pass
+        if self.user and self.password:
+            s.login(self.user, self.password)
+        with self.lock:
+            self.opened += 1
+        return _Conn(s)
+
+    @staticmethod
+    def _discard(conn: _Conn):
+        try:
+            conn.smtp.quit()
+        except Exception:
+            try:
+                conn.smtp.close()
+            except Exception:
+                pass
+
+    def _checkout(self) -> Tuple[_Conn, bool]:
+        now = time.monotonic()
+        stale = []
+        conn = None
+        with self.lock:
+            while self._idle:
+                c = self._idle.pop()
+                if now - c.last_used > self.idle_timeout:
+                    stale.append(c)
+                else:
+                    conn = c
+                    break
+        for c in stale:
+            self._discard(c)
+        if conn is not None:
+            return conn, True
+        return self._open(), False
+
+    def _checkin(self, conn: _Conn):
+        conn.last_used = time.monotonic()
+        if conn.sent < self.max_messages:
+            with self.lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(conn)
+                    self._schedule_reap()
+                    return
+        self._discard(conn)
+
+    def _schedule_reap(self):
+        # caller holds self.lock
+        if self._reaper is None:
+            self._reaper = threading.Timer(max(self.idle_timeout / 2, 0.05), self._reap)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _reap(self):
+        self.close_idle()
+        with self.lock:
+            self._reaper = None
+            if self._idle:
+                self._schedule_reap()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a logged-in connection; it goes back to the pool unless the block raises."""
+        conn, _ = self._checkout()
+        try:
+            yield conn.smtp
+        except BaseException:
+            self._discard(conn)
+            raise
+        self._checkin(conn)
+
+    def send_many(self, messages: Iterable) -> int:
+        """Send `messages` over as few connections as possible; returns how many were sent.
+
+        A dropped connection is replaced and the message that hit it retried
+        once. Any other error (refused recipient, auth failure) propagates.
+        """
+        conn, reused = self._checkout()
+        sent = 0
+        try:
+            for msg in messages:
+                if conn.sent >= self.max_messages:
+                    self._discard(conn)
+                    conn, reused = self._open(), False
+                try:
+                    conn.smtp.send_message(msg)
+                except _CONNECTION_ERRORS:
+                    if not reused:
+                        raise
+                    logger.info('SMTP connection to %s:%s went away; reconnecting', self.host, self.port)
+                    self._discard(conn)
+                    conn, reused = self._open(), False
+                    conn.smtp.send_message(msg)
+                conn.sent += 1
+                # a connection that has carried a message is known to be alive
+                reused = False
+                sent += 1
+        except BaseException:
+            self._discard(conn)
+            raise
+        self._checkin(conn)
+        return sent
+
+    def send_message(self, msg):
+        self.send_many([msg])
+
+    def close_idle(self) -> int:
+        """Close pooled connections idle past `idle_timeout`; returns how many were closed."""
+        now = time.monotonic()
+        with self.lock:
+            stale = [c for c in self._idle if now - c.last_used > self.idle_timeout]
+            self._idle = [c for c in self._idle if c not in stale]
+        for c in stale:
+            self._discard(c)
+        return len(stale)
+
+    def close(self):
+        with self.lock:
+            idle, self._idle = self._idle, []
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+        for c in idle:
+            self._discard(c)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {'idle': len(self._idle), 'opened': self.opened}
+
+
+_pools: Dict[tuple, SMTPPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(host: str, port: int = 587, user: str = None, password: str = None, timeout: float = 15) -> SMTPPool:
+    key = (host, int(port), user)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SMTPPool(host, port, user, password, timeout=timeout)
+    if pool.password != password:
+        # rotated credentials: log in again on fresh connections
+        pool.password = password
+        pool.close()
+    return pool
+
+
+@atexit.register
+def close_all():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -3,25 +3,36 @@ import argparse
 import os
 import json
 import uuid
+import sys
 import time
 from integrations.db_adapters import get_db_adapter
+from integrations.people_migration import migrate_people, verify_people, count_people, load_checkpoint
 
 
-def seed(adapter, count=5):
-    created = 0
-    people = []
-    for i in range(count):
-        pid = str(uuid.uuid4())
-        p = {
-            'id': pid,
+def make_people(count, start=0, id_prefix=None):
+    """Yield `count` synthetic people; ids are random unless `id_prefix` asks for sequential ones."""
+    ts = time.strftime('%Y-%m-%d %H:%M:%S')
+    for i in range(start, start + count):
+        yield {
+            'id': f'{id_prefix}{i:08d}' if id_prefix is not None else str(uuid.uuid4()),
             'name': f'User {i+1}',
             'phone': f'555000{100+i}',
             'telegram_id': '',
             'consent': 1,
-            'consent_ts': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'consent_ts': ts,
             'last_notified': None
         }
-        adapter.update_person(pid, p)
+
+
+def seed(adapter, count=5, bulk=False, batch_size=10000):
+    """Create `count` people. Bulk mode streams them through upsert_many and
+    returns no people list, so millions of rows never sit in memory at once."""
+    if bulk:
+        return adapter.upsert_many(make_people(count), batch_size=batch_size), []
+    created = 0
+    people = []
+    for p in make_people(count):
+        adapter.update_person(p['id'], p)
         people.append(p)
         created += 1
     return created, people
@@ -33,27 +44,53 @@ def main():
     p.add_argument('--from', dest='src', default='csv')
     p.add_argument('--to', dest='dst', default=os.getenv('DATA_BACKEND', 'sqlite'))
     p.add_argument('--dry-run', action='store_true')
+    p.add_argument('--count', type=int, default=5, help='seed: number of people to create')
+    p.add_argument('--bulk', action='store_true', help='seed: write in batches with upsert_many')
+    p.add_argument('--backend', help='seed: backend to write to (default: DATA_BACKEND)')
+    p.add_argument('--batch-size', type=int, help='rows per batch (default: 10000 for seed, 1000 for migrate-data)')
+    p.add_argument('--checkpoint', help='checkpoint file (default: data/.migrate-<from>-<to>.json)')
+    p.add_argument('--restart', action='store_true', help='ignore an existing checkpoint and copy from the start')
+    p.add_argument('--no-verify', action='store_true', help='skip the checksum comparison after copying')
     args = p.parse_args()
     if args.command == 'seed':
-        adapter = get_db_adapter()
-        created, people = seed(adapter)
-        print(f'Created {created} people')
+        adapter = get_db_adapter(args.backend)
+        t0 = time.perf_counter()
+        created, people = seed(adapter, count=args.count, bulk=args.bulk, batch_size=args.batch_size or 10000)
+        elapsed = time.perf_counter() - t0
+        print(f'Created {created} people in {elapsed:.1f}s ({created / elapsed if elapsed else 0:,.0f} rows/s)')
     elif args.command == 'migrate-data':
         src = args.src
         dst = args.dst
         print(f'Migrate from {src} to {dst} (dry_run={args.dry_run})')
         src_adapter = get_db_adapter(src)
         dst_adapter = get_db_adapter(dst)
-        # attempt migrate
+        batch_size = args.batch_size or 1000
         if args.dry_run:
             print('Dry run: counting rows to migrate...')
-            # naive count
-            if hasattr(src_adapter, 'list_people'):
-                rows = src_adapter.list_people()
-                print('Would migrate', len(rows), 'rows')
-        else:
-            count = dst_adapter.migrate_from_csv(getattr(src_adapter, 'path', ''))
-            print('Migrated', count, 'rows')
+            print('Would migrate', count_people(src_adapter), 'rows')
+            return
+        checkpoint = args.checkpoint or os.path.join(os.getcwd(), 'data', f'.migrate-{src}-{dst}.json')
+        if args.restart and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        state = load_checkpoint(checkpoint)
+        if state:
+            print(f"Resuming after id {state['last_id']} ({state['copied']} rows already copied)")
+
+        def progress(copied, rate):
+            sys.stderr.write(f'\r  {copied:,} rows copied  ({rate:,.0f} rows/s)')
+            sys.stderr.flush()
+
+        res = migrate_people(src_adapter, dst_adapter, batch_size=batch_size,
+                             checkpoint_path=checkpoint, progress=progress)
+        sys.stderr.write('\n')
+        print(f"Migrated {res['copied']} rows in {res['seconds']:.1f}s")
+        if not args.no_verify:
+            v = verify_people(src_adapter, dst_adapter, batch_size=batch_size)
+            print(f"Verify: {v['rows']} rows, source {v['src_checksum']}, destination {v['dst_checksum']}")
+            if not v['ok']:
+                print('Checksum mismatch; first differing ids:', ', '.join(v['mismatched']))
+                sys.exit(1)
+            print('Checksums match')
 
 
 if __name__ == '__main__':
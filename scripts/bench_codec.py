@@ -0,0 +1,62 @@
+"""Compare the log JSON codec against plain stdlib json on decision-log records.
+
+Usage:
+    python scripts/bench_codec.py --n 20000
+
+Measures serialize (including the old per-element float() normalization that
+log_event used to do) and parse throughput, and prints records/second.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from integrations import json_codec
+
+
+def make_records(n, n_features, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        yield {
+            'timestamp': '2025-11-20 12:00:00',
+            'transaction_id': f'tx-{i}',
+            'prediction': int(i % 2),
+            'probability': float(rng.random()),
+            'shap_values': rng.normal(size=n_features),
+            'inputs': list(rng.normal(size=n_features)),
+        }
+
+
+def stdlib_line(obj):
+    # what log_event did before the codec: convert every element, then json.dumps
+    o = dict(obj)
+    o['shap_values'] = [float(x) for x in list(o['shap_values'])]
+    o['inputs'] = [float(x) for x in o['inputs']]
+    return (json.dumps(o) + '\n').encode('utf-8')
+
+
+def timeit(fn, items):
+    t0 = time.perf_counter()
+    out = [fn(x) for x in items]
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--n', type=int, default=20000)
+    ap.add_argument('--features', type=int, default=30)
+    args = ap.parse_args()
+    records = list(make_records(args.n, args.features))
+    t_std_ser, lines = timeit(stdlib_line, records)
+    t_codec_ser, _ = timeit(json_codec.dumps_line, records)
+    t_std_parse, _ = timeit(json.loads, lines)
+    t_codec_parse, _ = timeit(json_codec.loads, lines)
+    print(f'codec backend: {json_codec.BACKEND}; {args.n} records x {args.features} features')
+    for name, std, fast in (('serialize', t_std_ser, t_codec_ser), ('parse', t_std_parse, t_codec_parse)):
+        print(f'{name:10s} stdlib {args.n / std:12,.0f} rec/s   codec {args.n / fast:12,.0f} rec/s   speedup x{std / fast:.1f}')
+
+
+if __name__ == '__main__':
+    main()
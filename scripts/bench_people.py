@@ -0,0 +1,237 @@
+"""Benchmark the people adapters at scale and write machine-readable results.
+
+Usage:
+    python scripts/bench_people.py --sizes 10000 100000 1000000 --backends csv sqlite mongomock
+    python scripts/bench_people.py --sizes 10000 --compare bench_results/old.json
+
+Backends: csv, sqlite, mongodb (a real server at MONGODB_URI, database
+fraudshield_bench, dropped afterwards) and mongomock. mongomock scans its
+collection on every upsert and lookup, so it only runs up to --mongomock-max
+people; larger sizes are reported as skipped, in the output and under
+"skipped" in the results file. Use it to check the code path, and a local
+mongod for real numbers.
+
+Every backend and size runs in its own interpreter. A fresh store is seeded
+in bulk (manage.py's make_people), then point reads, phone lookups, single
+updates, keyset pages, a full streaming scan and a migration into a fresh
+SQLite store are timed. Memory is the process's resident set at start-up and
+at its peak (not reported on Windows without psutil); cold open also records
+the Python heap peak from tracemalloc. Results go to a JSON file (default
+bench_results/people-<timestamp>.json); --compare prints the change per
+metric against an earlier results file.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from integrations import json_codec
+from integrations.db_adapters import CSVAdapter, SQLiteAdapter, MongoAdapter
+from integrations.people_migration import migrate_people
+from manage import make_people
+
+# metrics where a larger number is better; everything else is a latency/size
+HIGHER_IS_BETTER = ('rows_per_s', 'ops_per_s')
+
+
+def open_adapter(backend, d, shared=None):
+    if backend == 'csv':
+        return CSVAdapter(path=os.path.join(d, 'people.csv'))
+    if backend == 'sqlite':
+        return SQLiteAdapter(path=os.path.join(d, 'people.db'))
+    if backend == 'mongomock':
+        import mongomock
+        # reuse the in-memory server so a "cold" reopen sees the seeded data
+        return MongoAdapter(client=shared or mongomock.MongoClient(), dbname='bench')
+    if backend == 'mongodb':
+        if shared is not None:
+            return MongoAdapter(client=shared, dbname='fraudshield_bench')
+        adapter = MongoAdapter(dbname='fraudshield_bench')
+        adapter.db.people.drop()
+        adapter._ensure_indexes()
+        return adapter
+    raise ValueError(backend)
+
+
+def latency(fn, args_list):
+    times = []
+    for a in args_list:
+        t0 = time.perf_counter()
+        fn(a)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return {
+        'mean_us': statistics.fmean(times) * 1e6,
+        'p50_us': times[len(times) // 2] * 1e6,
+        'p99_us': times[min(len(times) - 1, int(len(times) * 0.99))] * 1e6,
+        'ops_per_s': len(times) / sum(times) if sum(times) else 0.0,
+    }
+
+
+def bench_one(backend, size, ops, seed=0):
+    rnd = random.Random(seed)
+    out = {'backend': backend, 'size': size}
+    with tempfile.TemporaryDirectory() as d:
+        adapter = open_adapter(backend, d)
+        shared = getattr(adapter, 'client', None)
+        t0 = time.perf_counter()
+        adapter.upsert_many(make_people(size, id_prefix='p'), batch_size=10000)
+        out['seed'] = {'rows_per_s': size / (time.perf_counter() - t0)}
+
+        # cold open: a new adapter instance loads/indexes from scratch
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        cold = open_adapter(backend, d, shared)
+        cold.get_person('p00000000')
+        out['cold_open'] = {'seconds': time.perf_counter() - t0,
+                            'peak_mb': tracemalloc.get_traced_memory()[1] / 2**20}
+        tracemalloc.stop()
+
+        ids = [f'p{rnd.randrange(size):08d}' for _ in range(ops)]
+        out['get_person'] = latency(adapter.get_person, ids)
+        out['get_person_by_phone'] = latency(adapter.get_person_by_phone,
+                                             [f'555000{100 + int(i[1:])}' for i in ids])
+        out['update_person'] = latency(lambda pid: adapter.update_person(pid, {'last_notified': int(time.time())}),
+                                       ids[: max(1, ops // 4)])
+        out['list_page_50'] = latency(lambda pid: adapter.list_people(after_id=pid, limit=50), ids[: max(1, ops // 10)])
+
+        t0 = time.perf_counter()
+        n = sum(1 for _ in adapter.iter_people(batch_size=5000))
+        out['iter_people'] = {'rows_per_s': n / (time.perf_counter() - t0)}
+
+        dst = SQLiteAdapter(path=os.path.join(d, 'migrated.db'))
+        res = migrate_people(adapter, dst, batch_size=5000)
+        out['migrate_to_sqlite'] = {'rows_per_s': res['copied'] / res['seconds'] if res['seconds'] else 0.0}
+        if backend == 'mongodb':
+            adapter.db.people.drop()
+    return out
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where it can't be read."""
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return rss / 2**20 if sys.platform == 'darwin' else rss / 2**10
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, 'peak_wset', info.rss) / 2**20
+
+
+def run_isolated(backend, size, ops):
+    """bench_one in a fresh interpreter, so its peak RSS belongs to this backend and size alone."""
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--one', backend, str(size), '--ops', str(ops)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f'{backend} x {size} failed:\n{proc.stderr}')
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def meta():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip()
+    except Exception:
+        commit = None
+    return {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': commit, 'python': platform.python_version(),
+            'platform': platform.platform(), 'json_backend': json_codec.BACKEND}
+
+
+def flatten(results):
+    for r in results:
+        for op, metrics in r.items():
+            if isinstance(metrics, dict):
+                for m, v in metrics.items():
+                    yield (r['backend'], r['size'], op, m), v
+
+
+def compare(old_path, results):
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = dict(flatten(json.load(f)['results']))
+    print(f'\nChange vs {old_path} (+ is better):')
+    for key, v in flatten(results):
+        if key not in old or not old[key] or v is None:
+            continue
+        change = (v - old[key]) / old[key] * 100
+        if not key[3].endswith(HIGHER_IS_BETTER):
+            change = -change
+        flag = '  <-- regression' if change < -10 else ''
+        print(f'  {key[0]:9s} {key[1]:>9,} {key[2]:20s} {key[3]:10s} {change:+7.1f}%{flag}')
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    ap.add_argument('--backends', nargs='+', default=['csv', 'sqlite', 'mongomock'])
+    ap.add_argument('--ops', type=int, default=2000, help='point operations sampled per metric')
+    ap.add_argument('--mongomock-max', type=int, default=2000, help='largest size run against mongomock')
+    ap.add_argument('--out', help='results file (default bench_results/people-<timestamp>.json)')
+    ap.add_argument('--compare', help='earlier results file to diff against')
+    ap.add_argument('--one', nargs=2, metavar=('BACKEND', 'SIZE'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.one:
+        # child process: one backend and size, result as JSON on the last line of stdout
+        start = peak_rss_mb()
+        r = bench_one(args.one[0], int(args.one[1]), args.ops)
+        r['memory'] = {'start_rss_mb': start, 'peak_rss_mb': peak_rss_mb()}
+        print(json.dumps(r))
+        return
+
+    results = []
+    skipped = []
+    for backend in args.backends:
+        if backend == 'mongomock':
+            try:
+                import mongomock  # noqa: F401
+            except ImportError:
+                print('mongomock not installed; skipping the Mongo stand-in')
+                skipped.extend({'backend': backend, 'size': size, 'reason': 'mongomock not installed'} for size in args.sizes)
+                continue
+        for size in args.sizes:
+            if backend == 'mongomock' and size > args.mongomock_max:
+                print(f'mongomock x {size:,}: SKIPPED (above --mongomock-max={args.mongomock_max:,})')
+                skipped.append({'backend': backend, 'size': size, 'reason': 'above --mongomock-max'})
+                continue
+            print(f'{backend} x {size:,} ...', flush=True)
+            r = run_isolated(backend, size, args.ops)
+            results.append(r)
+            print(f"  seed {r['seed']['rows_per_s']:,.0f} rows/s | get p50 {r['get_person']['p50_us']:.0f}us"
+                  f" | phone p50 {r['get_person_by_phone']['p50_us']:.0f}us"
+                  f" | update p50 {r['update_person']['p50_us']:.0f}us"
+                  f" | page p50 {r['list_page_50']['p50_us']:.0f}us"
+                  f" | scan {r['iter_people']['rows_per_s']:,.0f} rows/s"
+                  f" | migrate {r['migrate_to_sqlite']['rows_per_s']:,.0f} rows/s"
+                  f" | cold open {r['cold_open']['seconds']:.2f}s / {r['cold_open']['peak_mb']:.1f} MB heap")
+            if r['memory']['peak_rss_mb'] is not None:
+                print(f"  rss {r['memory']['start_rss_mb']:.0f} MB at start, {r['memory']['peak_rss_mb']:.0f} MB peak")
+
+    if skipped:
+        print('Skipped: ' + ', '.join(f"{s['backend']} x {s['size']:,}" for s in skipped))
+    doc = {'meta': meta(), 'results': results, 'skipped': skipped}
+    out = args.out or os.path.join(ROOT, 'bench_results', f"people-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(doc, f, indent=2)
+    print('Wrote', out)
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == '__main__':
+    main()
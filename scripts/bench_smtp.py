@@ -0,0 +1,99 @@
+"""Compare per-message SMTP connections with the pooled sender.
+
+Starts a local aiosmtpd server (pip install aiosmtpd) that accepts and drops
+every message, then sends --messages alerts from --threads threads, first
+opening a connection per message (the old behaviour), then through
+integrations.smtp_pool. --latency-ms adds a delay to every server reply to
+stand in for a remote relay; the handshake is several round trips, so the gap
+grows with it.
+
+Usage:
+    python scripts/bench_smtp.py --messages 500 --threads 4 --latency-ms 5
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from integrations.smtp_pool import SMTPPool
+
+
+def start_server(latency: float):
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.smtp import SMTP as SMTPServer
+
+    class SlowSMTP(SMTPServer):
+        async def push(self, status):
+            if latency:
+                await asyncio.sleep(latency)
+            return await super().push(status)
+
+    class Sink:
+        async def handle_DATA(self, server, session, envelope):
+            return '250 OK'
+
+    class SlowController(Controller):
+        def factory(self):
+            return SlowSMTP(self.handler, **self.SMTP_kwargs)
+
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    controller = SlowController(Sink(), hostname='127.0.0.1', port=port)
+    controller.start()
+    return controller, port
+
+
+def message(i: int) -> EmailMessage:
+    m = EmailMessage()
+    m['Subject'] = 'Alert'
+    m['From'] = 'alerts@example.com'
+    m['To'] = f'{5550000000 + i}@vtext.com'
+    m.set_content('Suspicious transaction detected, reply YES to confirm.')
+    return m
+
+
+def run(send, n: int, threads: int) -> float:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        list(ex.map(send, range(n)))
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--messages', type=int, default=500)
+    ap.add_argument('--threads', type=int, default=4)
+    ap.add_argument('--latency-ms', type=float, default=2.0, help='delay added to every server reply')
+    args = ap.parse_args()
+    try:
+        controller, port = start_server(args.latency_ms / 1000)
+    except ImportError:
+        sys.exit('aiosmtpd not installed')
+    try:
+        def per_message(i):
+            with smtplib.SMTP('127.0.0.1', port, timeout=15) as s:
+                try:
+                    s.starttls()
+                except Exception:
+                    pass
+                s.send_message(message(i))
+
+        pool = SMTPPool('127.0.0.1', port, max_idle=args.threads)
+        fresh = run(per_message, args.messages, args.threads)
+        pooled = run(lambda i: pool.send_message(message(i)), args.messages, args.threads)
+        stats = pool.stats()
+        pool.close()
+    finally:
+        controller.stop()
+    print(f'connection per message: {fresh:8.0f} msg/s')
+    print(f'pooled:                 {pooled:8.0f} msg/s  ({pooled / fresh:.1f}x, {stats["opened"]} connections opened)')
+
+
+if __name__ == '__main__':
+    main()
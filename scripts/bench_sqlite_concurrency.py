@@ -0,0 +1,65 @@
+"""Read/write throughput of SQLiteAdapter from many threads at once.
+
+Usage:
+    python scripts/bench_sqlite_concurrency.py --rows 50000 --threads 1 4 8
+
+Each thread runs point reads (get_person) and paged reads (list_people) while
+one writer thread keeps updating rows, which is what concurrent Streamlit
+sessions do to the shared adapter.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from integrations.db_adapters import SQLiteAdapter
+
+
+def run(adapter, rows, threads, seconds):
+    stop = time.perf_counter() + seconds
+    counts = [0] * threads
+    writes = [0]
+
+    def reader(n):
+        rnd = random.Random(n)
+        while time.perf_counter() < stop:
+            pid = f'p{rnd.randrange(rows):07d}'
+            assert adapter.get_person(pid)['id'] == pid
+            adapter.list_people(after_id=pid, limit=20)
+            counts[n] += 2
+
+    def writer():
+        rnd = random.Random(-1)
+        while time.perf_counter() < stop:
+            adapter.update_many((f'p{rnd.randrange(rows):07d}', {'last_notified': int(time.time())}) for _ in range(100))
+            writes[0] += 100
+
+    ts = [threading.Thread(target=reader, args=(n,)) for n in range(threads)] + [threading.Thread(target=writer)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    return sum(counts) / seconds, writes[0] / seconds
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--rows', type=int, default=50000)
+    ap.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+    ap.add_argument('--seconds', type=float, default=3.0)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as d:
+        adapter = SQLiteAdapter(path=os.path.join(d, 'people.db'), pool_size=max(args.threads) + 1)
+        adapter.upsert_many({'id': f'p{i:07d}', 'name': f'User {i}', 'phone': f'555{i:07d}', 'consent': i % 2}
+                            for i in range(args.rows))
+        for n in args.threads:
+            reads, writes = run(adapter, args.rows, n, args.seconds)
+            print(f'{n:3d} reader threads: {reads:10,.0f} reads/s  {writes:8,.0f} writes/s')
+        adapter.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark SQLiteAdapter bulk upserts against the old per-row update path.
+
+Usage:
+    python scripts/bench_sqlite_upsert.py --n 100000 --legacy-n 2000
+
+The legacy path (SELECT, then INSERT or UPDATE, then COMMIT per row in the
+default rollback-journal mode) is timed on --legacy-n rows and extrapolated,
+since running it for 100k rows takes minutes on most disks.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from integrations.db_adapters import SQLiteAdapter
+
+
+def people(n, tag=''):
+    for i in range(n):
+        yield {'id': f'p{i}', 'name': f'User {i}{tag}', 'phone': f'555{i:07d}', 'telegram_id': '',
+               'consent': i % 2, 'consent_ts': '2025-11-20 12:00:00', 'last_notified': None}
+
+
+def legacy_update(conn, p):
+    c = conn.cursor()
+    c.execute('SELECT id FROM people WHERE id=?', (p['id'],))
+    if c.fetchone() is None:
+        c.execute('INSERT OR REPLACE INTO people (id,name,phone,telegram_id,consent,consent_ts,last_notified) VALUES (?,?,?,?,?,?,?)',
+                  [p['id'], p['name'], p['phone'], p['telegram_id'], p['consent'], p['consent_ts'], p['last_notified']])
+    else:
+        c.execute('UPDATE people SET name=?, phone=? WHERE id=?', (p['name'], p['phone'], p['id']))
+    conn.commit()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--n', type=int, default=100000)
+    ap.add_argument('--legacy-n', type=int, default=2000)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as d:
+        legacy_db = os.path.join(d, 'legacy.db')
+        conn = sqlite3.connect(legacy_db)
+        conn.execute('CREATE TABLE people (id TEXT PRIMARY KEY, name TEXT, phone TEXT, telegram_id TEXT, consent INTEGER DEFAULT 0, consent_ts TEXT, last_notified INTEGER)')
+        t0 = time.perf_counter()
+        for p in people(args.legacy_n):
+            legacy_update(conn, p)
+        legacy_rate = args.legacy_n / (time.perf_counter() - t0)
+        conn.close()
+
+        adapter = SQLiteAdapter(path=os.path.join(d, 'bulk.db'))
+        t0 = time.perf_counter()
+        adapter.upsert_many(people(args.n))
+        insert_rate = args.n / (time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        adapter.upsert_many(people(args.n, tag=' v2'))
+        update_rate = args.n / (time.perf_counter() - t0)
+
+    print(f'legacy per-row path: {legacy_rate:12,.0f} rows/s  (~{args.n / legacy_rate:.1f}s for {args.n:,} rows)')
+    print(f'upsert_many insert:  {insert_rate:12,.0f} rows/s  ({args.n / insert_rate:.2f}s)  x{insert_rate / legacy_rate:.0f}')
+    print(f'upsert_many update:  {update_rate:12,.0f} rows/s  ({args.n / update_rate:.2f}s)  x{update_rate / legacy_rate:.0f}')
+
+
+if __name__ == '__main__':
+    main()
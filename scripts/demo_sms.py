@@ -1,5 +1,5 @@
 """Demo for SMS providers without making network calls.
-This script patches `requests.post` and `smtplib.SMTP` inside `scripts.send_sms` to simulate
+This script patches `http_client.post` and `smtplib.SMTP` inside `scripts.send_sms` to simulate
 successful and failed sends, and prints the returned dicts.
 Run: python scripts/demo_sms.py
 """
@@ -12,7 +12,7 @@ import scripts.send_sms as sms
 print('--- SMS helpers demo (offline simulation) ---')
 
 # Keep originals to restore later
-_orig_post = sms.requests.post
+_orig_post = sms.http_client.post
 _orig_smtp = sms.smtplib.SMTP
 
 class DummyResponse:
@@ -22,12 +22,12 @@ class DummyResponse:
         return self._data
 
 # 1) Simulate Textbelt success
-sms.requests.post = lambda url, data, timeout=10: DummyResponse({'success': True, 'id': 'demo-textbelt-1'})
+sms.http_client.post = lambda url, data, timeout=10: DummyResponse({'success': True, 'id': 'demo-textbelt-1'})
 res = sms.send_via_textbelt('+15551234567', 'Test message via Textbelt (simulated)')
 print('Textbelt simulated success ->', res)
 
 # 2) Simulate Textbelt failure
-sms.requests.post = lambda url, data, timeout=10: DummyResponse({'success': False, 'error': 'quota exceeded'})
+sms.http_client.post = lambda url, data, timeout=10: DummyResponse({'success': False, 'error': 'quota exceeded'})
 res = sms.send_via_textbelt('+15551234567', 'Test message via Textbelt (simulated failure)')
 print('Textbelt simulated failure ->', res)
 
@@ -59,14 +59,14 @@ print('Email-to-SMS simulated success ->', res)
 
 # 4) Demonstrate fallback logic combined: simulate Twilio missing, Textbelt failing, email succeeding
 # We'll directly call functions in the order the app uses them
-sms.requests.post = lambda url, data, timeout=10: DummyResponse({'success': False, 'error': 'quota exceeded'})
+sms.http_client.post = lambda url, data, timeout=10: DummyResponse({'success': False, 'error': 'quota exceeded'})
 # email gateway already patched above
 print('\nCombined fallback demo:')
 print('Try Textbelt ->', sms.send_via_textbelt('+15551234567', 'combined test'))
 print('Then try email gateway ->', sms.send_via_email_gateway('+15551234567', 'combined test'))
 
 # Restore originals for safety
-sms.requests.post = _orig_post
+sms.http_client.post = _orig_post
 sms.smtplib.SMTP = _orig_smtp
 
 print('\n--- Demo complete ---')
@@ -0,0 +1,40 @@
+"""Stream decision logs to CSV, NDJSON or Parquet without loading them into memory.
+
+Usage:
+    python scripts/export_logs.py --format csv --out decisions.csv
+    python scripts/export_logs.py --format parquet --out d.parquet --start "2025-11-01" --end "2025-12-01"
+    python scripts/export_logs.py --format ndjson --fields timestamp,probability,shap_values
+"""
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from integrations.log_export import export_decisions, FORMATS
+from integrations.live_metrics import DECISION_LOG_JSONL
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--format', choices=FORMATS, default='csv')
+    ap.add_argument('--log', default=DECISION_LOG_JSONL, help='Decision log JSONL to read')
+    ap.add_argument('--out', default='-', help='Output file (default: stdout)')
+    ap.add_argument('--start', help='Inclusive start timestamp, e.g. "2025-11-01 00:00:00"')
+    ap.add_argument('--end', help='Exclusive end timestamp')
+    ap.add_argument('--fields', help='Comma-separated fields to keep (shap_values/inputs expand per feature)')
+    ap.add_argument('--feature-names', help='Comma-separated feature names for flat column labels')
+    ap.add_argument('--chunk-size', type=int, default=1000)
+    args = ap.parse_args()
+    fields = [f.strip() for f in args.fields.split(',')] if args.fields else None
+    names = [f.strip() for f in args.feature_names.split(',')] if args.feature_names else None
+    chunks = export_decisions(args.format, args.log, args.start, args.end, fields, names, args.chunk_size)
+    out = sys.stdout.buffer if args.out == '-' else open(args.out, 'wb')
+    try:
+        for data in chunks:
+            out.write(data)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,11 @@
 import os
+import sys
 import csv
-import json
 import re
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from integrations import json_codec
 
 def parse_number_list(s):
     # extract numeric literals (ints/floats) from a string
@@ -76,7 +78,7 @@ def migrate_logs(csv_path, jsonl_path):
                 'shap_values': shap_vals,
                 'inputs': inputs
             }
-            out.write(json.dumps(obj) + '\n')
+            out.write(json_codec.dumps(obj) + '\n')
     print('Wrote', jsonl_path)
 
 def migrate_notifications(csv_path, jsonl_path):
@@ -116,7 +118,7 @@ def migrate_notifications(csv_path, jsonl_path):
                 'contact': contact,
                 'message': message
             }
-            out.write(json.dumps(obj) + '\n')
+            out.write(json_codec.dumps(obj) + '\n')
     print('Wrote', jsonl_path)
 
 def migrate_replies(csv_path, jsonl_path):
@@ -154,7 +156,7 @@ def migrate_replies(csv_path, jsonl_path):
                 'transaction_id': tx,
                 'reply': reply
             }
-            out.write(json.dumps(obj) + '\n')
+            out.write(json_codec.dumps(obj) + '\n')
     print('Wrote', jsonl_path)
 
 
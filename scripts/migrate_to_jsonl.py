@@ -1,9 +1,11 @@
 import os
+import sys
 import csv
-import json
 import re
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from integrations import json_codec
 
 def extract_numbers(s):
     # find floats/ints including scientific notation
@@ -70,7 +72,7 @@ def migrate_logs(csv_path, jsonl_path, kind='logs'):
                 'shap_values': shap,
                 'inputs': inputs
             }
-            out.write(json.dumps(obj) + '\n')
+            out.write(json_codec.dumps(obj) + '\n')
     print('Migrated', csv_path, '->', jsonl_path)
 
 
@@ -116,7 +118,7 @@ def migrate_notifications(csv_path, jsonl_path):
                 'contact': contact,
                 'message': message
             }
-            out.write(json.dumps(obj) + '\n')
+            out.write(json_codec.dumps(obj) + '\n')
     print('Migrated', csv_path, '->', jsonl_path)
 
 
@@ -157,7 +159,7 @@ def migrate_replies(csv_path, jsonl_path):
                 'transaction_id': tx,
                 'reply': reply
             }
-            out.write(json.dumps(obj) + '\n')
+            out.write(json_codec.dumps(obj) + '\n')
     print('Migrated', csv_path, '->', jsonl_path)
 
 
@@ -0,0 +1,29 @@
+"""Rebuild the sidecar indexes of the JSONL logs from the logs themselves.
+
+Usage:
+    python scripts/rebuild_indexes.py
+
+Safe to run at any time; the indexes are derived data and are also caught up
+lazily by the app on lookup.
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from integrations.log_index import JsonlIndex, normalize_contact
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+INDEXES = [
+    ('fraudshield_logs.jsonl', 'transaction_id', {}),
+    ('fraudshield_notifications.jsonl', 'contact', {'value_fields': ('transaction_id', 'timestamp'), 'key_func': normalize_contact}),
+    ('fraudshield_logs_notifications.jsonl', 'contact', {'value_fields': ('transaction_id', 'timestamp'), 'key_func': normalize_contact}),
+]
+
+if __name__ == '__main__':
+    for name, key, kwargs in INDEXES:
+        path = os.path.join(ROOT, name)
+        if not os.path.exists(path):
+            continue
+        idx = JsonlIndex(path, key, **kwargs)
+        idx.rebuild()
+        print(f'{name}: indexed {len(idx)} keys by {key} -> {idx.index_path}')
@@ -1,8 +1,9 @@
-import requests
 import os
 import smtplib
 from email.message import EmailMessage
 from nexmo import Sms
+from integrations import http_client
+from integrations.smtp_pool import get_smtp_pool
 
 # phone normalization helper: prefer phonenumbers if installed
 try:
@@ -40,7 +41,7 @@ def send_via_textbelt(phone_number, message, api_key=None, timeout=10):
     # normalize to E.164 where possible (Textbelt prefers international format)
     phone_norm = normalize_phone(phone_number)
     try:
-        resp = requests.post('https://textbelt.com/text', {
+        resp = http_client.post('https://textbelt.com/text', {
             'phone': phone_norm,
             'message': message,
             'key': api_key,
@@ -90,13 +91,7 @@ def send_via_email_gateway(phone_number, message, smtp_host=None, smtp_port=None
         em['From'] = smtp_user
         em['To'] = to_addr
         em.set_content(message)
-        with smtplib.SMTP(smtp_host, smtp_port, timeout=timeout) as s:
-            try:
-                s.starttls()
-            except Exception:
-                pass
-            s.login(smtp_user, smtp_pass)
-            s.send_message(em)
+        get_smtp_pool(smtp_host, smtp_port, smtp_user, smtp_pass, timeout=timeout).send_message(em)
         return {"status": "sent", "detail": f"email_gateway:{to_addr}"}
     except Exception as e:
         return {"status": "failed", "detail": str(e)}
@@ -26,7 +26,8 @@ import shap
 ROOT = pathlib.Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
-from integrations.live_metrics import load_decision_logs, compute_metrics
+from integrations.live_metrics import query_decision_logs, compute_metrics
+from integrations.jsonl_log import append_jsonl
 
 LOG_JSONL = "fraudshield_logs.jsonl"
 LOG_CSV = "fraudshield_logs.csv"
@@ -60,8 +61,7 @@ def train(df: pd.DataFrame):
 
 def append_log(obj):
     try:
-        with open(LOG_JSONL, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(obj) + "\n")
+        append_jsonl(LOG_JSONL, obj)
     except Exception:
         entry = pd.DataFrame([obj])
         if os.path.exists(LOG_CSV):
@@ -108,7 +108,7 @@ def main():
     base_df = build_dataset(400, args.seed)
     model, explainer, feats = train(base_df)
     simulate(model, explainer, feats, base_df, args.n, args.seed)
-    logs = load_decision_logs(limit=500)
+    logs = query_decision_logs(columns=['timestamp', 'transaction_id', 'prediction', 'probability'], limit=500)
     m = compute_metrics(logs)
     print("Simulation complete. Metrics:")
     print(json.dumps(m, indent=2))
@@ -1,7 +1,10 @@
 import os
+import sys
 import json
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from integrations import json_codec
 
 def read_jsonl(path):
     if not os.path.exists(path):
@@ -13,7 +16,7 @@ def read_jsonl(path):
             if not ln:
                 continue
             try:
-                out.append(json.loads(ln))
+                out.append(json_codec.loads(ln))
             except Exception as e:
                 out.append({'_parse_error': str(e), '_raw': ln})
     return out
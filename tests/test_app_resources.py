@@ -0,0 +1,69 @@
+import os
+import sys
+import pytest
+st = pytest.importorskip('streamlit')
+from streamlit.testing.v1 import AppTest
+from integrations import db_adapters
+
+APP = os.path.join(os.path.dirname(__file__), '..', 'app.py')
+
+
+@pytest.fixture(autouse=True)
+def _keep_main(monkeypatch):
+    # AppTest leaves app.py registered as __main__; spawned processes in later tests would re-run it
+    monkeypatch.setitem(sys.modules, '__main__', sys.modules['__main__'])
+
+
+def test_people_adapter_is_shared_across_reruns(tmp_path, monkeypatch):
+    built = []
+
+    class CountingSQLiteAdapter(db_adapters.SQLiteAdapter):
+        def __init__(self, *args, **kwargs):
+            built.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(db_adapters, 'SQLiteAdapter', CountingSQLiteAdapter)
+    monkeypatch.setattr(db_adapters, 'DEFAULT_SQLITE', str(tmp_path / 'people.db'))
+    monkeypatch.setenv('DATA_BACKEND', 'sqlite')
+    monkeypatch.setenv('PEOPLE_CACHE_TTL', '60')
+    st.cache_resource.clear()
+    try:
+        at = AppTest.from_file(APP, default_timeout=120)
+        for _ in range(3):
+            at.run()
+        assert not at.exception
+        assert len(built) == 1
+        # the caption reports the previous runs: a miss on the first, a hit on the second
+        assert any('hit rate 50%' in c.value for c in at.caption)
+    finally:
+        st.cache_resource.clear()
+        for adapter in built:
+            adapter.close()
+
+
+def test_csv_indexes_survive_reruns(tmp_path, monkeypatch):
+    path = str(tmp_path / 'people.csv')
+    db_adapters.CSVAdapter(path=path).upsert_many(
+        [{'id': f'p{i}', 'name': n, 'phone': f'555000{i}', 'consent': 1} for i, n in enumerate(['Ann Lee', 'Bob Ray'])])
+    builds = []
+
+    class CountingCSVAdapter(db_adapters.CSVAdapter):
+        def _build_tokens(self):
+            builds.append(self)
+            super()._build_tokens()
+
+    monkeypatch.setattr(db_adapters, 'CSVAdapter', CountingCSVAdapter)
+    monkeypatch.setattr(db_adapters, 'DEFAULT_CSV', path)
+    monkeypatch.setenv('DATA_BACKEND', 'csv')
+    monkeypatch.setenv('PEOPLE_CACHE_TTL', '0')
+    st.cache_resource.clear()
+    try:
+        at = AppTest.from_file(APP, default_timeout=120)
+        at.run()
+        for query in ('ann', 'bob', 'lee'):
+            at.text_input(key='users_search').input(query).run()
+        assert not at.exception
+        # one adapter, one people.csv parse and one word-prefix index for all searches
+        assert len(builds) == 1
+    finally:
+        st.cache_resource.clear()
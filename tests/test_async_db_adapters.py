@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+from integrations.db_adapters import SQLiteAdapter, CSVAdapter
+from integrations.async_db_adapters import AsyncPeopleStore, ThreadPoolAdapter
+
+
+async def _exercise(store):
+    assert isinstance(store, AsyncPeopleStore)
+    await asyncio.gather(*(store.update_person(f'p{i:02d}', {'name': f'N{i}', 'phone': f'555-{i:04d}', 'consent': 1})
+                           for i in range(30)))
+    assert (await store.get_person('p07'))['name'] == 'N7'
+    assert (await store.get_person_by_phone('5550012'))['id'] == 'p12'
+    assert await store.get_person('missing') is None
+    ids = [p['id'] async for p in store.iter_people(batch_size=8)]
+    assert ids == [f'p{i:02d}' for i in range(30)]
+    assert [p['id'] for p in await store.list_people(after_id='p27', limit=5)] == ['p28', 'p29']
+    assert [p['id'] for p in await store.search_people('n17')] == ['p17']
+
+
+def test_thread_pool_adapter(tmp_path):
+    for sync in (SQLiteAdapter(path=str(tmp_path / 'people.db')), CSVAdapter(path=str(tmp_path / 'people.csv'))):
+        store = ThreadPoolAdapter(sync, max_workers=4)
+        asyncio.run(_exercise(store))
+        store.close()
+
+
+def test_aiosqlite_adapter(tmp_path):
+    pytest.importorskip('aiosqlite')
+    from integrations.async_db_adapters import AioSQLiteAdapter
+    path = str(tmp_path / 'people.db')
+
+    async def run():
+        store = AioSQLiteAdapter(path=path)
+        try:
+            await _exercise(store)
+        finally:
+            await store.close()
+
+    asyncio.run(run())
+    # written rows are visible to the sync adapter
+    assert SQLiteAdapter(path=path).get_person('p03')['phone'] == '555-0003'
@@ -1,5 +1,8 @@
 from integrations.db_adapters import SQLiteAdapter, CSVAdapter
+from integrations import json_codec
 import os
+import sqlite3
+import pytest
 
 
 def test_sqlite_adapter_tmp(tmp_path):
@@ -18,3 +21,214 @@ def test_csv_adapter_tmp(tmp_path):
     adapter.update_person(pid, {'name':'Bob','phone':'5552','consent':1})
     p = adapter.get_person(pid)
     assert p['name'] == 'Bob'
+
+
+def test_csv_adapter_index_reloads_on_external_change(tmp_path):
+    csvf = tmp_path / 'people.csv'
+    adapter = CSVAdapter(path=str(csvf))
+    adapter.update_person('p1', {'name': 'Ann', 'consent': True})
+    assert adapter.get_person('p1')['consent'] is True
+    # another process rewrites the file
+    other = CSVAdapter(path=str(csvf))
+    other.update_person('p2', {'name': 'Ben', 'consent': 0})
+    assert adapter.get_person('p2')['name'] == 'Ben'
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith('.tmp')]
+
+
+def test_csv_adapter_journal_compaction(tmp_path):
+    csvf = tmp_path / 'people.csv'
+    adapter = CSVAdapter(path=str(csvf), journal_max_bytes=2000)
+    for i in range(40):
+        adapter.update_person(f'p{i % 5}', {'name': f'N{i}', 'last_notified': i})
+    base = csvf.read_text()
+    # updates are appended, not rewritten; compaction folded most of them back
+    assert (tmp_path / 'people.csv.journal').stat().st_size <= 2000
+    assert 'p0' in base
+    fresh = CSVAdapter(path=str(csvf))
+    assert {p['id']: p['name'] for p in fresh.list_people()} == {f'p{j}': f'N{35 + j}' for j in range(5)}
+
+
+def test_csv_adapter_rejects_unknown_columns(tmp_path):
+    csvf = tmp_path / 'people.csv'
+    adapter = CSVAdapter(path=str(csvf), journal_max_bytes=200)
+    with pytest.raises(ValueError, match='email'):
+        adapter.update_person('p1', {'name': 'A', 'email': 'x@y'})
+    assert adapter.get_person('p1') is None
+    # a journal written before the check still compacts
+    with open(str(csvf) + '.journal', 'ab') as f:
+        f.write(json_codec.dumps_line({'id': 'p2', 'updates': {'name': 'B', 'email': 'x@y'}}))
+    for i in range(10):
+        adapter.update_person('p3', {'name': f'C{i}'})
+    assert CSVAdapter(path=str(csvf)).get_person('p2')['name'] == 'B'
+
+
+def test_sqlite_bulk_upsert_and_partial_update(tmp_path):
+    adapter = SQLiteAdapter(path=str(tmp_path / 'people.db'))
+    adapter.upsert_many([{'id': f'p{i}', 'name': f'U{i}', 'phone': str(i), 'consent': '1'} for i in range(50)], batch_size=7)
+    adapter.update_many([('p3', {'consent': '0'}), ('p99', {'name': 'New'})])
+    assert len(adapter.list_people()) == 51
+    p3 = adapter.get_person('p3')
+    assert p3['consent'] == 0 and p3['name'] == 'U3' and p3['phone'] == '3'
+    assert adapter.get_person('p99')['name'] == 'New'
+    with adapter.connection() as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_person_lookups_by_phone_and_telegram(tmp_path):
+    for adapter in (SQLiteAdapter(path=str(tmp_path / 'people.db')), CSVAdapter(path=str(tmp_path / 'people.csv'))):
+        adapter.update_person('a', {'name': 'Ann', 'phone': '+1 (555) 010-0001', 'telegram_id': '777', 'consent': 1})
+        adapter.update_person('b', {'name': 'Ben', 'phone': '555-0002', 'consent': 0})
+        assert adapter.get_person_by_phone('15550100001')['id'] == 'a'
+        assert adapter.get_person_by_telegram_id(777)['id'] == 'a'
+        assert adapter.get_person_by_phone('') is None
+        adapter.update_person('b', {'phone': '555-0003'})
+        assert adapter.get_person_by_phone('5550002') is None
+        assert adapter.get_person_by_phone('555 0003')['name'] == 'Ben'
+        assert [p['id'] for p in adapter.list_people(consent=True)] == ['a']
+        assert [p['id'] for p in adapter.list_people(consent=False)] == ['b']
+
+
+def test_sqlite_adds_phone_index_to_existing_db(tmp_path):
+    dbfile = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(dbfile)
+    conn.execute('CREATE TABLE people (id TEXT PRIMARY KEY, name TEXT, phone TEXT, telegram_id TEXT, consent INTEGER DEFAULT 0, consent_ts TEXT, last_notified INTEGER)')
+    conn.execute("INSERT INTO people (id, name, phone) VALUES ('p1', 'Old', '555-1234')")
+    conn.commit()
+    conn.close()
+    adapter = SQLiteAdapter(path=dbfile)
+    assert adapter.get_person_by_phone('5551234')['name'] == 'Old'
+    with adapter.connection() as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT id FROM people WHERE phone_norm='1'").fetchall()
+    assert 'idx_people_phone_norm' in str(plan)
+
+
+def test_concurrent_opens_migrate_old_db_once(tmp_path):
+    import threading
+    dbfile = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(dbfile)
+    conn.execute('CREATE TABLE people (id TEXT PRIMARY KEY, name TEXT, phone TEXT, telegram_id TEXT, consent INTEGER DEFAULT 0, consent_ts TEXT, last_notified INTEGER)')
+    conn.executemany('INSERT INTO people (id, phone) VALUES (?, ?)', [(f'p{i}', f'555-{i:04d}') for i in range(2000)])
+    conn.commit()
+    conn.close()
+    # separate adapters share no in-process lock, like separate processes
+    start = threading.Barrier(6)
+    errors = []
+
+    def open_db():
+        start.wait()
+        try:
+            SQLiteAdapter(path=dbfile)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=open_db) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert SQLiteAdapter(path=dbfile).get_person_by_phone('5551999')['id'] == 'p1999'
+
+
+def test_keyset_pages_and_iter_people(tmp_path):
+    for adapter in (SQLiteAdapter(path=str(tmp_path / 'people.db')), CSVAdapter(path=str(tmp_path / 'people.csv'))):
+        for i in (5, 3, 9, 1, 7, 2):
+            adapter.update_person(f'p{i}', {'name': f'Name {i}', 'phone': f'555-000{i}', 'consent': i % 2})
+        page1 = adapter.list_people(limit=4)
+        assert [p['id'] for p in page1] == ['p1', 'p2', 'p3', 'p5']
+        assert [p['id'] for p in adapter.list_people(after_id='p5', limit=4)] == ['p7', 'p9']
+        assert [p['id'] for p in adapter.iter_people(batch_size=4)] == ['p1', 'p2', 'p3', 'p5', 'p7', 'p9']
+        assert [p['id'] for p in adapter.iter_people(batch_size=2, consent=False)] == ['p2']
+        assert [p['id'] for p in adapter.list_people(search='name 7', limit=10)] == ['p7']
+        assert [p['id'] for p in adapter.list_people(search='5550003', limit=10)] == ['p3']
+        assert adapter.list_people(search='Name_%', limit=10) == []
+
+
+def test_sqlite_concurrent_readers_and_writers(tmp_path):
+    import threading
+    adapter = SQLiteAdapter(path=str(tmp_path / 'people.db'), pool_size=4)
+    errors = []
+
+    def worker(w):
+        try:
+            for i in range(50):
+                pid = f'w{w}-{i:03d}'
+                adapter.update_person(pid, {'name': f'W{w}', 'phone': f'{w}{i:04d}', 'consent': i % 2})
+                assert adapter.get_person(pid)['name'] == f'W{w}'
+                adapter.list_people(limit=20, search=f'W{w}')
+        except Exception as e:  # surfaced below; pytest does not see thread exceptions
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(adapter.list_people()) == 16 * 50
+    assert adapter._opened <= 4
+
+
+def test_migrate_from_csv_in_chunks(tmp_path):
+    src = tmp_path / 'src.csv'
+    lines = ['id,name,phone,telegram_id,consent,consent_ts,last_notified']
+    lines += [f'm{i},M{i},555{i:04d},,{i % 2},,' for i in range(25)]
+    lines += ['m3,Dup,,,1,,', ',NoId,,,0,,']
+    src.write_text('\n'.join(lines) + '\n')
+    for adapter in (SQLiteAdapter(path=str(tmp_path / 'people.db')), CSVAdapter(path=str(tmp_path / 'people.csv'))):
+        adapter.update_person('m0', {'name': 'Kept'})
+        assert adapter.migrate_from_csv(str(src), chunk_size=7) == 25
+        assert adapter.migrate_from_csv(str(src), chunk_size=7) == 1  # the id-less row gets a fresh uuid
+        people = adapter.get_people(['m0', 'm3', 'm4', 'nope'])
+        assert set(people) == {'m0', 'm3', 'm4'}
+        assert people['m0']['name'] == 'Kept' and people['m3']['name'] == 'M3'
+        assert people['m4']['consent'] is False and people['m3']['consent'] is True
+        assert adapter.get_person_by_phone('5550004')['id'] == 'm4'
+
+
+def test_sqlite_migrate_large_chunks_under_old_variable_limit(tmp_path, monkeypatch):
+    # emulate SQLite < 3.32, which binds at most 999 parameters per statement
+    connect = SQLiteAdapter._connect
+
+    def limited(self):
+        conn = connect(self)
+        conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        return conn
+
+    monkeypatch.setattr(SQLiteAdapter, '_connect', limited)
+    src = tmp_path / 'src.csv'
+    src.write_text('id,name,phone,telegram_id,consent,consent_ts,last_notified\n'
+                   + ''.join(f'm{i},M{i},,,1,,\n' for i in range(3000)))
+    adapter = SQLiteAdapter(path=str(tmp_path / 'people.db'))
+    adapter.update_person('m5', {'name': 'Kept'})
+    assert adapter.migrate_from_csv(str(src), chunk_size=5000) == 2999
+    assert adapter.get_person('m5')['name'] == 'Kept'
+    assert len(adapter.get_people(f'm{i}' for i in range(3000))) == 3000
+
+
+def test_search_people_prefix_terms(tmp_path):
+    legacy = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(legacy)
+    conn.execute('CREATE TABLE people (id TEXT PRIMARY KEY, name TEXT, phone TEXT, telegram_id TEXT, consent INTEGER DEFAULT 0, consent_ts TEXT, last_notified INTEGER)')
+    conn.execute("INSERT INTO people (id, name, phone) VALUES ('old', 'Olga Old', '555-7777')")
+    conn.commit()
+    conn.close()
+    for adapter in (SQLiteAdapter(path=legacy), CSVAdapter(path=str(tmp_path / 'people.csv'))):
+        if isinstance(adapter, CSVAdapter):
+            adapter.update_person('old', {'name': 'Olga Old', 'phone': '555-7777'})
+        adapter.upsert_many({'id': f'p{i}', 'name': f'Person {i} Smith' if i % 2 else f'Person {i} Jones',
+                             'phone': f'+1 (555) 01{i:02d}', 'telegram_id': str(9000 + i)} for i in range(40))
+
+        def ids(q, n=50):
+            return sorted(p['id'] for p in adapter.search_people(q, limit=n))
+
+        assert ids('smi pers') == sorted(f'p{i}' for i in range(1, 40, 2))
+        assert ids('PERSON 3') == ['p3', 'p30', 'p31', 'p32', 'p33', 'p34', 'p35', 'p36', 'p37', 'p38', 'p39']
+        assert ids('1 (555) 0107') == ['p7']
+        assert ids('9012') == ['p12']
+        assert ids('olg') == ['old']
+        assert ids('mith') == [] and ids('') == []
+        assert len(adapter.search_people('person', limit=5)) == 5
+        # changes after the index is built are searchable straight away
+        adapter.update_person('p4', {'name': 'Zed Zebra'})
+        assert ids('zeb') == ['p4'] and 'p4' not in ids('jones')
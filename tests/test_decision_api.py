@@ -0,0 +1,74 @@
+import io
+import csv
+import json
+import pytest
+
+flask = pytest.importorskip('flask')
+
+from integrations.decision_api import decisions_api
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # the decision log and its index live relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('DECISIONS_API_TOKEN', 'secret')
+    with open('fraudshield_logs.jsonl', 'w', encoding='utf-8') as f:
+        for i in range(30):
+            f.write(json.dumps({'timestamp': f'2025-11-{10 + i % 10:02d} 12:00:00', 'transaction_id': f't{i}',
+                                'prediction': i % 2, 'probability': i / 30,
+                                'shap_values': [0.3, -0.1 * i], 'inputs': [100 + i, 1]}) + '\n')
+    app = flask.Flask(__name__)
+    app.register_blueprint(decisions_api)
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = 'Bearer secret'
+    return client
+
+
+def test_decision_detail(client):
+    resp = client.get('/decisions/t7')
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body['decision']['inputs'] == [107, 1]
+    # largest |SHAP| first
+    assert body['explanation'][0] == {'feature': 1, 'value': 1, 'shap': pytest.approx(-0.7)}
+    assert client.get('/decisions/nope').status_code == 404
+
+
+def test_export_streams_filtered_csv(client):
+    resp = client.get('/export/decisions?format=csv&start=2025-11-12&end=2025-11-14&chunk_size=2')
+    assert resp.status_code == 200
+    assert resp.mimetype == 'text/csv'
+    assert resp.headers['Content-Disposition'] == 'attachment; filename=decisions.csv'
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert len(rows) == 6
+    assert {'input_0', 'input_1', 'shap_1'} <= set(rows[0])
+    assert client.get('/export/decisions?format=xml').status_code == 400
+    assert client.get('/export/decisions?chunk_size=lots').status_code == 400
+
+
+def test_parquet_export_without_pyarrow_is_501(client, monkeypatch):
+    from integrations import log_export
+
+    def missing():
+        raise RuntimeError('pyarrow not installed')
+
+    monkeypatch.setattr(log_export, '_pyarrow', missing)
+    resp = client.get('/export/decisions?format=parquet')
+    assert resp.status_code == 501
+    assert resp.get_data(as_text=True) == 'pyarrow not installed'
+
+
+def test_endpoints_require_token(client, monkeypatch):
+    assert client.get('/decisions/t7', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/export/decisions', headers={'Authorization': ''}).status_code == 401
+    monkeypatch.delenv('DECISIONS_API_TOKEN')
+    assert client.get('/export/decisions').status_code == 403
+
+
+def test_webhook_server_imports_and_serves_blueprint():
+    pytest.importorskip('pandas')
+    import importlib
+    webhook_server = importlib.import_module('webhook_server')
+    rules = {r.rule for r in webhook_server.app.url_map.iter_rules()}
+    assert {'/sms_reply', '/decisions/<transaction_id>', '/export/decisions'} <= rules
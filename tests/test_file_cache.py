@@ -0,0 +1,31 @@
+from integrations.file_cache import FileCache
+
+
+def test_cache_hits_until_file_changes(tmp_path):
+    f = tmp_path / 'log.jsonl'
+    f.write_text('a\n')
+    cache = FileCache()
+    calls = []
+
+    def load():
+        calls.append(1)
+        return f.read_text()
+
+    assert cache.get_or_load(str(f), 10, load) == 'a\n'
+    assert cache.get_or_load(str(f), 10, load) == 'a\n'
+    assert len(calls) == 1
+    with open(f, 'a') as fh:
+        fh.write('b\n')
+    assert cache.get_or_load(str(f), 10, load) == 'a\nb\n'
+    assert len(calls) == 2
+    assert cache.stats()['entries'] == 1
+
+
+def test_cache_memory_cap_evicts_lru(tmp_path):
+    f = tmp_path / 'x'
+    f.write_text('x')
+    cache = FileCache(max_bytes=3000)
+    for k in range(5):
+        cache.get_or_load(str(f), k, lambda: b'x' * 1000)
+    st = cache.stats()
+    assert st['bytes'] <= 3000 and st['entries'] < 5
@@ -0,0 +1,63 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from integrations import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        with self.server.lock:
+            self.server.clients.add(self.client_address)
+        body = json.dumps({'ok': True}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    srv.lock = threading.Lock()
+    srv.clients = set()
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_shared_session_keeps_connections_alive(server, monkeypatch):
+    monkeypatch.setattr(http_client, '_session', None)
+    url = f'http://127.0.0.1:{server.server_address[1]}/sendMessage'
+    for i in range(20):
+        assert http_client.post(url, json={'chat_id': i, 'text': 'hi'}).json() == {'ok': True}
+    assert len(server.clients) == 1
+    assert http_client.get_http_session() is http_client.get_http_session()
+    http_client.close_http_session()
+
+
+def test_host_limit_caps_concurrent_connections(server):
+    host = f'127.0.0.1:{server.server_address[1]}'
+    s = http_client.build_session(host_limits={host: 2})
+    url = f'http://{host}/text'
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        codes = list(ex.map(lambda i: s.post(url, data={'i': i}, timeout=10).status_code, range(40)))
+    s.close()
+    assert codes == [200] * 40
+    assert len(server.clients) <= 2
+
+
+def test_parse_host_limits():
+    assert http_client.parse_host_limits('api.telegram.org=8, Textbelt.com=4,bad,x=') == {
+        'api.telegram.org': 8, 'textbelt.com': 4}
@@ -0,0 +1,41 @@
+import importlib
+import json
+import math
+import sys
+import pytest
+import numpy as np
+from integrations import json_codec
+
+
+def _roundtrip(codec):
+    obj = {'shap_values': np.array([0.5, -0.25]), 'inputs': [np.int64(3), np.float32(1.5), 'x'], 'p': np.float64(0.1)}
+    line = codec.dumps_line(obj)
+    assert line.endswith(b'\n') and line.count(b'\n') == 1
+    back = codec.loads(line)
+    assert back == {'shap_values': [0.5, -0.25], 'inputs': [3, 1.5, 'x'], 'p': 0.1}
+
+
+def test_codec_serializes_numpy():
+    _roundtrip(json_codec)
+
+
+def test_stdlib_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+    fallback = importlib.reload(json_codec)
+    try:
+        assert fallback.BACKEND == 'json'
+        _roundtrip(fallback)
+        line = fallback.dumps_line({'shap_values': np.array([float('nan'), 1.0]), 'p': float('inf')})
+        assert json.loads(line) == {'shap_values': [None, 1.0], 'p': None}
+    finally:
+        monkeypatch.undo()
+        importlib.reload(json_codec)
+
+
+def test_orjson_reads_legacy_nan_lines():
+    pytest.importorskip('orjson')
+    assert json_codec.BACKEND == 'orjson'
+    # what the stdlib fallback used to write for SHAP values containing NaN
+    legacy = json.dumps({'shap_values': [float('nan'), 0.5], 'probability': 0.9}).encode() + b'\n'
+    back = json_codec.loads(legacy)
+    assert math.isnan(back['shap_values'][0]) and back['probability'] == 0.9
@@ -0,0 +1,173 @@
+import json
+from integrations import live_metrics
+from integrations import json_codec
+
+
+def _write_log(path, n):
+    with open(path, 'wb') as f:
+        for i in range(n):
+            rec = {
+                'timestamp': f'2025-11-{10 + i:02d} 09:00:00',
+                'transaction_id': f'{"SIM" if i % 2 else "LIVE"}-{i}',
+                'prediction': int(i % 3 == 0),
+                'probability': i / n,
+                'shap_values': [0.1, -0.1],
+                'inputs': [i, 0],
+            }
+            # mix stdlib (spaced) and orjson (compact) encodings
+            f.write((json.dumps(rec) + '\n').encode() if i % 2 else json_codec.dumps_line(rec))
+
+
+def test_iter_decision_logs_pushdown_filters(tmp_path):
+    log = str(tmp_path / 'log.jsonl')
+    _write_log(log, 12)
+    got = list(live_metrics.iter_decision_logs(start='2025-11-12', end='2025-11-18', path=log))
+    assert [r['timestamp'][:10] for r in got] == [f'2025-11-{d}' for d in range(12, 18)]
+    got = list(live_metrics.iter_decision_logs(prediction=1, path=log))
+    assert [r['transaction_id'] for r in got] == ['LIVE-0', 'SIM-3', 'LIVE-6', 'SIM-9']
+    got = list(live_metrics.iter_decision_logs(min_probability=0.5, max_probability=0.75,
+                                               transaction_id_prefix='SIM', columns=['transaction_id'], path=log))
+    assert got == [{'transaction_id': 'SIM-7'}, {'transaction_id': 'SIM-9'}]
+
+
+def test_query_decision_logs_limit_and_projection(tmp_path, monkeypatch):
+    log = str(tmp_path / 'log.jsonl')
+    _write_log(log, 12)
+    monkeypatch.setattr(live_metrics, 'DECISION_LOG_JSONL', log)
+    df = live_metrics.query_decision_logs(columns=['transaction_id', 'probability'], limit=3)
+    assert list(df.columns) == ['transaction_id', 'probability']
+    assert list(df['transaction_id']) == ['SIM-9', 'LIVE-10', 'SIM-11']
+
+
+def test_load_decision_logs_cached_per_file_version(tmp_path, monkeypatch):
+    log = tmp_path / 'log.jsonl'
+    _write_log(str(log), 4)
+    monkeypatch.setattr(live_metrics, 'DECISION_LOG_JSONL', str(log))
+    first = live_metrics.load_decision_logs(limit=10)
+    assert live_metrics.load_decision_logs(limit=10) is first
+    with open(log, 'ab') as f:
+        f.write(json_codec.dumps_line({'timestamp': '2025-12-01 00:00:00', 'prediction': 0, 'probability': 0.2}))
+    assert len(live_metrics.load_decision_logs(limit=10)) == 5
+
+
+def test_read_decision_page_walks_log_both_ways(tmp_path):
+    log = str(tmp_path / 'log.jsonl')
+    _write_log(log, 12)
+    seen, cursor = [], None
+    while True:
+        page = live_metrics.read_decision_page(cursor=cursor, page_size=5, path=log)
+        seen.extend(r['transaction_id'] for r in page['rows'])
+        cursor = page['next']
+        if cursor is None:
+            break
+    assert len(seen) == 12 and seen[0] == 'SIM-11' and seen[-1] == 'LIVE-0'
+    page = live_metrics.read_decision_page(page_size=5, newest_first=False, path=log, prediction=1)
+    assert [r['transaction_id'] for r in page['rows']] == ['LIVE-0', 'SIM-3', 'LIVE-6', 'SIM-9']
+
+
+def test_probability_timeseries_downsampling_keeps_extremes():
+    import numpy as np
+    import pandas as pd
+    y = np.sin(np.linspace(0, 20, 20000)) * 0.5 + 0.5
+    y[12345] = 1.5  # a lone spike must survive downsampling
+    df = pd.DataFrame({'probability': y})
+    for method in ('lttb', 'minmax'):
+        ts = live_metrics.build_probability_timeseries(df, limit=None, max_points=400, method=method)
+        assert len(ts) <= 400
+        assert ts['Index'].is_monotonic_increasing
+        assert ts['Probability'].max() == 1.5
+        assert ts['Index'].iloc[0] == 0
+    small = live_metrics.build_probability_timeseries(df, limit=50, max_points=400)
+    assert len(small) == 50
+
+
+def test_probability_timeseries_all_streams_without_decoding(tmp_path, monkeypatch):
+    import tracemalloc
+    import numpy as np
+    log = tmp_path / 'log.jsonl'
+    n = 100000
+    with open(log, 'wb') as f:
+        for i in range(n):
+            f.write(json_codec.dumps_line({'timestamp': '2025-11-10 09:00:00', 'transaction_id': f't{i}',
+                                           'prediction': 0, 'probability': (i % 997) / 997,
+                                           'shap_values': [0.1] * 8, 'inputs': [i] * 8}))
+        f.write(b'{"timestamp": "2025-11-10 09:00:01", "probability": 0.5')  # torn last line
+    monkeypatch.setattr(live_metrics, 'DECISION_LOG_JSONL', str(log))
+    loads = live_metrics.json_codec.loads
+    decoded = []
+    monkeypatch.setattr(live_metrics.json_codec, 'loads', lambda ln: decoded.append(1) or loads(ln))
+    live_metrics.shared_cache.clear()
+    tracemalloc.start()
+    ts = live_metrics.probability_timeseries(window=None, max_points=500)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert 250 < len(ts) <= 500 and ts['Index'].iloc[0] == 0 and ts['Index'].iloc[-1] == n - 1
+    # only the recent tail kept for the other views is decoded
+    assert len(decoded) == live_metrics.SNAPSHOT_TAIL
+    # a float per decision plus the decoded tail; a dict per row would be ~100x this
+    assert peak < 8 * n + 4 * 2**20
+    y = np.array([(i % 997) / 997 for i in range(n)])
+    assert list(ts['Index']) == list(live_metrics._SeriesState(500).indices(y))
+    assert len(live_metrics.probability_timeseries(window=1000, max_points=500)) == 500
+
+
+def test_all_window_downsampling_is_incremental(tmp_path, monkeypatch):
+    import numpy as np
+    log = tmp_path / 'log.jsonl'
+    monkeypatch.setattr(live_metrics, 'DECISION_LOG_JSONL', str(log))
+    rng = np.random.default_rng(7)
+    y = rng.random(20000)
+    y[5000] = 1.5  # a lone spike must survive downsampling
+    log.write_bytes(b'')
+    written = 0
+    for upto in (150, 3000, 3001, 7777, 12000, 20000):
+        with open(log, 'ab') as f:
+            f.write(b''.join(json_codec.dumps_line({'probability': float(v)}) for v in y[written:upto]))
+        written = upto
+        for method in ('lttb', 'minmax'):
+            ts = live_metrics.probability_timeseries(window=None, max_points=100, method=method)
+            # same picks as downsampling the full history from scratch
+            assert list(ts['Index']) == list(live_metrics._SeriesState(100, method).indices(y[:upto]))
+            assert len(ts) <= 100 and ts['Index'].is_monotonic_increasing
+            assert ts['Index'].iloc[-1] == upto - 1 or method == 'minmax'
+    assert ts['Probability'].max() == 1.5
+    state = live_metrics._scan.series[(100, 'lttb')]
+    # finished buckets were kept, not recomputed, between appends
+    assert state.final == (20000 - 2) // state.width - 1
+
+
+def test_dashboard_views_read_each_log_byte_once(tmp_path, monkeypatch):
+    log = tmp_path / 'log.jsonl'
+    _write_log(str(log), 12)
+    monkeypatch.setattr(live_metrics, 'DECISION_LOG_JSONL', str(log))
+    read = live_metrics._read_appended
+    starts = []
+    monkeypatch.setattr(live_metrics, '_read_appended', lambda scan, f: starts.append(scan.offset) or read(scan, f))
+
+    def rerun():
+        # what the live-metrics and governance views read on every rerun
+        recent = live_metrics.load_decision_logs(limit=1000)
+        summary = live_metrics.query_decision_logs(columns=['prediction', 'probability'], limit=1000)
+        ts = live_metrics.probability_timeseries(window=None, max_points=500)
+        return recent, summary, ts
+
+    recent, summary, ts = rerun()
+    rerun()
+    assert starts == [0]
+    assert len(recent) == 12 and list(summary.columns) == ['prediction', 'probability']
+    assert list(summary['probability']) == list(recent['probability']) == list(ts['Probability'])
+    size = log.stat().st_size
+    with open(log, 'ab') as f:
+        f.write(json_codec.dumps_line({'timestamp': '2025-12-01 00:00:00', 'prediction': 0, 'probability': 0.2}))
+        f.write(b'{"timestamp": "2025-12-01 00:00:01", "probability": 0.3')  # still being written
+    recent, summary, ts = rerun()
+    # only the appended bytes are read
+    assert starts == [0, size]
+    assert len(recent) == len(summary) == len(ts) == 13
+    with open(log, 'ab') as f:
+        f.write(b'}\n')
+    assert len(live_metrics.load_decision_logs(limit=1000)) == 14
+    # a rewritten (shorter) log is read again from the start
+    _write_log(str(log), 5)
+    assert len(live_metrics.load_decision_logs(limit=1000)) == 5
+    assert starts[-1] == 0
@@ -0,0 +1,95 @@
+import io
+import csv
+import json
+import pytest
+from integrations.log_export import export_decisions
+
+
+def _write_log(path, n):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(n):
+            f.write(json.dumps({
+                'timestamp': f'2025-11-{10 + i % 10:02d} 12:00:00',
+                'transaction_id': None if i == 0 else f't{i}',
+                'prediction': i % 2,
+                'probability': i / n,
+                'shap_values': [0.1 * i, -0.1],
+                'inputs': [100 + i, 1],
+            }) + '\n')
+
+
+def test_csv_export_chunks_and_flat_columns(tmp_path):
+    log = tmp_path / 'log.jsonl'
+    _write_log(log, 25)
+    chunks = list(export_decisions('csv', str(log), chunk_size=10, feature_names=['Amount', 'Device']))
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+    assert len(rows) == 25
+    assert rows[3]['input_Amount'] == '103'
+    assert 'shap_Device' in rows[0]
+
+
+def test_ndjson_export_filters(tmp_path):
+    log = tmp_path / 'log.jsonl'
+    _write_log(log, 20)
+    data = b''.join(export_decisions('ndjson', str(log), start='2025-11-12', end='2025-11-14',
+                                     fields=['timestamp', 'probability']))
+    rows = [json.loads(ln) for ln in data.splitlines()]
+    assert len(rows) == 4
+    assert all(set(r) == {'timestamp', 'probability'} for r in rows)
+
+
+def test_parquet_export_row_groups(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    log = tmp_path / 'log.jsonl'
+    _write_log(log, 25)
+    out = tmp_path / 'out.parquet'
+    out.write_bytes(b''.join(export_decisions('parquet', str(log), chunk_size=10)))
+    pf = pq.ParquetFile(str(out))
+    assert pf.num_row_groups == 3
+    assert pf.read().num_rows == 25
+
+
+def test_mixed_width_log_keeps_every_column(tmp_path):
+    log = tmp_path / 'log.jsonl'
+    recs = [{'timestamp': '2025-11-10 12:00:00', 'prediction': 0, 'probability': 0.1, 'shap_values': [], 'inputs': []}]
+    recs += [{'timestamp': f'2025-11-10 12:00:{i:02d}', 'prediction': 1, 'probability': 0.9,
+              'shap_values': [0.5] * (2 + i % 2), 'inputs': [10 + i] * (2 + i % 2)} for i in range(1, 15)]
+    log.write_text(''.join(json.dumps(r) + '\n' for r in recs), encoding='utf-8')
+    rows = list(csv.DictReader(io.StringIO(b''.join(
+        export_decisions('csv', str(log), chunk_size=4, feature_names=['Amount', 'Device'])).decode('utf-8'))))
+    assert len(rows) == 15
+    assert {'input_Amount', 'input_Device', 'input_2', 'shap_Amount', 'shap_2'} <= set(rows[0])
+    assert rows[0]['input_Amount'] == '' and rows[1]['input_2'] == '11'
+
+    pq = pytest.importorskip('pyarrow.parquet')
+    out = tmp_path / 'out.parquet'
+    out.write_bytes(b''.join(export_decisions('parquet', str(log), chunk_size=4)))
+    table = pq.read_table(str(out))
+    assert table.column('input_2').to_pylist()[1] == 11.0
+    assert table.column('shap_0').to_pylist()[0] is None
+
+
+def test_export_ignores_records_appended_after_it_starts(tmp_path):
+    log = tmp_path / 'log.jsonl'
+    _write_log(log, 5)
+    chunks = export_decisions('csv', str(log), chunk_size=2)
+    # a wider record lands between the column pre-pass and the main pass
+    with open(log, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'timestamp': '2025-11-20 12:00:00', 'prediction': 1, 'probability': 0.9,
+                            'shap_values': [0.1] * 5, 'inputs': [1] * 5}) + '\n')
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+    assert len(rows) == 5 and 'input_4' not in rows[0]
+
+
+def test_parquet_without_pyarrow_fails_before_streaming(tmp_path, monkeypatch):
+    from integrations import log_export
+
+    def missing():
+        raise RuntimeError('pyarrow not installed')
+
+    monkeypatch.setattr(log_export, '_pyarrow', missing)
+    log = tmp_path / 'log.jsonl'
+    _write_log(log, 3)
+    with pytest.raises(RuntimeError):
+        export_decisions('parquet', str(log))
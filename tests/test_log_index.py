@@ -0,0 +1,99 @@
+import json
+from integrations.log_index import JsonlIndex
+
+
+def _append(path, obj):
+    line = (json.dumps(obj) + '\n').encode('utf-8')
+    with open(path, 'ab') as f:
+        offset = f.tell()
+        f.write(line)
+    return offset, offset + len(line)
+
+
+def test_index_record_and_lookup(tmp_path):
+    log = tmp_path / 'log.jsonl'
+    idx = JsonlIndex(str(log), 'transaction_id')
+    for i in range(5):
+        obj = {'transaction_id': f't{i}', 'probability': i / 10}
+        off, end = _append(log, obj)
+        idx.record(obj, off, end)
+    assert idx.read_record('t3')['probability'] == 0.3
+    assert idx.get('missing') is None
+    # a fresh instance loads the persisted sidecar
+    idx2 = JsonlIndex(str(log), 'transaction_id')
+    assert idx2.read_record('t4')['probability'] == 0.4
+
+
+def test_index_picks_up_unindexed_writers_and_truncation(tmp_path):
+    log = tmp_path / 'log.jsonl'
+    idx = JsonlIndex(str(log), 'transaction_id')
+    _append(log, {'transaction_id': 'a', 'v': 1})
+    obj = {'transaction_id': 'b', 'v': 2}
+    off, end = _append(log, obj)
+    idx.record(obj, off, end)
+    assert idx.read_record('a')['v'] == 1
+    log.write_text(json.dumps({'transaction_id': 'c', 'v': 3}) + '\n')
+    assert idx.read_record('c')['v'] == 3
+    assert idx.get('a') is None
+
+
+def test_index_latest_wins_with_key_func(tmp_path):
+    log = tmp_path / 'notif.jsonl'
+    idx = JsonlIndex(str(log), 'contact', value_fields=('transaction_id',),
+                     key_func=lambda c: ''.join(ch for ch in str(c) if ch.isdigit()))
+    _append(log, {'contact': '+1 555-0100', 'transaction_id': 'old'})
+    _append(log, {'contact': '15550100', 'transaction_id': 'new'})
+    assert idx.get('(1) 555 0100')['transaction_id'] == 'new'
+
+
+def test_contact_index_catches_up_with_external_writers(tmp_path, monkeypatch):
+    import builtins
+    from integrations.log_index import get_index, normalize_contact
+    log = tmp_path / 'fraudshield_notifications.jsonl'
+    # notifications appended by another process that does not maintain the index
+    _append(log, {'contact': '+1 (555) 010-0100', 'transaction_id': 't1', 'timestamp': '2025-11-10 09:00:00'})
+    _append(log, {'contact': 'Ann@Example.com', 'transaction_id': 't2', 'timestamp': '2025-11-10 09:01:00'})
+    idx = get_index(str(log), 'contact', value_fields=('transaction_id', 'timestamp'), key_func=normalize_contact)
+    assert idx.get('15550100100')['transaction_id'] == 't1'
+    assert idx.get('ann@example.com')['transaction_id'] == 't2'
+
+    # nothing new: a lookup only stats the files
+    opened = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, 'open', lambda *a, **kw: opened.append(a[0]) or real_open(*a, **kw))
+    assert idx.get('+15550100100')['transaction_id'] == 't1'
+    assert opened == []
+    monkeypatch.undo()
+
+    # a newer notification to the same number, written as the index is queried
+    _append(log, {'contact': '1-555-010-0100', 'transaction_id': 't3', 'timestamp': '2025-11-10 09:02:00'})
+    assert idx.get('+1 555 010 0100')['transaction_id'] == 't3'
+    # another process sees the same entries through the sidecar
+    other = JsonlIndex(str(log), 'contact', value_fields=('transaction_id',), key_func=normalize_contact)
+    assert other.get('15550100100')['transaction_id'] == 't3'
+    assert other.get('ann@example.com')['transaction_id'] == 't2'
+
+
+def test_index_keeps_one_row_per_key_and_latest_offset(tmp_path):
+    import sqlite3
+    log = tmp_path / 'log.jsonl'
+    # a JSONL sidecar left by an older version is replaced
+    (tmp_path / 'log.jsonl.transaction_id.idx').write_text('{"key": "x", "offset": 0, "end": 1}\n')
+    writer = JsonlIndex(str(log), 'transaction_id')
+    reader = JsonlIndex(str(log), 'transaction_id')
+    for v in range(3):
+        obj = {'transaction_id': 'a', 'v': v}
+        off, end = _append(log, obj)
+        writer.record(obj, off, end)
+    # the reader catches up over lines the writer already indexed
+    _append(log, {'transaction_id': 'b', 'v': 9})
+    assert reader.read_record('b')['v'] == 9
+    assert writer.read_record('a')['v'] == 2
+    # an older line indexed late does not replace the newer entry
+    writer.record({'transaction_id': 'a', 'v': 0}, 0, 1)
+    assert reader.read_record('a')['v'] == 2
+    assert len(reader) == 2
+    writer.close()
+    reader.close()
+    with sqlite3.connect(str(tmp_path / 'log.jsonl.transaction_id.idx')) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0] == 2
@@ -0,0 +1,69 @@
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+pytest.importorskip('pymongo')
+
+from integrations.db_adapters import MongoAdapter
+
+
+def _adapter(client=None):
+    return MongoAdapter(client=client or mongomock.MongoClient(), dbname='test', batch_size=3)
+
+
+def test_mongo_indexes_and_lookups():
+    client = mongomock.MongoClient()
+    # an older deployment with a plain index on id
+    client['test'].people.create_index('id')
+    db = _adapter(client)
+    info = db.db.people.index_information()
+    assert info['id_unique'].get('unique') and 'id_1' not in info
+    assert {'phone_norm_1', 'telegram_id_1'} <= set(info)
+
+    db.update_person('a', {'name': 'Ann', 'phone': '+1 555 0100', 'telegram_id': 42, 'consent': True})
+    db.update_person('b', {'name': 'Ben', 'phone': '555-0200', 'consent': '0'})
+    assert db.get_person_by_phone('15550100')['id'] == 'a'
+    assert db.get_person_by_telegram_id('42')['name'] == 'Ann'
+    assert 'phone_norm' not in db.get_person('a')
+    assert [p['id'] for p in db.list_people(consent=False)] == ['b']
+
+
+def test_mongo_bulk_upserts_and_batched_listing(tmp_path):
+    db = _adapter()
+    assert db.upsert_many(({'id': f'p{i:02d}', 'name': f'N{i}', 'phone': str(i)} for i in range(10)), batch_size=4) == 10
+    db.update_many([('p03', {'name': 'three'}), ('p10', {'name': 'new'})])
+    assert db.get_person('p03') == {'id': 'p03', 'name': 'three', 'phone': '3'}
+    assert [p['id'] for p in db.iter_people()] == [f'p{i:02d}' for i in range(11)]
+    assert db.count_people() == 11
+    assert [p['id'] for p in db.list_people(after_id='p07', limit=2)] == ['p08', 'p09']
+    assert [p['id'] for p in db.list_people(search='THREE', limit=5)] == ['p03']
+
+    src = tmp_path / 'src.csv'
+    src.write_text('id,name,phone,telegram_id,consent,consent_ts,last_notified\np01,Old,,,1,,\nq1,Q,,,1,,\n')
+    assert db.migrate_from_csv(str(src)) == 1
+    assert db.get_person('p01')['name'] == 'N1'
+
+
+def test_mongo_search_people():
+    db = _adapter()
+    db.upsert_many([{'id': 'a', 'name': 'Ann Smith', 'phone': '555-0100'}, {'id': 'b', 'name': 'Bob Smithers', 'phone': '555-0200'}])
+    assert sorted(p['id'] for p in db.search_people('smith')) == ['a', 'b']
+    assert [p['id'] for p in db.search_people('ann smi')] == ['a']
+    assert [p['id'] for p in db.search_people('555-02')] == ['b']
+    assert db.search_people('mith') == []
+
+
+def test_mongo_close_only_closes_own_client(monkeypatch):
+    import pymongo
+    closed = []
+
+    class Client(mongomock.MongoClient):
+        def close(self):
+            closed.append(self)
+
+    shared = Client()
+    _adapter(shared).close()
+    assert closed == []
+    monkeypatch.setattr(pymongo, 'MongoClient', Client)
+    own = MongoAdapter(uri='mongodb://localhost', dbname='test')
+    own.close()
+    assert closed == [own.client]
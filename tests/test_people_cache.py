@@ -0,0 +1,51 @@
+from integrations.db_adapters import SQLiteAdapter
+from integrations.people_cache import CachedAdapter
+
+
+class _Counting:
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.calls = 0
+
+    def __getattr__(self, name):
+        fn = getattr(self.adapter, name)
+
+        def wrapped(*a, **kw):
+            self.calls += 1
+            return fn(*a, **kw)
+        return wrapped
+
+
+def test_cached_adapter_hits_and_write_through(tmp_path):
+    backend = _Counting(SQLiteAdapter(path=str(tmp_path / 'people.db')))
+    db = CachedAdapter(backend, max_entries=100, ttl=60)
+    db.update_person('p1', {'name': 'Ann', 'phone': '555-0001', 'consent': 1})
+    calls = backend.calls
+    for _ in range(5):
+        assert db.get_person('p1')['name'] == 'Ann'
+        assert db.get_person_by_phone('5550001')['id'] == 'p1'
+        assert len(db.list_people(limit=10)) == 1
+    assert backend.calls == calls + 3
+    assert db.stats()['hits'] == 12
+
+    # callers may mutate what they get back
+    p = db.get_person('p1')
+    p['name'] = 'mutated'
+    assert db.get_person('p1')['name'] == 'Ann'
+
+    db.update_person('p1', {'name': 'Anna', 'phone': '555-0009'})
+    assert db.get_person('p1')['name'] == 'Anna'
+    assert db.get_person_by_phone('5550001') is None
+    assert db.list_people(limit=10)[0]['phone'] == '555-0009'
+
+
+def test_cached_adapter_ttl_and_lru(tmp_path):
+    db = CachedAdapter(SQLiteAdapter(path=str(tmp_path / 'people.db')), max_entries=2, ttl=0)
+    db.update_person('p1', {'name': 'A'})
+    db.get_person('p1')
+    db.get_person('p1')
+    assert db.stats()['hits'] == 0  # ttl=0 expires immediately
+    db.ttl = 60
+    for pid in ('p1', 'p2', 'p3'):
+        db.get_person(pid)
+    assert db.stats()['entries'] == 2
@@ -0,0 +1,59 @@
+import pytest
+from integrations.db_adapters import SQLiteAdapter, CSVAdapter
+from integrations.people_migration import migrate_people, verify_people, load_checkpoint, count_people
+
+
+class _Stop(Exception):
+    pass
+
+
+def test_migration_resumes_from_checkpoint_and_verifies(tmp_path):
+    src = CSVAdapter(path=str(tmp_path / 'people.csv'))
+    src.upsert_many({'id': f'p{i:03d}', 'name': f'N{i}', 'phone': f'555{i:04d}', 'consent': i % 3 == 0,
+                     'last_notified': i} for i in range(95))
+    dst = SQLiteAdapter(path=str(tmp_path / 'people.db'))
+    ckpt = str(tmp_path / 'ckpt.json')
+
+    def die_after_two(copied, rate):
+        if copied >= 20:
+            raise _Stop()
+
+    with pytest.raises(_Stop):
+        migrate_people(src, dst, batch_size=10, checkpoint_path=ckpt, progress=die_after_two)
+    assert load_checkpoint(ckpt) == {'last_id': 'p019', 'copied': 20}
+    assert not verify_people(src, dst)['ok']
+
+    res = migrate_people(src, dst, batch_size=10, checkpoint_path=ckpt)
+    assert res['resumed_from'] == 'p019' and res['copied'] == 95 and res['copied_this_run'] == 75
+    assert load_checkpoint(ckpt) is None
+    v = verify_people(src, dst, batch_size=7)
+    assert v['ok'] and v['rows'] == 95 and v['src_checksum'] == v['dst_checksum']
+
+    dst.update_person('p050', {'name': 'changed'})
+    assert verify_people(src, dst)['mismatched'] == ['p050']
+
+
+def test_manage_seed_bulk(tmp_path):
+    from manage import seed
+    adapter = SQLiteAdapter(path=str(tmp_path / 'people.db'))
+    created, people = seed(adapter, count=2500, bulk=True, batch_size=1000)
+    assert created == 2500 and people == []
+    assert len(adapter.list_people()) == 2500
+    created, people = seed(adapter, count=3)
+    assert created == 3 and adapter.get_person(people[0]['id'])['name'] == 'User 1'
+
+
+def test_count_people_uses_native_counts(tmp_path, monkeypatch):
+    from integrations.people_cache import CachedAdapter
+    csv_adapter = CSVAdapter(path=str(tmp_path / 'people.csv'))
+    sqlite_adapter = SQLiteAdapter(path=str(tmp_path / 'people.db'))
+    for adapter in (csv_adapter, sqlite_adapter):
+        adapter.upsert_many({'id': f'p{i}', 'name': f'N{i}'} for i in range(42))
+    assert count_people(csv_adapter, batch_size=5) == 42
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError('counted by streaming rows')
+
+    monkeypatch.setattr(SQLiteAdapter, 'iter_people', no_scan)
+    assert count_people(sqlite_adapter) == 42
+    assert count_people(CachedAdapter(sqlite_adapter)) == 42
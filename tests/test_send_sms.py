@@ -11,7 +11,7 @@ class TestSendSmsHelpers(unittest.TestCase):
         p = send_sms.normalize_phone('(555) 123-4567')
         self.assertIn('5551234567', p)
 
-    @patch('scripts.send_sms.requests.post')
+    @patch('scripts.send_sms.http_client.post')
     def test_textbelt_success(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {'success': True, 'id': 'abc'}
@@ -19,7 +19,7 @@ class TestSendSmsHelpers(unittest.TestCase):
         res = send_sms.send_via_textbelt('+15551234567', 'hello')
         self.assertEqual(res['status'], 'sent')
 
-    @patch('scripts.send_sms.requests.post')
+    @patch('scripts.send_sms.http_client.post')
     def test_textbelt_failure(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {'success': False, 'error': 'quota exceeded'}
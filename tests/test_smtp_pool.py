@@ -0,0 +1,121 @@
+import time
+import socket
+import smtplib
+from email.message import EmailMessage
+import pytest
+from integrations import smtp_pool
+from integrations.smtp_pool import SMTPPool
+
+
+class _FakeSMTP:
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.logins = 0
+        self.sent = []
+        self.dropped = False
+        self.closed = False
+        _FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def send_message(self, msg):
+        if self.dropped:
+            raise smtplib.SMTPServerDisconnected('gone')
+        self.sent.append(msg['To'])
+
+    def quit(self):
+        self.closed = True
+
+
+def _msg(to):
+    m = EmailMessage()
+    m['From'] = 'alerts@example.com'
+    m['To'] = to
+    m.set_content('hi')
+    return m
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, 'SMTP', _FakeSMTP)
+    return _FakeSMTP
+
+
+def test_pool_reuses_logged_in_connection(fake_smtp):
+    pool = SMTPPool('smtp.test', 587, 'u', 'p', max_messages=3)
+    for i in range(5):
+        pool.send_message(_msg(f'{i}@x'))
+    # rotated once after max_messages
+    assert len(fake_smtp.instances) == 2
+    assert [c.logins for c in fake_smtp.instances] == [1, 1]
+    assert fake_smtp.instances[0].closed
+    assert pool.send_many(_msg(f'{i}@y') for i in range(2)) == 2
+    assert sum(len(c.sent) for c in fake_smtp.instances) == 7
+
+
+def test_pool_reconnects_after_server_drop_and_closes_idle(fake_smtp):
+    pool = SMTPPool('smtp.test', 587, 'u', 'p', idle_timeout=60)
+    pool.send_message(_msg('a@x'))
+    fake_smtp.instances[0].dropped = True
+    pool.send_message(_msg('b@x'))
+    assert len(fake_smtp.instances) == 2
+    assert fake_smtp.instances[1].sent == ['b@x']
+
+    pool.idle_timeout = 0
+    assert pool.close_idle() == 1
+    assert fake_smtp.instances[1].closed
+    assert pool.stats()['idle'] == 0
+
+
+def test_idle_connections_are_reaped_without_a_send(fake_smtp):
+    pool = SMTPPool('smtp.test', 587, 'u', 'p', idle_timeout=0.1)
+    pool.send_message(_msg('a@x'))
+    deadline = time.monotonic() + 5
+    while not fake_smtp.instances[0].closed and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert fake_smtp.instances[0].closed
+    assert pool.stats()['idle'] == 0
+    pool.close()
+
+
+def test_pools_are_keyed_by_host_port_user(fake_smtp, monkeypatch):
+    monkeypatch.setattr(smtp_pool, '_pools', {})
+    pool = smtp_pool.get_smtp_pool('smtp.test', '587', 'u', 'old')
+    pool.send_message(_msg('a@x'))
+    assert smtp_pool.get_smtp_pool('smtp.test', 587, 'u', 'new') is pool
+    # the connection logged in with the old password is not reused
+    assert fake_smtp.instances[0].closed
+    pool.send_message(_msg('b@x'))
+    assert len(fake_smtp.instances) == 2
+    assert smtp_pool.get_smtp_pool('smtp.test', 587, 'v', 'new') is not pool
+    pool.close()
+
+
+def test_pool_against_local_smtp_server():
+    controller_mod = pytest.importorskip('aiosmtpd.controller')
+    received = []
+
+    class Handler:
+        async def handle_DATA(self, server, session, envelope):
+            received.append(envelope.rcpt_tos)
+            return '250 OK'
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    controller = controller_mod.Controller(Handler(), hostname='127.0.0.1', port=port)
+    controller.start()
+    try:
+        pool = SMTPPool('127.0.0.1', port)
+        assert pool.send_many(_msg(f'{i}@x') for i in range(10)) == 10
+        pool.close()
+    finally:
+        controller.stop()
+    assert len(received) == 10
+    assert pool.stats()['opened'] == 1
@@ -3,41 +3,20 @@ import os
 import sys
 from datetime import datetime
 import pandas as pd
-import pymysql  # MySQL database module
-// Import React and necessary components
-import React, { useState } from 'react';
-
-const SliderComponent = () => {
-  const [value, setValue] = useState(50);
-
-  const handleSliderChange = (event) => {
-    setValue(event.target.value);
-  };
-
-  return (
-    <div>
-      <label htmlFor="slider">Adjust Value:</label>
-      <input
-        type="range"
-        id="slider"
-        min="0"
-        max="100"
-        value={value}
-        onChange={handleSliderChange}
-      />
-      <p>Selected Value: {value}</p>
-    </div>
-  );
-};
-
-export default SliderComponent;
+try:
+    import pymysql  # MySQL database module
+except ImportError:  # only needed when DB_NAME is set
+    pymysql = None
 # make sure project root is on path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+from integrations.decision_api import decisions_api
 # Placeholder for database name
 DB_NAME = None  # Replace with actual database name if using a database
 
 # Function to create a database connection using PyMySQL
 def create_connection(db_name):
+    if pymysql is None:
+        raise RuntimeError('pymysql not installed')
     try:
         connection = pymysql.connect(
             host='localhost',  # Replace with your MySQL host
@@ -123,6 +102,9 @@ def sms_reply():
     twiml = f"<?xml version='1.0' encoding='UTF-8'?><Response><Message>Thanks — your response ({r}) has been recorded.</Message></Response>"
     return Response(twiml, mimetype='application/xml')
 
+# /decisions/<transaction_id> and /export/decisions
+app.register_blueprint(decisions_api)
+
 if __name__ == '__main__':
     port = int(os.getenv('WEBHOOK_PORT', 5000))
     app.run(host='0.0.0.0', port=port)